@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Async Ingestion Engine
+
+Tüm upstream isteklerini (MEXC, Binance, Bybit ve CMC partileri) tek bir
+asyncio event loop'unda eş zamanlı yürütür. Güncelleyici her isteği sırayla
+beklemek ya da uçuştaki her istek için ayrı thread açmak yerine:
+
+- host başına eş zamanlılık sınırı (semaphore) uygular,
+- her isteği zaman aşımında iptal eder (asyncio.wait_for),
+- canlı isteklerde bağlantı havuzlu tek bir aiohttp ClientSession kullanır
+  (uçuştaki istek başına thread bloklanmaz). Yalnızca HTTP_TRANSPORT live
+  değilse (record/replay, in-process test transport'ları) istekler
+  http_transport üzerinden sınırlı bir executor'da çalışır. Her iki yolda da
+  http_transport'un hedge ve devre kesicisi (ResilientTransport) geçerlidir.
+
+Senkron cephe mevcut kodu değiştirmeden hızlandırır: `warm_exchange_cache`
+borsa uç noktalarını eş zamanlı çekip `fetch_cache`'e koyar, ardından
+`process_mexc`, `process_binance` ve `proxy_worker` bugünkü gibi çağrılır ve
+yanıtları önbellekten alır. Motor kurulduğunda CMC partileri de
+(coinmarketcap.set_batch_fetcher) aynı loop'ta eş zamanlı çekilir. Hatalı
+yanıtlar önbelleğe konmaz; adapter kendi çağrısında yeniden dener ve hatayı
+bugünkü gibi raporlar.
+
+Ortam değişkenleri:
+    INGEST_ENGINE       -> async (varsayılan) | sync (motor kapalı)
+    INGEST_HOST_LIMIT   -> host başına eş zamanlı istek (varsayılan 4)
+    INGEST_HOST_LIMITS  -> host'a özel sınırlar, örn. "pro-api.coinmarketcap.com=2"
+    INGEST_TIMEOUT      -> istek başına zaman aşımı, sn (varsayılan 15)
+
+Kullanım:
+    from async_ingest import warm_exchange_cache
+    warm_exchange_cache(("mexc", "binance"))
+    mexc_futures_coins, mexc_positions_map, mexc_list = process_mexc()
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import coinmarketcap
+import exchange_adapters as ea
+from http_transport import ResilientTransport, get_transport
+
+INGEST_ENGINE = os.environ.get("INGEST_ENGINE", "async")
+INGEST_HOST_LIMIT = int(os.environ.get("INGEST_HOST_LIMIT", "4"))
+INGEST_TIMEOUT = float(os.environ.get("INGEST_TIMEOUT", "15"))
+# CMC planları dakikalık kotalıdır; partiler daha düşük eş zamanlılıkla gönderilir
+DEFAULT_HOST_LIMITS = {"pro-api.coinmarketcap.com": 2}
+
+# Borsa -> güncelleyicinin kullandığı uç noktalar (url, parametreler, adapter zaman aşımı)
+Request = Tuple[str, Optional[Dict], Optional[Dict], float]
+EXCHANGE_ENDPOINTS: Dict[str, List[Request]] = {
+    "mexc": [(ea.MEXC_CONTRACT_DETAIL_URL, None, None, 10), (ea.MEXC_SPOT_TICKER_URL, None, None, 10)],
+    "binance": [(ea.BINANCE_FUTURES_SYMBOLS_URL, None, None, 15)],
+    "bybit": [(ea.BYBIT_INSTRUMENTS_URL, {"category": "linear"}, None, 15)],
+}
+
+
+def parse_host_limits(value: str) -> Dict[str, int]:
+    """"host=n,host=n" biçimini çözer; hatalı girdiler atlanır."""
+    limits = dict(DEFAULT_HOST_LIMITS)
+    for item in value.split(","):
+        host, _, limit = item.strip().partition("=")
+        if host and limit.isdigit() and int(limit) > 0:
+            limits[host] = int(limit)
+    return limits
+
+
+class AsyncIngestEngine:
+    """Kendi thread'inde çalışan tek event loop'lu fetch motoru."""
+
+    def __init__(self, host_limit: int = INGEST_HOST_LIMIT, host_limits: Optional[Dict[str, int]] = None,
+                 timeout: float = INGEST_TIMEOUT, use_aiohttp: Optional[bool] = None):
+        self.host_limit = max(1, host_limit)
+        self.host_limits = parse_host_limits(os.environ.get("INGEST_HOST_LIMITS", "")) if host_limits is None \
+            else host_limits
+        self.timeout = timeout
+        self.use_aiohttp = use_aiohttp
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._session = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # -- loop -------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = Thread(target=self._loop.run_forever, name="async-ingest", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro):
+        """Coroutine'i motorun loop'unda çalıştırır ve sonucu bekler (senkron cephe)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result()
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._semaphores.clear()
+
+    # -- istekler ---------------------------------------------------------------
+
+    def _aiohttp_enabled(self) -> bool:
+        if self.use_aiohttp is None:
+            # record/replay ve test transport'ları http_transport üzerinden çalışmalı
+            self.use_aiohttp = get_transport().mode == "live"
+        return self.use_aiohttp
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.host_limits.get(host, self.host_limit))
+        return semaphore
+
+    async def _client(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.host_limit, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _aiohttp_get(self, url: str, params: Optional[Dict], headers: Optional[Dict]):
+        session = await self._client()
+        query = {key: str(value) for key, value in (params or {}).items()}
+        started = time.perf_counter()
+        async with session.get(url, params=query, headers=headers) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None), time.perf_counter() - started
+
+    async def _hedged(self, url: str, params: Optional[Dict], headers: Optional[Dict], delay: Optional[float]):
+        """İstek `delay`'i aşarsa ikinci kopya gönderilir; ilk başarılı yanıt döner."""
+        if delay is None:
+            return await self._aiohttp_get(url, params, headers)
+        tasks = {asyncio.ensure_future(self._aiohttp_get(url, params, headers))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                tasks.add(asyncio.ensure_future(self._aiohttp_get(url, params, headers)))
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_aiohttp(self, url: str, params: Optional[Dict], headers: Optional[Dict], timeout: float):
+        # http_transport.ResilientTransport kuruluysa aynı devre kesici ve gecikme izleyici kullanılır
+        transport = get_transport()
+        guard = transport if isinstance(transport, ResilientTransport) else None
+        if guard is None:
+            data, _ = await asyncio.wait_for(self._aiohttp_get(url, params, headers), timeout)
+            return data
+        send, cached = guard.before(url, params)
+        if not send:
+            return cached
+        delay = guard.hedge_delay(url)
+        try:
+            data, seconds = await asyncio.wait_for(
+                self._hedged(url, params, headers, delay if delay and delay < timeout else None), timeout)
+        except Exception as e:
+            guard.after_failure(url, e)
+            raise
+        except BaseException:
+            # İptal (CancelledError) half-open denemeyi kilitli bırakmamalı
+            guard.breaker(url).release()
+            raise
+        guard.after_success(url, params, data, seconds)
+        return data
+
+    async def _executor_get(self, url: str, params: Optional[Dict], headers: Optional[Dict], timeout: float):
+        if self._executor is None:
+            workers = max(self.host_limit, *self.host_limits.values()) * max(1, len(EXCHANGE_ENDPOINTS) + 1)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="async-ingest-io")
+        # Zaman aşımında bekleme iptal edilir; executor'daki çağrı kendi timeout'uyla biter
+        return await asyncio.wait_for(asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: get_transport().get_json(url, params, headers, timeout)), timeout)
+
+    async def fetch_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                         timeout: Optional[float] = None):
+        """Host sınırı içinde tek GET; zaman aşımında asyncio.TimeoutError."""
+        timeout = self.timeout if timeout is None else timeout
+        async with self._semaphore(urlsplit(url).netloc):
+            if self._aiohttp_enabled():
+                return await self._fetch_aiohttp(url, params, headers, timeout)
+            return await self._executor_get(url, params, headers, timeout)
+
+    async def fetch_many(self, requests: Sequence[Request]) -> List[object]:
+        """İstekleri eş zamanlı çeker; hata veren istek için istisna döner (sıra korunur)."""
+        return await asyncio.gather(*(self.fetch_json(*request) for request in requests), return_exceptions=True)
+
+    # -- senkron cephe ----------------------------------------------------------
+
+    def fetch_batches(self, url: str, params_list: List[Dict], headers: Dict[str, str],
+                      timeout: float) -> List[object]:
+        """coinmarketcap partileri için: tüm partiler aynı loop'ta eş zamanlı."""
+        return self.run(self.fetch_many([(url, params, headers, timeout) for params in params_list]))
+
+    def warm(self, requests: Sequence[Request]) -> List[object]:
+        """İstekleri eş zamanlı çeker ve başarılı yanıtları fetch_cache'e koyar."""
+        results = self.run(self.fetch_many(requests))
+        for (url, params, _, _), result in zip(requests, results):
+            if not isinstance(result, BaseException):
+                ea.fetch_cache.prime(url, params, result)
+        return results
+
+
+_engine: Optional[AsyncIngestEngine] = None
+_engine_lock = Lock()
+
+
+def get_engine() -> Optional[AsyncIngestEngine]:
+    """Paylaşılan motor (INGEST_ENGINE=sync ise None). İlk çağrıda CMC partilerini bağlar."""
+    global _engine
+    if INGEST_ENGINE != "async":
+        return None
+    with _engine_lock:
+        if _engine is None:
+            _engine = AsyncIngestEngine()
+            coinmarketcap.set_batch_fetcher(_engine.fetch_batches)
+        return _engine
+
+
+def warm_exchange_cache(exchanges: Sequence[str] = tuple(EXCHANGE_ENDPOINTS)) -> int:
+    """Borsaların uç noktalarını tek loop'ta eş zamanlı çekip önbelleğe koyar.
+
+    Başarılı istek sayısını döndürür. Motor kapalıysa hiçbir şey yapmaz (0).
+    """
+    engine = get_engine()
+    if engine is None:
+        return 0
+    requests = [request for name in exchanges for request in EXCHANGE_ENDPOINTS.get(name, [])]
+    results = engine.warm(requests)
+    return sum(1 for result in results if not isinstance(result, BaseException))
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Pipeline Benchmarks
+
+Hattın sıcak yollarını ağa çıkmadan, birkaç veri ölçeğinde ölçer ve
+sonuçları JSON olarak kaydeder. İki çalıştırmanın JSON'u `compare` ile
+karşılaştırılarak gerileme yakalanır.
+
+Veri fake_exchange_server'ın sentetik evreninden süreç içinde sunulur
+(InProcessTransport); sembol indeksi geçici dosyada tutulur, disk market
+cap önbelleği kapalıdır. Ölçülen süreler sıcak süreç içi önbellekle
+(fetch_cache) alınır, yani ağ yerine hesaplama/sıralama/yazma maliyetidir.
+
+Senaryolar:
+    listings.max_positions     calculate_max_positions
+    listings.grouped_currency  grouped_currency (ölçek kadar değer)
+    dashboard.process_mexc     dashboard MEXC listesi (sıralama + birleştirme)
+    dashboard.process_binance  dashboard MEXC-var/Binance-yok listesi
+    dashboard.difference_list  build_difference_list (Bybit)
+    dashboard.jsonify          data_store'un jsonify'ı
+    flask.api_data / api_mexc / api_membership / worker_update   test client ile rotalar
+    snapshot.build             build_snapshot (exchangeInfo/ticker/funding birleştirme)
+    snapshot.iter_records      yalnızca birleştirme adımı
+    reports.mexc / reports.binance   CLI rapor yazıcıları (konsol, CSV, TXT, tek TXT)
+
+Kullanım:
+    python3 bench_pipeline.py run -o bench_base.json
+    python3 bench_pipeline.py run --scales 500,5000,50000 --cases flask,snapshot -o bench_new.json
+    python3 bench_pipeline.py compare bench_base.json bench_new.json --threshold 0.10
+"""
+
+import argparse
+import atexit
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from fake_exchange_server import InProcessTransport, SyntheticUniverse, base_url_env
+
+DEFAULT_SCALES = (500, 5000, 20000)
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_THRESHOLD = 0.10
+MIN_ROUNDS = 3
+MAX_ROUNDS = 200
+
+_workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+atexit.register(shutil.rmtree, _workdir, True)
+# Modüller import edilmeden önce: sahte uç noktalar, geçici indeks, disk önbelleği kapalı
+os.environ.update(base_url_env("http://fake-exchange.local"))
+os.environ["SYMBOL_INDEX_PATH"] = os.path.join(_workdir, "symbol_index.json")
+os.environ["MARKETCAP_CACHE_PATH"] = ""
+
+import binance_perpetual_snapshot as snapshot  # noqa: E402
+import crypto_listings_all_in_one as listings  # noqa: E402
+import crypto_web_dashboard as dashboard  # noqa: E402
+from exchange_adapters import fetch_cache, get_adapter  # noqa: E402
+from http_transport import set_transport  # noqa: E402
+from report_writers import CombinedReport  # noqa: E402
+
+# ---------------------------------------------------------------------------
+# CASES
+# ---------------------------------------------------------------------------
+
+CASES: Dict[str, Callable[["Fixture"], Callable[[], object]]] = {}
+
+
+def bench_case(name: str):
+    """Senaryoyu adıyla kaydeder; fonksiyon ölçülecek çağrıyı döndürür (dekoratör)."""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+class Fixture:
+    """Bir ölçeğin evreni ve senaryoların paylaştığı sıcak girdiler."""
+
+    def __init__(self, scale: int, seed: int = 0):
+        self.scale = scale
+        self.universe = SyntheticUniverse(scale, seed)
+        set_transport(InProcessTransport(self.universe))
+        fetch_cache.clear()
+        with redirect_stdout(io.StringIO()):
+            self.contracts = get_adapter("mexc").contract_specs()
+            self.tickers = get_adapter("mexc").tickers()
+            self.mexc_coins, self.mexc_positions, self.mexc_list = dashboard.process_mexc()
+            self.binance_futures = sorted(get_adapter("binance").futures_symbols())
+            self.bybit_futures = sorted(get_adapter("bybit").futures_symbols())
+            dashboard.publish_sources({"mexc": self.mexc_list, "binance": self.binance_futures,
+                                       "bybit": self.bybit_futures}, origin="bench")
+
+
+@bench_case("listings.max_positions")
+def _max_positions(fx: Fixture):
+    return lambda: listings.calculate_max_positions(fx.contracts, fx.tickers)
+
+
+@bench_case("listings.grouped_currency")
+def _grouped_currency(fx: Fixture):
+    values = [coin["quote_volume"] for coin in fx.universe.coins]
+    return lambda: [listings.grouped_currency(value) for value in values]
+
+
+@bench_case("dashboard.process_mexc")
+def _dashboard_mexc(fx: Fixture):
+    return dashboard.process_mexc
+
+
+@bench_case("dashboard.process_binance")
+def _dashboard_binance(fx: Fixture):
+    return lambda: dashboard.process_binance(fx.mexc_coins, fx.mexc_positions)
+
+
+@bench_case("dashboard.difference_list")
+def _difference_list(fx: Fixture):
+    return lambda: dashboard.build_difference_list(fx.mexc_list, fx.bybit_futures, "bybit")
+
+
+@bench_case("dashboard.jsonify")
+def _jsonify(fx: Fixture):
+    def run():
+        with dashboard.app.app_context(), dashboard.data_lock:
+            return dashboard.jsonify(dashboard.data_store).get_data()
+    return run
+
+
+def _client():
+    # Test client isteklerinde arka plan güncelleyicisi (ağ) başlatılmaz
+    dashboard.update_thread_started = True
+    return dashboard.app.test_client()
+
+
+@bench_case("flask.api_data")
+def _api_data(fx: Fixture):
+    client = _client()
+    return lambda: client.get("/api/data").get_data()
+
+
+@bench_case("flask.api_mexc")
+def _api_mexc(fx: Fixture):
+    client = _client()
+    return lambda: client.get("/api/mexc").get_data()
+
+
+@bench_case("flask.api_membership")
+def _api_membership(fx: Fixture):
+    client = _client()
+    return lambda: client.get("/api/membership?expr=mexc.futures and not binance.futures").get_data()
+
+
+@bench_case("flask.worker_update")
+def _worker_update(fx: Fixture):
+    client = _client()
+    dashboard.WORKER_SECRET = "bench"
+    payload = json.dumps({"secret": "bench", "sources": {
+        "binance": {"mode": "full", "data": fx.binance_futures},
+        "mexc": {"mode": "full", "data": fx.mexc_list},
+    }})
+    return lambda: client.post("/api/worker/update", data=payload, content_type="application/json").get_data()
+
+
+@bench_case("snapshot.build")
+def _snapshot_build(fx: Fixture):
+    return snapshot.build_snapshot
+
+
+@bench_case("snapshot.iter_records")
+def _snapshot_iter(fx: Fixture):
+    sources = snapshot.fetch_sources()
+    return lambda: list(snapshot.iter_records(*sources))
+
+
+@contextmanager
+def _in_workdir():
+    previous = os.getcwd()
+    os.chdir(_workdir)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@bench_case("reports.mexc")
+def _reports_mexc(fx: Fixture):
+    def run():
+        with _in_workdir():
+            listings.process_mexc(CombinedReport("crypto_listings.txt"))
+    return run
+
+
+@bench_case("reports.binance")
+def _reports_binance(fx: Fixture):
+    def run():
+        with _in_workdir():
+            listings.process_binance(fx.mexc_coins, fx.mexc_positions, CombinedReport("crypto_listings.txt"))
+    return run
+
+
+# ---------------------------------------------------------------------------
+# RUNNER
+# ---------------------------------------------------------------------------
+
+def measure(fn: Callable[[], object], min_time: float = DEFAULT_MIN_TIME) -> List[float]:
+    """Isınma sonrası en az MIN_ROUNDS tur ve `min_time` saniye ölçer; tur süreleri (sn)."""
+    fn()
+    gc.collect()
+    timings: List[float] = []
+    total = 0.0
+    while len(timings) < MIN_ROUNDS or (total < min_time and len(timings) < MAX_ROUNDS):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        total += elapsed
+    return timings
+
+
+def summarize(case: str, scale: int, timings: Sequence[float]) -> Dict:
+    return {
+        "case": case,
+        "scale": scale,
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def select_cases(patterns: Optional[Sequence[str]]) -> List[str]:
+    if not patterns:
+        return list(CASES)
+    return [name for name in CASES if any(name == p or name.startswith(p.rstrip(".") + ".") for p in patterns)]
+
+
+def run_benchmarks(scales: Sequence[int], cases: Sequence[str], min_time: float = DEFAULT_MIN_TIME,
+                   seed: int = 0) -> Dict:
+    results = []
+    for scale in scales:
+        started = time.perf_counter()
+        fixture = Fixture(scale, seed)
+        print(f"[BENCH] olcek {scale}: evren ve sicak girdiler {time.perf_counter() - started:.2f} sn")
+        for case in cases:
+            with redirect_stdout(io.StringIO()):
+                timings = measure(CASES[case](fixture), min_time)
+            result = summarize(case, scale, timings)
+            results.append(result)
+            print(f"  {case:<28} {result['median'] * 1000:>10.3f} ms  (min {result['min'] * 1000:.3f}, "
+                  f"{result['rounds']} tur)")
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "scales": list(scales),
+        "results": results,
+    }
+
+
+def compare(old: Dict, new: Dict, threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[Tuple], int]:
+    """(satırlar, gerileme sayısı). Medyan oranı 1+threshold üstündeyse gerileme."""
+    before = {(r["case"], r["scale"]): r for r in old.get("results", [])}
+    rows, regressions = [], 0
+    for result in new.get("results", []):
+        base = before.get((result["case"], result["scale"]))
+        if base is None or not base["median"]:
+            continue
+        ratio = result["median"] / base["median"]
+        if ratio > 1 + threshold:
+            verdict = "GERILEME"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            verdict = "IYILESME"
+        else:
+            verdict = ""
+        rows.append((result["case"], result["scale"], base["median"], result["median"], ratio, verdict))
+    return rows, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pipeline benchmarklari")
+    sub = parser.add_subparsers(dest="command")
+    run = sub.add_parser("run", help="Benchmarklari calistir ve JSON kaydet")
+    run.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                     help="Virgulle ayrilmis coin sayilari")
+    run.add_argument("--cases", default="", help="Virgulle ayrilmis senaryo adlari veya onekleri (orn. flask,snapshot)")
+    run.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="Senaryo basina en az olcum suresi (sn)")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("-o", "--output", default="bench_results.json")
+    cmp_parser = sub.add_parser("compare", help="Iki sonuc JSON'unu karsilastir")
+    cmp_parser.add_argument("old")
+    cmp_parser.add_argument("new")
+    cmp_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="Gerileme sayilacak medyan artisi (0.10 = %%10)")
+    sub.add_parser("list", help="Senaryolari listele")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(CASES))
+        return 0
+
+    if args.command == "run":
+        try:
+            scales = [int(s) for s in args.scales.split(",") if s.strip()]
+        except ValueError:
+            parser.error("--scales tamsayi listesi olmali")
+        cases = select_cases([c.strip() for c in args.cases.split(",") if c.strip()])
+        if not cases:
+            parser.error(f"Eslesen senaryo yok (mevcut: {', '.join(CASES)})")
+        report = run_benchmarks(scales, cases, args.min_time, args.seed)
+        try:
+            with open(args.output, "w", encoding="utf-8") as fp:
+                json.dump(report, fp, indent=2)
+        except OSError as e:
+            print(f"[ERROR] Sonuclar yazilamadi ({args.output}): {e}")
+            return 1
+        print(f"[OK] {len(report['results'])} sonuc kaydedildi: {args.output}")
+        return 0
+
+    if args.command == "compare":
+        try:
+            with open(args.old, "r", encoding="utf-8") as fp:
+                old = json.load(fp)
+            with open(args.new, "r", encoding="utf-8") as fp:
+                new = json.load(fp)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Sonuc dosyasi okunamadi: {e}")
+            return 1
+        rows, regressions = compare(old, new, args.threshold)
+        print(f"{'Senaryo':<28} {'Olcek':>7} {'Once (ms)':>12} {'Sonra (ms)':>12} {'Oran':>7}")
+        print("-" * 80)
+        for case, scale, before, after, ratio, verdict in rows:
+            print(f"{case:<28} {scale:>7} {before * 1000:>12.3f} {after * 1000:>12.3f} {ratio:>6.2f}x {verdict}")
+        print(f"\n[OZET] {len(rows)} karsilastirma, {regressions} gerileme (esik %{args.threshold * 100:.0f})")
+        return 1 if regressions else 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,32 +8,88 @@ tek bir JSON çıktısında birleştirir.
 
 Kullanım:
     python3 binance_perpetual_snapshot.py --output snap.json
+    python3 binance_perpetual_snapshot.py --format ndjson -o snap.ndjson --bench
+
+Üç uç nokta (exchangeInfo, ticker/24hr, premiumIndex) paralel çekilir ve
+kayıtlar birleştirildikçe dosyaya akıtılır. Çıktı biçimleri:
+    pretty  -> girintili JSON (varsayılan, eski çıktı ile aynı)
+    compact -> tek satır JSON
+    ndjson  -> ilk satır {"generated_at", "count"}, sonra satır başına bir kayıt
+
+    parquet / arrow -> tipli kolonsal dosya (pyarrow gerekir, --output zorunlu)
+
+--store DIR verilirse snapshot ayrıca snapshot_store deposuna eklenir
+(geçmiş analizi için); --output verilmezse stdout'a yazılmaz.
+
+İki snapshot arasındaki farklar (yeni listeleme, delist, status değişimi,
+eşik üstü funding/fiyat hareketi) diff alt komutuyla NDJSON olarak alınır:
+    python3 binance_perpetual_snapshot.py diff eski.json yeni.json
+    python3 binance_perpetual_snapshot.py diff eski.json            (canlı veriye karşı)
+    python3 binance_perpetual_snapshot.py diff --store DIR --since 2025-11-01
+
+--daemon ile sürekli çalışır; son snapshot'lar halka tamponda tutulur ve
+yerel HTTP uç noktasından sunulur (bkz. snapshot_daemon):
+    python3 binance_perpetual_snapshot.py --daemon --interval 60 --history 1440
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
-import requests
+from http_transport import get_transport
 
-FAPI_BASE = "https://fapi.binance.com"
+FAPI_BASE = os.environ.get("BINANCE_FAPI_BASE_URL", "https://fapi.binance.com")
 EXCHANGE_INFO_URL = f"{FAPI_BASE}/fapi/v1/exchangeInfo"
 TICKER_24H_URL = f"{FAPI_BASE}/fapi/v1/ticker/24hr"
 FUNDING_URL = f"{FAPI_BASE}/fapi/v1/premiumIndex"
 
+OUTPUT_FORMATS = ("pretty", "compact", "ndjson")
+# Kolonsal biçimler pyarrow gerektirir ve --output ile kullanılır
+COLUMNAR_FORMATS = ("parquet", "arrow")
 
-def fetch_json(url: str) -> Dict:
-    response = requests.get(url, timeout=15)
-    response.raise_for_status()
-    return response.json()
+# Kolonsal çıktı şeması (sayısal alanlar float64/int64, metinler sözlük kodlu)
+SNAPSHOT_COLUMNAR_SCHEMA = [
+    ("symbol", "symbol"),
+    ("pair", "symbol"),
+    ("baseAsset", "symbol"),
+    ("quoteAsset", "symbol"),
+    ("marginAsset", "symbol"),
+    ("status", "symbol"),
+    ("pricePrecision", "int"),
+    ("quantityPrecision", "int"),
+    ("deliveryDate", "int"),
+    ("priceChangePercent", "float"),
+    ("volume", "float"),
+    ("quoteVolume", "float"),
+    ("openPrice", "float"),
+    ("highPrice", "float"),
+    ("lowPrice", "float"),
+    ("lastPrice", "float"),
+    ("fundingRate", "float"),
+    ("nextFundingTime", "int"),
+    ("interestRate", "float"),
+]
 
+# diff için varsayılan eşikler: fiyatta yüzde, funding'de mutlak değişim
+DEFAULT_PRICE_THRESHOLD = 5.0
+DEFAULT_FUNDING_THRESHOLD = 0.0005
 
-def get_perpetual_usdt_symbols() -> Dict[str, Dict]:
-    data = fetch_json(EXCHANGE_INFO_URL)
+
+def fetch_json(url: str, params: Dict | None = None) -> Dict:
+    # Paralel isteklerde bağlantılar paylaşılan transport oturumunda yeniden kullanılır
+    return get_transport().get_json(url, params, timeout=15)
+
+
+def get_perpetual_usdt_symbols(data: Dict | None = None) -> Dict[str, Dict]:
+    if data is None:
+        data = fetch_json(EXCHANGE_INFO_URL)
     out: Dict[str, Dict] = {}
     for item in data.get("symbols", []):
         if (
@@ -46,6 +102,7 @@ def get_perpetual_usdt_symbols() -> Dict[str, Dict]:
                 "baseAsset": item.get("baseAsset"),
                 "quoteAsset": item.get("quoteAsset"),
                 "marginAsset": item.get("marginAsset"),
+                "status": item.get("status"),
                 "pricePrecision": item.get("pricePrecision"),
                 "quantityPrecision": item.get("quantityPrecision"),
                 "deliveryDate": item.get("deliveryDate"),
@@ -57,35 +114,45 @@ def map_by_symbol(items: List[Dict]) -> Dict[str, Dict]:
     return {item.get("symbol"): item for item in items if item.get("symbol")}
 
 
-def build_snapshot() -> Dict[str, List[Dict]]:
-    symbols = get_perpetual_usdt_symbols()
-    if not symbols:
-        raise RuntimeError("USDT-M perpetual sözleşme bulunamadı")
+def fetch_sources() -> Tuple[Dict[str, Dict], Dict[str, Dict], Dict[str, Dict]]:
+    """exchangeInfo, ticker/24hr ve premiumIndex uç noktalarını paralel çeker."""
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        info = pool.submit(fetch_json, EXCHANGE_INFO_URL)
+        tickers = pool.submit(fetch_json, TICKER_24H_URL)
+        funding = pool.submit(fetch_json, FUNDING_URL)
+        symbols = get_perpetual_usdt_symbols(info.result())
+        return symbols, map_by_symbol(tickers.result()), map_by_symbol(funding.result())
 
-    tickers = map_by_symbol(fetch_json(TICKER_24H_URL))
-    funding = map_by_symbol(fetch_json(FUNDING_URL))
 
-    records: List[Dict] = []
-    for symbol, meta in symbols.items():
+def iter_records(
+    symbols: Dict[str, Dict], tickers: Dict[str, Dict], funding: Dict[str, Dict]
+) -> Iterator[Dict]:
+    """Sözleşme, ticker ve funding verisini sembol sırasıyla birleştirip kayıt üretir."""
+    for symbol in sorted(symbols):
+        meta = symbols[symbol]
         ticker = tickers.get(symbol, {})
         funding_item = funding.get(symbol, {})
-        records.append(
-            {
-                **meta,
-                "priceChangePercent": float(ticker.get("priceChangePercent", 0.0)),
-                "volume": float(ticker.get("volume", 0.0)),
-                "quoteVolume": float(ticker.get("quoteVolume", 0.0)),
-                "openPrice": float(ticker.get("openPrice", 0.0)),
-                "highPrice": float(ticker.get("highPrice", 0.0)),
-                "lowPrice": float(ticker.get("lowPrice", 0.0)),
-                "lastPrice": float(ticker.get("lastPrice", 0.0)),
-                "fundingRate": float(funding_item.get("lastFundingRate", 0.0)),
-                "nextFundingTime": funding_item.get("nextFundingTime"),
-                "interestRate": float(funding_item.get("interestRate", 0.0)),
-            }
-        )
+        yield {
+            **meta,
+            "priceChangePercent": float(ticker.get("priceChangePercent", 0.0)),
+            "volume": float(ticker.get("volume", 0.0)),
+            "quoteVolume": float(ticker.get("quoteVolume", 0.0)),
+            "openPrice": float(ticker.get("openPrice", 0.0)),
+            "highPrice": float(ticker.get("highPrice", 0.0)),
+            "lowPrice": float(ticker.get("lowPrice", 0.0)),
+            "lastPrice": float(ticker.get("lastPrice", 0.0)),
+            "fundingRate": float(funding_item.get("lastFundingRate", 0.0)),
+            "nextFundingTime": funding_item.get("nextFundingTime"),
+            "interestRate": float(funding_item.get("interestRate", 0.0)),
+        }
 
-    records.sort(key=lambda x: x["symbol"])
+
+def build_snapshot() -> Dict[str, List[Dict]]:
+    symbols, tickers, funding = fetch_sources()
+    if not symbols:
+        raise RuntimeError("USDT-M perpetual sözleşme bulunamadı")
+
+    records = list(iter_records(symbols, tickers, funding))
     return {
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "count": len(records),
@@ -93,23 +160,294 @@ def build_snapshot() -> Dict[str, List[Dict]]:
     }
 
 
+def write_snapshot(
+    fp: TextIO, generated_at: str, count: int, records: Iterator[Dict], fmt: str = "pretty"
+) -> int:
+    """Kayıtları geldikçe yazar; yazılan UTF-8 bayt sayısını döndürür.
+
+    pretty çıktısı json.dumps(snapshot, indent=2) ile birebir aynıdır.
+    """
+    written = 0
+
+    def emit(text: str) -> None:
+        nonlocal written
+        fp.write(text)
+        written += len(text.encode("utf-8"))
+
+    if fmt == "ndjson":
+        emit(json.dumps({"generated_at": generated_at, "count": count}, ensure_ascii=False) + "\n")
+        for record in records:
+            emit(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        return written
+
+    if fmt == "compact":
+        head = json.dumps({"generated_at": generated_at, "count": count}, ensure_ascii=False, separators=(",", ":"))
+        emit(head[:-1] + ',"symbols":[')
+        for idx, record in enumerate(records):
+            emit(("," if idx else "") + json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        emit("]}")
+        return written
+
+    head = json.dumps({"generated_at": generated_at, "count": count}, ensure_ascii=False, indent=2)
+    emit(head[:-2] + ',\n  "symbols": [')
+    empty = True
+    for record in records:
+        body = json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+        emit(("\n    " if empty else ",\n    ") + body)
+        empty = False
+    emit("]\n}" if empty else "\n  ]\n}")
+    return written
+
+
+def _ordered_records(snapshot: Dict) -> List[Dict]:
+    """Kayıtları sembol sırasıyla döndürür (zaten sıralıysa kopyalamadan)."""
+    records = snapshot.get("symbols", [])
+    for prev, cur in zip(records, records[1:]):
+        if prev["symbol"] > cur["symbol"]:
+            return sorted(records, key=lambda item: item["symbol"])
+    return records
+
+
+def diff_snapshots(
+    old: Dict,
+    new: Dict,
+    price_threshold: float = DEFAULT_PRICE_THRESHOLD,
+    funding_threshold: float = DEFAULT_FUNDING_THRESHOLD,
+) -> Iterator[Dict]:
+    """İki snapshot'ı sembol anahtarıyla merge-join ederek olayları üretir.
+
+    Olay tipleri: listing, delisting, status, funding (mutlak değişim >=
+    funding_threshold), price (lastPrice yüzde değişimi >= price_threshold).
+    Girdiler sembole göre sıralıysa (build_snapshot çıktısı) süre doğrusaldır.
+    """
+    at = new.get("generated_at")
+    old_records = _ordered_records(old)
+    new_records = _ordered_records(new)
+    i = j = 0
+    while i < len(old_records) or j < len(new_records):
+        before = old_records[i] if i < len(old_records) else None
+        after = new_records[j] if j < len(new_records) else None
+
+        if after is None or (before is not None and before["symbol"] < after["symbol"]):
+            yield {"type": "delisting", "symbol": before["symbol"], "at": at}
+            i += 1
+            continue
+        if before is None or after["symbol"] < before["symbol"]:
+            yield {"type": "listing", "symbol": after["symbol"], "at": at, "status": after.get("status")}
+            j += 1
+            continue
+
+        symbol = after["symbol"]
+        # Eski snapshot'larda status alanı yoktur; bilinmeyen status değişim sayılmaz
+        if before.get("status") and after.get("status") and before["status"] != after["status"]:
+            yield {"type": "status", "symbol": symbol, "at": at,
+                   "old": before.get("status"), "new": after.get("status")}
+
+        old_funding = before.get("fundingRate")
+        new_funding = after.get("fundingRate")
+        if old_funding is not None and new_funding is not None:
+            change = new_funding - old_funding
+            if abs(change) >= funding_threshold:
+                yield {"type": "funding", "symbol": symbol, "at": at,
+                       "old": old_funding, "new": new_funding, "change": change}
+
+        old_price = before.get("lastPrice")
+        new_price = after.get("lastPrice")
+        if old_price and new_price is not None:
+            change_pct = (new_price - old_price) / old_price * 100
+            if abs(change_pct) >= price_threshold:
+                yield {"type": "price", "symbol": symbol, "at": at,
+                       "old": old_price, "new": new_price, "change_pct": change_pct}
+        i += 1
+        j += 1
+
+
+def diff_sequence(snapshots: Iterable[Dict], **thresholds) -> Iterator[Dict]:
+    """Ardışık snapshot çiftlerinin farklarını üretir; bellekte iki snapshot tutulur."""
+    previous: Optional[Dict] = None
+    for snapshot in snapshots:
+        if previous is not None:
+            yield from diff_snapshots(previous, snapshot, **thresholds)
+        previous = snapshot
+
+
+def load_snapshot(path: str) -> Dict:
+    """pretty/compact JSON veya ndjson snapshot dosyasını okur."""
+    with open(path, "r", encoding="utf-8") as fp:
+        first = fp.readline()
+        try:
+            header = json.loads(first)
+        except ValueError:
+            header = None
+        if isinstance(header, dict) and "symbols" not in header and "count" in header:
+            records = [json.loads(line) for line in fp if line.strip()]
+            return {**header, "symbols": records}
+        fp.seek(0)
+        return json.load(fp)
+
+
+def diff_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="binance_perpetual_snapshot.py diff",
+        description="Snapshot farkları (NDJSON olay akışı)",
+    )
+    parser.add_argument("old", nargs="?", help="Eski snapshot dosyası")
+    parser.add_argument("new", nargs="?", help="Yeni snapshot dosyası (boşsa canlı veri)")
+    parser.add_argument("--store", help="Dosyalar yerine depodaki ardışık snapshot'ları karşılaştır")
+    parser.add_argument("--since", help="--store için başlangıç (ISO tarih veya epoch)")
+    parser.add_argument("--until", help="--store için bitiş (ISO tarih veya epoch)")
+    parser.add_argument("--price-threshold", type=float, default=DEFAULT_PRICE_THRESHOLD,
+                        help="Fiyat olayı için yüzde eşik")
+    parser.add_argument("--funding-threshold", type=float, default=DEFAULT_FUNDING_THRESHOLD,
+                        help="Funding olayı için mutlak eşik")
+    parser.add_argument("--output", "-o", help="Olayları bu dosyaya yaz (boşsa stdout)")
+    args = parser.parse_args(argv)
+
+    thresholds = {"price_threshold": args.price_threshold, "funding_threshold": args.funding_threshold}
+    if args.store:
+        from snapshot_store import SnapshotStore
+
+        events = diff_sequence(SnapshotStore(args.store).iter_snapshots(args.since, args.until), **thresholds)
+    elif args.old:
+        new = load_snapshot(args.new) if args.new else build_snapshot()
+        events = diff_snapshots(load_snapshot(args.old), new, **thresholds)
+    else:
+        parser.error("eski snapshot dosyası veya --store gerekli")
+
+    fp = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        count = 0
+        for event in events:
+            fp.write(json.dumps(event, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if args.output:
+            fp.close()
+    print(f"[DIFF] {count} olay", file=sys.stderr)
+    return 0
+
+
 def main(argv: List[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "diff":
+        return diff_main(argv[1:])
+
     parser = argparse.ArgumentParser(description="Binance USDT perpetual snapshot")
     parser.add_argument(
         "--output",
         "-o",
         help="JSON çıktısını kaydetmek için dosya yolu (boş bırakılırsa stdout)",
     )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS + COLUMNAR_FORMATS,
+        default="pretty",
+        help="Çıktı biçimi (varsayılan: pretty)",
+    )
+    parser.add_argument(
+        "--store",
+        help="Snapshot'ı bu dizindeki zaman serisi deposuna ekle",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=float,
+        help="Depoda bu kadar günden eski chunk'ları sil (--store ile)",
+    )
+    parser.add_argument(
+        "--store-max-mb",
+        type=float,
+        help="Depo boyutu bu sınırı aşarsa en eski chunk'ları sil (--store ile)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Sürekli çalış ve son snapshot'ları yerel HTTP üzerinden sun",
+    )
+    parser.add_argument("--interval", type=float, default=60.0, help="--daemon çekme aralığı (sn)")
+    parser.add_argument(
+        "--history",
+        type=int,
+        default=1440,
+        help="--daemon için tutulacak snapshot sayısı. Bellek: history × sembol satırı × 10 alan × 8 bayt; "
+             "satırlar görülen evren + %%25 pay (en az 64) kadar ayrılır (1440 × ~750 ≈ 86 MB)",
+    )
+    parser.add_argument("--max-symbols", type=int, default=2048, help="--daemon için en fazla sembol satırı")
+    parser.add_argument("--host", default="127.0.0.1", help="--daemon HTTP adresi")
+    parser.add_argument("--port", type=int, default=8765, help="--daemon HTTP portu")
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="Çekme, birleştirme ve yazma sürelerini stderr'e raporla",
+    )
     args = parser.parse_args(argv)
+    if args.format in COLUMNAR_FORMATS and not args.output:
+        parser.error(f"--format {args.format} icin --output gerekli")
+
+    if args.daemon:
+        from snapshot_daemon import run_daemon
+
+        store = None
+        if args.store:
+            from snapshot_store import SnapshotStore
+
+            store = SnapshotStore(
+                args.store,
+                retention_seconds=int(args.retention_days * 86400) if args.retention_days else None,
+                max_bytes=int(args.store_max_mb * 1024 * 1024) if args.store_max_mb else None,
+            )
+        run_daemon(args.interval, args.history, args.max_symbols, args.host, args.port, store)
+        return 0
+
+    started = time.perf_counter()
+    symbols, tickers, funding = fetch_sources()
+    fetched = time.perf_counter()
+    if not symbols:
+        raise RuntimeError("USDT-M perpetual sözleşme bulunamadı")
+
+    generated_at = datetime.now(timezone.utc).isoformat()
+    records = iter_records(symbols, tickers, funding)
+    if args.bench or args.store:
+        # --bench'te birleştirme, serileştirme/yazmadan ayrı ölçülür
+        records = list(records)
+    joined = time.perf_counter()
+    written = 0
 
-    snapshot = build_snapshot()
-    text = json.dumps(snapshot, ensure_ascii=False, indent=2)
+    if args.store:
+        from snapshot_store import SnapshotStore
+
+        store = SnapshotStore(
+            args.store,
+            retention_seconds=int(args.retention_days * 86400) if args.retention_days else None,
+            max_bytes=int(args.store_max_mb * 1024 * 1024) if args.store_max_mb else None,
+        )
+        store.append({"generated_at": generated_at, "count": len(records), "symbols": records})
 
-    if args.output:
+    if args.format in COLUMNAR_FORMATS:
+        from columnar_export import ColumnBuffers, FORMAT_EXTENSIONS, export_buffers
+
+        buffers = ColumnBuffers(SNAPSHOT_COLUMNAR_SCHEMA)
+        buffers.extend_records(records)
+        output = args.output
+        if not output.lower().endswith(FORMAT_EXTENSIONS[args.format]):
+            output += FORMAT_EXTENSIONS[args.format]
+        export_buffers(buffers, output, {"generated_at": generated_at, "count": str(len(symbols))})
+        written = os.path.getsize(output) if os.path.exists(output) else 0
+    elif args.output:
         with open(args.output, "w", encoding="utf-8") as fp:
-            fp.write(text)
-    else:
-        print(text)
+            written = write_snapshot(fp, generated_at, len(symbols), iter(records), args.format)
+    elif not args.store:
+        written = write_snapshot(sys.stdout, generated_at, len(symbols), records, args.format)
+        # ndjson her satırı zaten "\n" ile bitirir; ek boş satır boş kayıt gibi okunur
+        if args.format != "ndjson":
+            sys.stdout.write("\n")
+    finished = time.perf_counter()
+
+    if args.bench:
+        print(
+            f"[BENCH] fetch={fetched - started:.3f}s join={joined - fetched:.3f}s write={finished - joined:.3f}s "
+            f"records={len(symbols)} bytes={written} format={args.format}",
+            file=sys.stderr,
+        )
 
     return 0
 
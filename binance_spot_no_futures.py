@@ -10,23 +10,17 @@ Binance Spot'ta olan ancak Vadeli İşlemde OLMAYAN coinleri listeler:
 5. Market cap'e göre sıralar ve kaydeder
 """
 
-import requests
-import time
-from typing import Dict, List, Set
+import sys
 import warnings
 
-warnings.filterwarnings("ignore")
-
-# ---------------------------------------------------------------------------
-# API ENDPOINTS
-# ---------------------------------------------------------------------------
-
-BINANCE_SPOT_SYMBOLS_URL = "https://api.binance.com/api/v3/exchangeInfo"
-BINANCE_FUTURES_SYMBOLS_URL = "https://fapi.binance.com/fapi/v1/exchangeInfo"
-COINMARKETCAP_QUOTES_URL = "https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest"
+import columnar_export
+from coinmarketcap import fetch_coinmarketcap_data
+from exchange_adapters import get_adapter
+from report_writers import CsvReportWriter, MarkdownReportWriter, ReportSink, TableLayout, TextReportWriter
+from symbol_index import get_symbol_index
+from watch_mode import run_cli
 
-# CoinMarketCap API Key
-CMC_API_KEY = "951a1c7c-4e63-466e-8db7-3f4238162fd1"
+warnings.filterwarnings("ignore")
 
 # ---------------------------------------------------------------------------
 # FUNCTIONS
@@ -44,99 +38,6 @@ def grouped_currency(value: float, decimals: int = 0) -> str:
     return "$" + format(v, spec)
 
 
-def fetch_binance_spot_symbols() -> Set[str]:
-    """Binance Spot'taki USDT çiftlerini çeker."""
-    try:
-        response = requests.get(BINANCE_SPOT_SYMBOLS_URL, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        
-        symbols = set()
-        for symbol_info in data.get("symbols", []):
-            symbol = symbol_info.get("symbol", "")
-            status = symbol_info.get("status", "")
-            quote = symbol_info.get("quoteAsset", "")
-            base = symbol_info.get("baseAsset", "")
-            
-            # Sadece USDT çiftleri ve trading durumunda olanlar
-            if status == "TRADING" and quote == "USDT" and base:
-                symbols.add(base)
-        
-        return symbols
-    except Exception as e:
-        print(f"[ERROR] Binance Spot API hatasi: {e}")
-        return set()
-
-
-def fetch_binance_futures_symbols() -> Set[str]:
-    """Binance Futures'daki USDT çiftlerini çeker."""
-    try:
-        response = requests.get(BINANCE_FUTURES_SYMBOLS_URL, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        
-        symbols = set()
-        for symbol_info in data.get("symbols", []):
-            symbol = symbol_info.get("symbol", "")
-            status = symbol_info.get("status", "")
-            quote = symbol_info.get("quoteAsset", "")
-            base = symbol_info.get("baseAsset", "")
-            
-            # Sadece USDT çiftleri ve trading durumunda olanlar
-            if status == "TRADING" and quote == "USDT" and base:
-                symbols.add(base)
-        
-        return symbols
-    except Exception as e:
-        print(f"[ERROR] Binance Futures API hatasi: {e}")
-        return set()
-
-
-def fetch_coinmarketcap_data(symbols: List[str]) -> Dict[str, float]:
-    """CoinMarketCap'ten market cap verilerini çeker."""
-    if not symbols or CMC_API_KEY == "DEMO":
-        return {}
-    
-    marketcaps: Dict[str, float] = {}
-    batch_size = 100
-    
-    headers = {
-        'X-CMC_PRO_API_KEY': CMC_API_KEY,
-        'Accept': 'application/json'
-    }
-    
-    for i in range(0, len(symbols), batch_size):
-        batch = symbols[i:i + batch_size]
-        symbols_str = ",".join(batch)
-        
-        params = {
-            'symbol': symbols_str,
-            'convert': 'USD'
-        }
-        
-        try:
-            response = requests.get(COINMARKETCAP_QUOTES_URL, headers=headers, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status', {}).get('error_code') == 0:
-                coin_data = data.get('data', {})
-                for symbol, info_list in coin_data.items():
-                    if isinstance(info_list, list) and len(info_list) > 0:
-                        info = info_list[0]
-                        quote = info.get('quote', {}).get('USD', {})
-                        mc = quote.get('market_cap')
-                        if mc:
-                            marketcaps[symbol.upper()] = float(mc)
-        except Exception as e:
-            print(f"[WARNING] CoinMarketCap batch hatasi ({i}-{i+batch_size}): {e}")
-        
-        if i + batch_size < len(symbols):
-            time.sleep(0.3)
-    
-    return marketcaps
-
-
 def main():
     print("=" * 80)
     print("BINANCE SPOT - VADELI OLMAYAN COINLER (CoinMarketCap MC)")
@@ -145,7 +46,7 @@ def main():
 
     # 1) Binance Spot coinlerini çek
     print("[1/4] Binance Spot coinleri cekiliyor...")
-    spot_symbols = fetch_binance_spot_symbols()
+    spot_symbols = get_adapter("binance").spot_symbols()
     if not spot_symbols:
         print("[ERROR] Binance Spot verileri alinamadi!")
         return
@@ -153,7 +54,7 @@ def main():
 
     # 2) Binance Futures coinlerini çek
     print("\n[2/4] Binance Futures coinleri cekiliyor...")
-    futures_symbols = fetch_binance_futures_symbols()
+    futures_symbols = get_adapter("binance").futures_symbols()
     if not futures_symbols:
         print("[ERROR] Binance Futures verileri alinamadi!")
         return
@@ -161,7 +62,10 @@ def main():
 
     # 3) Sadece Spot'ta olup Futures'da OLMAYAN coinleri filtrele
     print("\n[3/4] Vadeli olmayan coinler filtreleniyor...")
-    non_futures = sorted(list(spot_symbols - futures_symbols))
+    # Spot PEPE ile vadeli 1000PEPE aynı asset sayılır
+    index = get_symbol_index()
+    non_futures = sorted(index.difference("binance", spot_symbols, "binance.futures", futures_symbols))
+    index.save()
     print(f"[OK] {len(non_futures)} coin sadece spot'ta var (vadeli yok)")
 
     if not non_futures:
@@ -170,7 +74,7 @@ def main():
 
     # 4) CoinMarketCap market cap verilerini çek
     print("\n[4/4] CoinMarketCap market cap verileri cekiliyor...")
-    marketcaps = fetch_coinmarketcap_data(non_futures)
+    marketcaps = fetch_coinmarketcap_data(non_futures, venue="binance")
     print(f"[OK] {len(marketcaps)} coin icin market cap alindi")
 
     # 5) Market cap ile birleştir ve sırala
@@ -188,80 +92,44 @@ def main():
     coins_with_mc.sort(key=lambda x: x[1], reverse=True)
     all_coins = coins_with_mc + coins_without_mc
 
-    # 6) Konsola yazdır
-    print("\n" + "=" * 70)
-    print("BINANCE SPOT - VADELI OLMAYAN COINLER")
-    print("=" * 70)
-    print(f"{'Sira':<6} {'Coin':<10} {'Market Cap (CMC)':>25}")
-    print("-" * 70)
-
-    for idx, (symbol, mc) in enumerate(all_coins, 1):
-        mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
-        print(f"{idx:<6} {symbol:<10} {mc_str:>25}")
-
-    # 7) Özet
-    print("\n" + "=" * 70)
-    print("OZET")
-    print("=" * 70)
-    print(f"Toplam Binance Spot Coin: {len(spot_symbols)}")
-    print(f"Binance Futures Coin: {len(futures_symbols)}")
-    print(f"Sadece Spot (Vadeli Olmayan): {len(non_futures)}")
-    print(f"Market Cap Verisi Olan: {len(coins_with_mc)}")
-    print("=" * 70)
-
-    # 8) CSV kaydet
-    csv_filename = "binance_spot_no_futures.csv"
-    try:
-        with open(csv_filename, "w", encoding="utf-8") as f:
-            f.write("Rank,Symbol,MarketCap_USD,Pretty_MC\n")
-            for idx, (symbol, mc) in enumerate(all_coins, 1):
-                mc_str = f"{mc:.0f}" if mc else "N/A"
-                pretty_mc = grouped_currency(mc, decimals=0) if mc else "N/A"
-                f.write(f"{idx},{symbol},{mc_str},{pretty_mc}\n")
-        print(f"\n[OK] CSV dosyasi kaydedildi: {csv_filename}")
-    except Exception as e:
-        print(f"[WARNING] CSV kayit hatasi: {e}")
-
-    # 9) TXT liste
-    txt_filename = "binance_spot_no_futures.txt"
-    try:
-        with open(txt_filename, "w", encoding="utf-8") as f:
-            f.write("="*70 + "\n")
-            f.write("BINANCE SPOT - VADELI OLMAYAN COINLER\n")
-            f.write("="*70 + "\n")
-            f.write(f"{'Sira':<6} {'Coin':<10} {'Market Cap (CMC)':>25}\n")
-            f.write("-"*70 + "\n")
-            for idx, (symbol, mc) in enumerate(all_coins, 1):
-                mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
-                f.write(f"{idx:<6} {symbol:<10} {mc_str:>25}\n")
-            f.write("\n" + "="*70 + "\n")
-            f.write("OZET\n")
-            f.write("="*70 + "\n")
-            f.write(f"Toplam Binance Spot Coin: {len(spot_symbols)}\n")
-            f.write(f"Binance Futures Coin: {len(futures_symbols)}\n")
-            f.write(f"Sadece Spot (Vadeli Olmayan): {len(non_futures)}\n")
-            f.write(f"Market Cap Verisi Olan: {len(coins_with_mc)}\n")
-            f.write("="*70 + "\n")
-        print(f"[OK] TXT dosyasi kaydedildi: {txt_filename}")
-    except Exception as e:
-        print(f"[WARNING] TXT kayit hatasi: {e}")
+    # 6) Konsol, CSV, TXT ve Markdown tek geçişte yazılır
+    layout = TableLayout("BINANCE SPOT - VADELI OLMAYAN COINLER", 70,
+                         [("Sira", "<6"), ("Coin", "<10"), ("Market Cap (CMC)", ">25")])
+    writers = [
+        TextReportWriter(sys.stdout, leading_newline=True),
+        CsvReportWriter("binance_spot_no_futures.csv", "Rank,Symbol,MarketCap_USD,Pretty_MC"),
+        TextReportWriter("binance_spot_no_futures.txt"),
+        MarkdownReportWriter("binance_spot_no_futures.md", "Binance Spot — Vadeli Olmayan Coinler (CMC MC)",
+                             ["#", "Coin", "Market Cap (CMC)"], "|---:|:----|-------:|"),
+    ]
+    columnar = columnar_export.report_writer(
+        "binance_spot_no_futures", [("Rank", "int"), ("Symbol", "symbol"), ("MarketCap_USD", "float")])
+    if columnar is not None:
+        writers.append(columnar)
+    with ReportSink(layout, writers) as sink:
+        for idx, (symbol, mc) in enumerate(all_coins, 1):
+            mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
+            sink.row((idx, symbol, mc_str), csv=(idx, symbol, f"{mc:.0f}" if mc else "N/A", mc_str),
+                     values=(idx, symbol, mc))
+
+        # 7) Özet
+        completed = sink.finish([
+            "OZET",
+            "=" * 70,
+            f"Toplam Binance Spot Coin: {len(spot_symbols)}",
+            f"Binance Futures Coin: {len(futures_symbols)}",
+            f"Sadece Spot (Vadeli Olmayan): {len(non_futures)}",
+            f"Market Cap Verisi Olan: {len(coins_with_mc)}",
+            "=" * 70,
+        ])
 
-    # 10) Markdown
-    md_filename = "binance_spot_no_futures.md"
-    try:
-        with open(md_filename, "w", encoding="utf-8") as f:
-            f.write("# Binance Spot — Vadeli Olmayan Coinler (CMC MC)\n\n")
-            f.write("| # | Coin | Market Cap (CMC) |\n")
-            f.write("|---:|:----|-------:|\n")
-            for idx, (symbol, mc) in enumerate(all_coins, 1):
-                mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
-                f.write(f"| {idx} | {symbol} | {mc_str} |\n")
-        print(f"[OK] Markdown dosyasi kaydedildi: {md_filename}")
-    except Exception as e:
-        print(f"[WARNING] Markdown kayit hatasi: {e}")
+    print()
+    for writer in completed:
+        if writer.path:
+            print(f"[OK] {writer.label} dosyasi kaydedildi: {writer.path}")
 
     print("\n" + "=" * 70)
 
 
 if __name__ == "__main__":
-    main()
+    run_cli(main, ["binance.spot", "binance.futures"], "Binance spot - vadeli olmayan coinler")
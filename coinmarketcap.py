@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""CoinMarketCap Client
+
+Liste scriptleri ve dashboard tarafından paylaşılan market cap istemcisi.
+
+Semboller önce sembol indeksiyle kanonik asset'e, asset de bir kez CMC ID'sine
+çözülür (/v1/cryptocurrency/map). Eşleme symbol_index.json'da saklanır; aynı
+tickerı kullanan birden fazla coin varsa seçim belirleyicidir (aktif olan,
+en iyi CMC sırası, en küçük ID). Fiyat verisi ID ile ve büyük partiler
+hâlinde istenir; ID'si çözülemeyen semboller eski yöntemle sembol üzerinden
+sorgulanır.
+
+Sonuçlar asset bazında `exchange_adapters.fetch_cache` içinde (çalıştırma
+boyunca) ve marketcap_cache ile diskte (süreçler arası, stale-while-revalidate)
+tutulur; önbellek sıcaksa soğuk başlangıç hiç CMC isteği yapmaz.
+"""
+
+import os
+import time
+from threading import Lock, Thread
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from exchange_adapters import fetch_cache
+from marketcap_cache import get_marketcap_cache
+from symbol_index import get_symbol_index
+
+CMC_BASE = os.environ.get("CMC_BASE_URL", "https://pro-api.coinmarketcap.com")
+COINMARKETCAP_QUOTES_URL = f"{CMC_BASE}/v2/cryptocurrency/quotes/latest"
+COINMARKETCAP_MAP_URL = f"{CMC_BASE}/v1/cryptocurrency/map"
+CMC_API_KEY = os.environ.get("CMC_API_KEY", "951a1c7c-4e63-466e-8db7-3f4238162fd1")
+
+# ID ile sorgularda parti boyutu (plan izin veriyorsa artırılabilir)
+CMC_BATCH_SIZE = int(os.environ.get("CMC_BATCH_SIZE", "1000"))
+# Sembol ile sorgularda parti boyutu
+CMC_SYMBOL_BATCH_SIZE = 100
+# CMC'de bulunamayan semboller bu süreden sonra yeniden denenir
+CMC_MAP_RETRY_SECONDS = 7 * 24 * 3600
+CMC_CACHE_NAMESPACE = "cmc_marketcap"
+
+# Arka planda yenilenmekte olan asset'ler
+_refreshing: Set[int] = set()
+_refresh_lock = Lock()
+
+# Parti isteklerini yürüten fonksiyon: (url, parametre listesi, başlıklar, timeout)
+# -> her parti için yanıt veya istisna. None ise partiler sırayla çekilir;
+# async_ingest eş zamanlı bir uygulama kurar.
+BatchFetcher = Callable[[str, List[Dict], Dict[str, str], float], List[object]]
+_batch_fetcher: Optional[BatchFetcher] = None
+
+
+def _headers() -> Dict[str, str]:
+    return {
+        'X-CMC_PRO_API_KEY': CMC_API_KEY,
+        'Accept': 'application/json'
+    }
+
+
+def _batches(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield i, items[i:i + size]
+
+
+def set_batch_fetcher(fetcher: Optional[BatchFetcher]) -> None:
+    """CMC partilerini çekecek fonksiyonu değiştirir (None = sıralı)."""
+    global _batch_fetcher
+    _batch_fetcher = fetcher
+
+
+def _fetch_batches(url: str, params_list: List[Dict], pause: float = 0.0) -> List[object]:
+    """Partilerin yanıtları (hata veren parti için istisna), istek sırasıyla."""
+    if _batch_fetcher is not None and len(params_list) > 1:
+        return _batch_fetcher(url, params_list, _headers(), 15)
+    results: List[object] = []
+    for n, params in enumerate(params_list):
+        if n and pause:
+            time.sleep(pause)
+        try:
+            results.append(fetch_cache.fetch_json(url, params, _headers(), 15))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def pick_entry(entries: Iterable[Dict]) -> Optional[Dict]:
+    """Aynı tickera sahip CMC kayıtlarından belirleyici olarak birini seçer."""
+    def key(entry):
+        rank = entry.get('cmc_rank', entry.get('rank'))
+        return (entry.get('is_active', 1) != 1, rank is None, rank or 0, entry.get('id', 0))
+
+    entries = [entry for entry in entries if isinstance(entry, dict)]
+    return min(entries, key=key) if entries else None
+
+
+def _market_cap(info: Dict) -> Optional[float]:
+    mc = info.get('quote', {}).get('USD', {}).get('market_cap')
+    return float(mc) if mc else None
+
+
+def resolve_cmc_ids(asset_ids: List[int]) -> None:
+    """CMC ID'si bilinmeyen asset'leri /map ile çözer ve indekse yazar."""
+    index = get_symbol_index()
+    now = time.time()
+    pending: Dict[str, List[int]] = {}
+    for asset_id in asset_ids:
+        cmc_id, checked_at = index.cmc_id(asset_id)
+        if cmc_id is None or (cmc_id == 0 and now - checked_at > CMC_MAP_RETRY_SECONDS):
+            pending.setdefault(index.canonical(asset_id), []).append(asset_id)
+    if not pending:
+        return
+
+    batches = list(_batches(sorted(pending), CMC_SYMBOL_BATCH_SIZE))
+    responses = _fetch_batches(COINMARKETCAP_MAP_URL, [{'symbol': ",".join(batch)} for _, batch in batches])
+    for (i, batch), data in zip(batches, responses):
+        try:
+            if isinstance(data, Exception):
+                raise data
+            if data.get('status', {}).get('error_code') != 0:
+                raise ValueError(data.get('status', {}).get('error_message'))
+            by_symbol: Dict[str, List[Dict]] = {}
+            for entry in data.get('data') or []:
+                by_symbol.setdefault(str(entry['symbol']).upper(), []).append(entry)
+        except Exception as e:
+            print(f"[WARNING] CoinMarketCap map hatasi ({i}-{i+CMC_SYMBOL_BATCH_SIZE}): {e}")
+            continue
+
+        for symbol in batch:
+            entry = pick_entry(by_symbol.get(symbol, []))
+            for asset_id in pending[symbol]:
+                index.set_cmc_id(asset_id, int(entry['id']) if entry else 0, now)
+    index.save()
+
+
+def _quotes_by_id(cmc_ids: Dict[int, List[int]]) -> Dict[int, Optional[float]]:
+    """CMC ID -> asset listesi için market cap'leri ID ile çeker."""
+    found: Dict[int, Optional[float]] = {}
+    batches = list(_batches(sorted(cmc_ids), CMC_BATCH_SIZE))
+    responses = _fetch_batches(COINMARKETCAP_QUOTES_URL, [
+        {'id': ",".join(str(cmc_id) for cmc_id in batch), 'convert': 'USD', 'skip_invalid': 'true'}
+        for _, batch in batches
+    ])
+    for (i, batch), data in zip(batches, responses):
+        try:
+            if isinstance(data, Exception):
+                raise data
+            if data.get('status', {}).get('error_code') != 0:
+                raise ValueError(data.get('status', {}).get('error_message'))
+            coin_data = data.get('data', {})
+            for cmc_id in batch:
+                info = coin_data.get(str(cmc_id))
+                mc = _market_cap(info) if isinstance(info, dict) else None
+                for asset_id in cmc_ids[cmc_id]:
+                    found[asset_id] = mc
+        except Exception as e:
+            print(f"[WARNING] CoinMarketCap batch hatasi ({i}-{i+CMC_BATCH_SIZE}): {e}")
+    return found
+
+
+def _quotes_by_symbol(symbols: Dict[str, List[int]]) -> Dict[int, Optional[float]]:
+    """ID'si çözülemeyen asset'ler için sembolle sorgu (belirleyici seçimle)."""
+    found: Dict[int, Optional[float]] = {}
+    batches = list(_batches(sorted(symbols), CMC_SYMBOL_BATCH_SIZE))
+    responses = _fetch_batches(COINMARKETCAP_QUOTES_URL,
+                               [{'symbol': ",".join(batch), 'convert': 'USD'} for _, batch in batches], pause=0.3)
+    for (i, batch), data in zip(batches, responses):
+        try:
+            if isinstance(data, Exception):
+                raise data
+            if data.get('status', {}).get('error_code') != 0:
+                raise ValueError(data.get('status', {}).get('error_message'))
+            coin_data = {str(symbol).upper(): info for symbol, info in data.get('data', {}).items()}
+            for symbol in batch:
+                info_list = coin_data.get(symbol)
+                info = pick_entry(info_list) if isinstance(info_list, list) else None
+                for asset_id in symbols[symbol]:
+                    found[asset_id] = _market_cap(info) if info else None
+        except Exception as e:
+            print(f"[WARNING] CoinMarketCap batch hatasi ({i}-{i+CMC_SYMBOL_BATCH_SIZE}): {e}")
+    return found
+
+
+def fetch_marketcaps(asset_ids: List[int]) -> Dict[int, Optional[float]]:
+    """Asset'lerin market cap'lerini ağdan çeker ve disk önbelleğine yazar.
+
+    Dönüşte olmayan asset'ler alınamamıştır; None = CMC'de market cap yok.
+    """
+    index = get_symbol_index()
+    resolve_cmc_ids(asset_ids)
+    by_id: Dict[int, List[int]] = {}
+    by_symbol: Dict[str, List[int]] = {}
+    found: Dict[int, Optional[float]] = {}
+    for asset_id in asset_ids:
+        cmc_id, _ = index.cmc_id(asset_id)
+        if cmc_id:
+            by_id.setdefault(cmc_id, []).append(asset_id)
+        elif cmc_id is None:
+            by_symbol.setdefault(index.canonical(asset_id), []).append(asset_id)
+        else:
+            found[asset_id] = None
+
+    if by_id:
+        found.update(_quotes_by_id(by_id))
+    if by_symbol:
+        found.update(_quotes_by_symbol(by_symbol))
+
+    disk_cache = get_marketcap_cache()
+    if disk_cache is not None:
+        disk_cache.store({index.canonical(asset_id): mc for asset_id, mc in found.items()})
+    return found
+
+
+def _refresh_worker(asset_ids: List[int]) -> None:
+    try:
+        found = fetch_marketcaps(asset_ids)
+        fetch_cache.store(CMC_CACHE_NAMESPACE, found)
+    except Exception as e:
+        print(f"[WARNING] CoinMarketCap arka plan yenileme hatasi: {e}")
+    finally:
+        with _refresh_lock:
+            _refreshing.difference_update(asset_ids)
+
+
+def refresh_in_background(asset_ids: List[int]) -> Optional[Thread]:
+    """Bayat asset'leri arka planda yeniler (başka süreç yeniliyorsa atlanır).
+
+    Thread daemon değildir; kısa ömürlü CLI'lar çıkmadan önce yenilemeyi
+    tamamlar ve bir sonraki çalıştırma taze veriyle başlar.
+    """
+    disk_cache = get_marketcap_cache()
+    index = get_symbol_index()
+    with _refresh_lock:
+        asset_ids = [asset_id for asset_id in asset_ids if asset_id not in _refreshing]
+        if disk_cache is not None and asset_ids:
+            claimed = set(disk_cache.claim(index.canonical(asset_id) for asset_id in asset_ids))
+            asset_ids = [asset_id for asset_id in asset_ids if index.canonical(asset_id) in claimed]
+        if not asset_ids:
+            return None
+        _refreshing.update(asset_ids)
+    thread = Thread(target=_refresh_worker, args=(asset_ids,), name="cmc-refresh")
+    thread.start()
+    return thread
+
+
+def fetch_coinmarketcap_data(symbols: List[str], venue: Optional[str] = None) -> Dict[str, float]:
+    """CoinMarketCap'ten market cap verilerini çeker (SYMBOL -> market cap).
+
+    `venue` verilirse semboller o borsanın adlandırmasıyla çözülür
+    (örn. binance.futures 1000PEPE -> PEPE). Disk önbelleğindeki taze ve bayat
+    değerler ağa gitmeden kullanılır; bayat olanlar arka planda yenilenir.
+    """
+    if not symbols or CMC_API_KEY == "DEMO":
+        return {}
+
+    index = get_symbol_index()
+    symbol_assets = {symbol.upper(): index.symbol_asset(symbol.upper(), venue) for symbol in symbols}
+    marketcaps, missing = fetch_cache.lookup(CMC_CACHE_NAMESPACE, sorted(set(symbol_assets.values())))
+
+    if missing:
+        disk_cache = get_marketcap_cache()
+        stale: List[int] = []
+        if disk_cache is not None:
+            cached, stale_assets = disk_cache.lookup(index.canonical(asset_id) for asset_id in missing)
+            stale_assets = set(stale_assets)
+            for asset_id in missing:
+                canonical = index.canonical(asset_id)
+                if canonical in cached:
+                    marketcaps[asset_id] = cached[canonical]
+                    if canonical in stale_assets:
+                        stale.append(asset_id)
+            fetch_cache.store(CMC_CACHE_NAMESPACE, {asset_id: marketcaps[asset_id] for asset_id in missing
+                                                    if asset_id in marketcaps})
+
+        absent = [asset_id for asset_id in missing if asset_id not in marketcaps]
+        if absent:
+            found = fetch_marketcaps(absent)
+            # Yanıtta market cap'i olmayan asset'ler de saklanır (None)
+            fetch_cache.store(CMC_CACHE_NAMESPACE, found)
+            marketcaps.update(found)
+        if stale:
+            refresh_in_background(stale)
+        index.save()
+
+    return {
+        symbol: marketcaps[asset_id]
+        for symbol, asset_id in symbol_assets.items()
+        if marketcaps.get(asset_id) is not None
+    }
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Columnar Export (Parquet / Arrow)
+
+Liste scriptlerinin ve binance_perpetual_snapshot'ın sonuçlarını dataframe'e
+doğrudan yüklenebilen kolonsal dosyalara yazar. CSV'lerdeki "N/A" ve
+"$1,234" gibi metin kolonlarının aksine:
+
+- sayısal kolonlar float64/int64, eksik değerler gerçek null,
+- sembol ve durum kolonları sözlük kodlu (dictionary<int32, string>).
+
+pyarrow isteğe bağlıdır (`pip install pyarrow`); kurulu değilse uyarı
+basılır ve yalnızca CSV/TXT çıktıları üretilir.
+
+Biçim dosya uzantısından belirlenir: .parquet -> Parquet, .arrow/.feather -> Arrow IPC.
+Liste scriptlerinde `--export parquet|arrow` (veya LISTING_EXPORT_FORMAT)
+ile açılır; snapshot için `--format parquet|arrow -o dosya`.
+
+Kullanım:
+    python3 columnar_export.py bench 1_mexc_all_futures.csv 1_mexc_all_futures.parquet
+"""
+
+import argparse
+import csv
+import hashlib
+import math
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from report_writers import ReportWriter, replace_if_changed
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+FORMAT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Liste scriptlerinin kolonsal çıktı biçimi ("" = kapalı)
+EXPORT_FORMAT = os.environ.get("LISTING_EXPORT_FORMAT", "")
+
+# Kolon tipleri: symbol (sözlük kodlu metin), float (float64), int (int64), string
+Schema = Sequence[Tuple[str, str]]
+
+_warned = False
+
+# ---------------------------------------------------------------------------
+# TABLE BUILDING
+# ---------------------------------------------------------------------------
+
+def load_pyarrow():
+    """pyarrow modülü veya kurulu değilse None (uyarı bir kez basılır)."""
+    global _warned
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        if not _warned:
+            print("[WARNING] pyarrow kurulu degil, kolonsal cikti atlandi (pip install pyarrow)")
+            _warned = True
+        return None
+
+
+def format_for_path(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    if ext in (".arrow", ".feather", ".ipc"):
+        return "arrow"
+    raise ValueError(f"Bilinmeyen kolonsal dosya uzantisi: {path} (.parquet | .arrow)")
+
+
+def _float(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def _int(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_CONVERTERS = {"float": _float, "int": _int, "symbol": lambda v: None if v is None else str(v),
+               "string": lambda v: None if v is None else str(v)}
+
+
+class ColumnBuffers:
+    """Satır satır gelen değerleri tipli kolon listelerinde toplar."""
+
+    def __init__(self, schema: Schema):
+        self.schema = list(schema)
+        self.columns: List[List] = [[] for _ in self.schema]
+        self._converters = [_CONVERTERS[kind] for _, kind in self.schema]
+
+    def append(self, values: Sequence) -> None:
+        for column, convert, value in zip(self.columns, self._converters, values):
+            column.append(convert(value))
+
+    def extend_records(self, records: Iterable[Dict]) -> None:
+        names = [name for name, _ in self.schema]
+        for record in records:
+            self.append([record.get(name) for name in names])
+
+    def to_table(self, pa, metadata: Optional[Dict[str, str]] = None):
+        arrays = []
+        for (name, kind), values in zip(self.schema, self.columns):
+            if kind == "symbol":
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            elif kind == "float":
+                arrays.append(pa.array(values, type=pa.float64()))
+            elif kind == "int":
+                arrays.append(pa.array(values, type=pa.int64()))
+            else:
+                arrays.append(pa.array(values, type=pa.string()))
+        return pa.Table.from_arrays(arrays, names=[name for name, _ in self.schema], metadata=metadata)
+
+
+def write_table(table, path: str, fmt: Optional[str] = None) -> None:
+    """Tabloyu Parquet veya Arrow IPC olarak yazar (biçim verilmezse uzantıdan)."""
+    if (fmt or format_for_path(path)) == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression="zstd")
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path, compression="zstd")
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def export_buffers(buffers: ColumnBuffers, path: str, metadata: Optional[Dict[str, str]] = None) -> bool:
+    """Kolonları atomik olarak yazar; içerik değiştiyse True."""
+    pa = load_pyarrow()
+    if pa is None:
+        return False
+    tmp_path = path + ".tmp"
+    try:
+        write_table(buffers.to_table(pa, metadata), tmp_path, format_for_path(path))
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return replace_if_changed(tmp_path, path, _file_sha256(tmp_path))
+
+
+# ---------------------------------------------------------------------------
+# REPORT WRITER
+# ---------------------------------------------------------------------------
+
+class ColumnarReportWriter(ReportWriter):
+    """ReportSink yazıcısı: satırların tipli değerlerini (values) kolonlara toplar."""
+
+    label = "Kolonsal"
+
+    def __init__(self, path: str, schema: Schema):
+        super().__init__(path)
+        self.buffers = ColumnBuffers(schema)
+
+    def row(self, line: str, cells: Sequence, csv_line: str, values: Sequence) -> None:
+        self.buffers.append(values)
+
+    def close(self) -> None:
+        self.changed = export_buffers(self.buffers, self.path)
+
+    def abort(self) -> None:
+        pass
+
+
+def report_writer(stem: str, schema: Schema, fmt: Optional[str] = None) -> Optional[ColumnarReportWriter]:
+    """Kolonsal çıktı açıksa ve pyarrow kuruluysa `stem`.<uzantı> yazıcısı, değilse None."""
+    fmt = EXPORT_FORMAT if fmt is None else fmt
+    if not fmt or load_pyarrow() is None:
+        return None
+    if fmt not in COLUMNAR_FORMATS:
+        print(f"[WARNING] Bilinmeyen kolonsal bicim: {fmt} ({' | '.join(COLUMNAR_FORMATS)})")
+        return None
+    return ColumnarReportWriter(stem + FORMAT_EXTENSIONS[fmt], schema)
+
+
+# ---------------------------------------------------------------------------
+# LOAD BENCHMARK
+# ---------------------------------------------------------------------------
+
+def _load_csv(path: str):
+    """CSV'yi analistlerin yaptığı gibi tipli kolonlara çevirir ("N/A" -> None)."""
+    try:
+        import pandas as pd
+        return pd.read_csv(path, na_values=["N/A"])
+    except ImportError:
+        pass
+    with open(path, "r", encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp)
+        header = next(reader)
+        columns: List[List] = [[] for _ in header]
+        for row in reader:
+            for column, value in zip(columns, row):
+                if value == "N/A":
+                    column.append(None)
+                    continue
+                try:
+                    column.append(float(value))
+                except ValueError:
+                    column.append(value)
+        return dict(zip(header, columns))
+
+
+def _load_columnar(path: str):
+    if format_for_path(path) == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path)
+    try:
+        return table.to_pandas()
+    except ImportError:
+        return table
+
+
+def bench_load(paths: Sequence[str], repeat: int = 20) -> List[Tuple[str, float, int]]:
+    """(dosya, ortalama yükleme süresi sn, bayt) listesi."""
+    results = []
+    for path in paths:
+        loader = _load_csv if path.lower().endswith(".csv") else _load_columnar
+        loader(path)  # ısınma
+        started = time.perf_counter()
+        for _ in range(repeat):
+            loader(path)
+        results.append((path, (time.perf_counter() - started) / repeat, os.path.getsize(path)))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Kolonsal cikti araclari")
+    sub = parser.add_subparsers(dest="command")
+    bench = sub.add_parser("bench", help="CSV ve Parquet/Arrow yukleme surelerini karsilastir")
+    bench.add_argument("paths", nargs="+", help="Karsilastirilacak .csv / .parquet / .arrow dosyalari")
+    bench.add_argument("--repeat", type=int, default=20, help="Dosya basina tekrar sayisi")
+    args = parser.parse_args(argv)
+
+    if args.command != "bench":
+        parser.print_help()
+        return 0
+    if any(not path.lower().endswith(".csv") for path in args.paths) and load_pyarrow() is None:
+        return 1
+
+    results = bench_load(args.paths, max(1, args.repeat))
+    baseline = results[0][1]
+    print(f"{'Dosya':<40} {'Yukleme (ms)':>14} {'Boyut (KB)':>12} {'Oran':>8}")
+    print("-" * 78)
+    for path, seconds, size in results:
+        print(f"{path:<40} {seconds * 1000:>14.3f} {size / 1024:>12.1f} {baseline / seconds if seconds else 0:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
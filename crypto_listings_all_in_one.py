@@ -8,33 +8,35 @@ Tek çalıştırmada 3 liste üretir:
 3. MEXC Vadeli'de VAR ama Bybit Vadeli'de YOK (CMC MC sıralı)
 """
 
-import requests
-import time
-import os
-from typing import Dict, List, Set, Tuple, Optional
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Set, Tuple, Optional
 import warnings
 
-warnings.filterwarnings("ignore")
-
-# ---------------------------------------------------------------------------
-# API ENDPOINTS
-# ---------------------------------------------------------------------------
-
-# MEXC
-MEXC_CONTRACT_DETAIL_URL = "https://contract.mexc.com/api/v1/contract/detail"
-MEXC_SPOT_TICKER_URL = "https://api.mexc.com/api/v3/ticker/price"
+import columnar_export
+from coinmarketcap import fetch_coinmarketcap_data
+from exchange_adapters import get_adapter
+from report_writers import CombinedReport, CsvReportWriter, ReportSink, TableLayout, TextReportWriter
+from symbol_index import get_symbol_index
+from watch_mode import run_cli
 
-# Binance
-BINANCE_SPOT_SYMBOLS_URL = "https://api.binance.com/api/v3/exchangeInfo"
-BINANCE_FUTURES_SYMBOLS_URL = "https://fapi.binance.com/fapi/v1/exchangeInfo"
+warnings.filterwarnings("ignore")
 
-# Bybit
-BYBIT_SPOT_SYMBOLS_URL = "https://api.bybit.com/v5/market/instruments-info"
-BYBIT_FUTURES_SYMBOLS_URL = "https://api.bybit.com/v5/market/instruments-info"
+# Upstream istekleri ve karşılaştırma aşamaları için iş parçacığı sayısı
+STAGE_WORKERS = 4
 
-# CoinMarketCap
-COINMARKETCAP_QUOTES_URL = "https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest"
-CMC_API_KEY = "951a1c7c-4e63-466e-8db7-3f4238162fd1"
+# Kolonsal (Parquet/Arrow) çıktı şemaları, --export ile açılır
+MEXC_COLUMNAR_SCHEMA = [
+    ("Rank", "int"), ("Symbol", "symbol"), ("BaseCoin", "symbol"), ("MaxVol", "float"),
+    ("ContractSize", "float"), ("Price", "float"), ("MaxQty", "float"), ("MaxPosition_USDT", "float"),
+    ("CMC_MC", "float"),
+]
+DIFFERENCE_COLUMNAR_SCHEMA = [
+    ("Rank", "int"), ("Symbol", "symbol"), ("MEXC_MaxPosition_USDT", "float"), ("MarketCap_USD", "float"),
+]
 
 # ---------------------------------------------------------------------------
 # UTILITY FUNCTIONS
@@ -52,91 +54,10 @@ def grouped_currency(value: Optional[float], decimals: int = 0) -> str:
     return "$" + format(v, spec)
 
 
-def fetch_coinmarketcap_data(symbols: List[str]) -> Dict[str, float]:
-    """CoinMarketCap'ten market cap verilerini çeker."""
-    if not symbols or CMC_API_KEY == "DEMO":
-        return {}
-    
-    marketcaps: Dict[str, float] = {}
-    batch_size = 100
-    
-    headers = {
-        'X-CMC_PRO_API_KEY': CMC_API_KEY,
-        'Accept': 'application/json'
-    }
-    
-    for i in range(0, len(symbols), batch_size):
-        batch = symbols[i:i + batch_size]
-        symbols_str = ",".join(batch)
-        
-        params = {
-            'symbol': symbols_str,
-            'convert': 'USD'
-        }
-        
-        try:
-            response = requests.get(COINMARKETCAP_QUOTES_URL, headers=headers, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status', {}).get('error_code') == 0:
-                coin_data = data.get('data', {})
-                for symbol, info_list in coin_data.items():
-                    if isinstance(info_list, list) and len(info_list) > 0:
-                        info = info_list[0]
-                        quote = info.get('quote', {}).get('USD', {})
-                        mc = quote.get('market_cap')
-                        if mc:
-                            marketcaps[symbol.upper()] = float(mc)
-        except Exception as e:
-            print(f"[WARNING] CoinMarketCap batch hatasi ({i}-{i+batch_size}): {e}")
-        
-        if i + batch_size < len(symbols):
-            time.sleep(0.3)
-    
-    return marketcaps
-
-
 # ---------------------------------------------------------------------------
 # MEXC FUNCTIONS
 # ---------------------------------------------------------------------------
 
-def fetch_mexc_contracts() -> List[Dict]:
-    """MEXC vadeli işlem sözleşmelerini çeker."""
-    try:
-        response = requests.get(MEXC_CONTRACT_DETAIL_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("success") and data.get("data"):
-            return data["data"]
-        return []
-    except Exception as e:
-        print(f"[ERROR] MEXC contract detail hatasi: {e}")
-        return []
-
-
-def fetch_mexc_spot_prices() -> Dict[str, float]:
-    """MEXC spot fiyatlarini ceker (symbol -> price)."""
-    try:
-        response = requests.get(MEXC_SPOT_TICKER_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        price_map = {}
-        if isinstance(data, list):
-            for item in data:
-                symbol = item.get("symbol", "")
-                price = item.get("price")
-                if symbol and price is not None:
-                    try:
-                        price_map[symbol] = float(price)
-                    except (ValueError, TypeError):
-                        pass
-        return price_map
-    except Exception as e:
-        print(f"[ERROR] MEXC spot ticker hatasi: {e}")
-        return {}
-
-
 def calculate_max_positions(contracts: List[Dict], spot_prices: Dict[str, float]) -> List[Tuple[str, str, float, float, float, float, float]]:
     """Max pozisyon degerlerini hesaplar."""
     results = []
@@ -171,21 +92,21 @@ def calculate_max_positions(contracts: List[Dict], spot_prices: Dict[str, float]
     return results
 
 
-def process_mexc():
+def process_mexc(combined: Optional[CombinedReport] = None):
     """MEXC vadeli işlem listesini işler."""
     print("\n" + "=" * 80)
     print("LISTE 1: MEXC VADELI ISLEMLER - TUM COINLER")
     print("=" * 80)
     
     print("\n[1/4] MEXC sozlesmeleri cekiliyor...")
-    contracts = fetch_mexc_contracts()
+    contracts = get_adapter("mexc").contract_specs()
     if not contracts:
         print("[ERROR] MEXC sozlesmeleri alinamadi!")
         return None, None
     print(f"[OK] {len(contracts)} sozlesme bulundu")
 
     print("\n[2/4] MEXC spot fiyatlari cekiliyor...")
-    tickers = fetch_mexc_spot_prices()
+    tickers = get_adapter("mexc").tickers()
     if not tickers:
         print("[ERROR] MEXC ticker verileri alinamadi!")
         return None, None
@@ -207,7 +128,7 @@ def process_mexc():
 
     print("\n[4/4] CoinMarketCap market cap verileri cekiliyor...")
     symbols_list = list(mexc_futures_coins)
-    marketcaps_cmc = fetch_coinmarketcap_data(symbols_list)
+    marketcaps_cmc = fetch_coinmarketcap_data(symbols_list, venue="mexc")
     print(f"[OK] {len(marketcaps_cmc)} coin icin market cap alindi")
 
     # Birleştir ve sırala
@@ -224,97 +145,99 @@ def process_mexc():
     positions_with_cmc.sort(key=lambda x: x[7], reverse=True)
     sorted_positions = positions_with_cmc + positions_without_cmc
 
-    # Yazdır
-    print("\n" + "=" * 110)
-    print("MEXC FUTURES - TUM COINLER (MAX POZISYON VE MARKET CAP)")
-    print("=" * 110)
-    print(f"{'Sira':<5} {'Coin':<8} {'MaxPoz(USDT)':>18} {'CMC MC':>18}")
-    print("-" * 110)
-
-    for idx, (symbol, base_coin, max_vol, contract_size, price, max_qty, max_pos_usdt, mc_cmc) in enumerate(sorted_positions[:50], 1):
-        max_str = grouped_currency(max_pos_usdt, decimals=0)
-        cmc_str = grouped_currency(mc_cmc, decimals=0) if mc_cmc else "N/A"
-        print(f"{idx:<5} {base_coin:<8} {max_str:>18} {cmc_str:>18}")
-
-    if len(sorted_positions) > 50:
-        print(f"... ve {len(sorted_positions) - 50} coin daha ...")
-
-    # Kaydet
+    # Konsol (ilk 50), CSV, TXT ve tek TXT bölümü aynı geçişte yazılır
     total_max_pos = sum(x[6] for x in positions)
-    mc_count_cmc = len([x for x in sorted_positions if x[7] is not None])
+    mc_count_cmc = len(positions_with_cmc)
 
     csv_filename = "1_mexc_all_futures.csv"
-    with open(csv_filename, "w", encoding="utf-8") as f:
-        f.write("Rank,Symbol,BaseCoin,MaxVol,ContractSize,Price,MaxQty,MaxPosition_USDT,CMC_MC,Pretty_MaxPosition,Pretty_CMC_MC\n")
-        for idx, (symbol, base_coin, max_vol, contract_size, price, max_qty, max_pos_usdt, mc_cmc) in enumerate(sorted_positions, 1):
-            cmc_str = f"{mc_cmc:.0f}" if mc_cmc else "N/A"
-            pretty_max = grouped_currency(max_pos_usdt, decimals=0)
-            pretty_cmc = grouped_currency(mc_cmc, decimals=0) if mc_cmc else "N/A"
-            f.write(f"{idx},{symbol},{base_coin},{max_vol:.0f},{contract_size:.8f},{price:.8f},{max_qty:.2f},{max_pos_usdt:.2f},{cmc_str},{pretty_max},{pretty_cmc}\n")
-
     txt_filename = "1_mexc_all_futures.txt"
-    with open(txt_filename, "w", encoding="utf-8") as f:
-        f.write("="*110 + "\n")
-        f.write("MEXC FUTURES - TUM COINLER (MAX POZISYON VE MARKET CAP)\n")
-        f.write("="*110 + "\n")
-        f.write(f"{'Sira':<5} {'Coin':<8} {'MaxPoz(USDT)':>18} {'CMC MC':>18}\n")
-        f.write("-"*110 + "\n")
+    layout = TableLayout("MEXC FUTURES - TUM COINLER (MAX POZISYON VE MARKET CAP)", 110,
+                         [("Sira", "<5"), ("Coin", "<8"), ("MaxPoz(USDT)", ">18"), ("CMC MC", ">18")])
+    writers = [
+        TextReportWriter(sys.stdout, limit=50, leading_newline=True, summary=False),
+        CsvReportWriter(csv_filename, "Rank,Symbol,BaseCoin,MaxVol,ContractSize,Price,MaxQty,MaxPosition_USDT,CMC_MC,Pretty_MaxPosition,Pretty_CMC_MC"),
+        TextReportWriter(txt_filename),
+    ]
+    columnar = columnar_export.report_writer("1_mexc_all_futures", MEXC_COLUMNAR_SCHEMA)
+    if columnar is not None:
+        writers.append(columnar)
+    if combined is not None:
+        writers.append(combined.section(1))
+
+    with ReportSink(layout, writers) as sink:
         for idx, (symbol, base_coin, max_vol, contract_size, price, max_qty, max_pos_usdt, mc_cmc) in enumerate(sorted_positions, 1):
             max_str = grouped_currency(max_pos_usdt, decimals=0)
             cmc_str = grouped_currency(mc_cmc, decimals=0) if mc_cmc else "N/A"
-            f.write(f"{idx:<5} {base_coin:<8} {max_str:>18} {cmc_str:>18}\n")
-        f.write("\n" + "="*110 + "\n")
-        f.write(f"Toplam Coin: {len(positions)}\n")
-        f.write(f"Toplam Max Pozisyon: ${total_max_pos:,.2f} USDT\n")
-        f.write(f"Market Cap Verisi Olan: {mc_count_cmc} coin\n")
-
-    print(f"\n[OK] Dosyalar kaydedildi: {csv_filename}, {txt_filename}")
+            sink.row((idx, base_coin, max_str, cmc_str),
+                     csv=(idx, symbol, base_coin, f"{max_vol:.0f}", f"{contract_size:.8f}", f"{price:.8f}",
+                          f"{max_qty:.2f}", f"{max_pos_usdt:.2f}", f"{mc_cmc:.0f}" if mc_cmc else "N/A", max_str, cmc_str),
+                     values=(idx, symbol, base_coin, max_vol, contract_size, price, max_qty, max_pos_usdt, mc_cmc))
+        saved = [writer.path for writer in sink.finish([
+            f"Toplam Coin: {len(positions)}",
+            f"Toplam Max Pozisyon: ${total_max_pos:,.2f} USDT",
+            f"Market Cap Verisi Olan: {mc_count_cmc} coin",
+        ]) if writer.path]
+
+    print(f"\n[OK] Dosyalar kaydedildi: {', '.join(saved)}")
     print(f"[OZET] Toplam: {len(positions)} coin, Market Cap: {mc_count_cmc} coin")
     
     return mexc_futures_coins, mexc_positions_map  # Set ve map'i döndür
 
 
+# ---------------------------------------------------------------------------
+# DIFFERENCE REPORTS
+# ---------------------------------------------------------------------------
+
+def write_difference_report(title: str, csv_filename: str, txt_filename: str,
+                            all_coins: List[Tuple[str, float, Optional[float]]], summary: List[str],
+                            combined: Optional[CombinedReport], order: int) -> List[str]:
+    """Liste 2/3'ü konsol (ilk 50), CSV, TXT ve tek TXT'ye tek geçişte yazar."""
+    layout = TableLayout(title, 100,
+                         [("Sira", "<6"), ("Coin", "<10"), ("MEXC MaxPoz(USDT)", ">25"), ("CMC MC", ">25")])
+    writers = [
+        TextReportWriter(sys.stdout, limit=50, leading_newline=True, summary=False),
+        CsvReportWriter(csv_filename, "Rank,Symbol,MEXC_MaxPosition_USDT,MarketCap_USD,Pretty_MaxPos,Pretty_MC"),
+        TextReportWriter(txt_filename),
+    ]
+    columnar = columnar_export.report_writer(txt_filename.rsplit(".", 1)[0], DIFFERENCE_COLUMNAR_SCHEMA)
+    if columnar is not None:
+        writers.append(columnar)
+    if combined is not None:
+        writers.append(combined.section(order))
+
+    with ReportSink(layout, writers) as sink:
+        for idx, (symbol, max_pos, mc) in enumerate(all_coins, 1):
+            max_str = grouped_currency(max_pos, decimals=0)
+            mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
+            sink.row((idx, symbol, max_str, mc_str),
+                     csv=(idx, symbol, f"{max_pos:.2f}", f"{mc:.0f}" if mc else "N/A", max_str, mc_str),
+                     values=(idx, symbol, max_pos, mc))
+        return [writer.path for writer in sink.finish(summary) if writer.path]
+
+
 # ---------------------------------------------------------------------------
 # BINANCE FUNCTIONS
 # ---------------------------------------------------------------------------
 
-def fetch_binance_futures_symbols() -> Set[str]:
-    """Binance Futures'daki USDT çiftlerini çeker."""
-    try:
-        response = requests.get(BINANCE_FUTURES_SYMBOLS_URL, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        
-        symbols = set()
-        for symbol_info in data.get("symbols", []):
-            status = symbol_info.get("status", "")
-            quote = symbol_info.get("quoteAsset", "")
-            base = symbol_info.get("baseAsset", "")
-            
-            if status == "TRADING" and quote == "USDT" and base:
-                symbols.add(base.upper())
-        
-        return symbols
-    except Exception as e:
-        print(f"[ERROR] Binance Futures API hatasi: {e}")
-        return set()
-
-
-def process_binance(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str, float]):
+def process_binance(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str, float],
+                    combined: Optional[CombinedReport] = None):
     """MEXC vadeli'de olup Binance vadeli'de OLMAYAN coinleri bulur."""
     print("\n" + "=" * 80)
     print("LISTE 2: MEXC VADELI'DE VAR - BINANCE VADELI'DE YOK")
     print("=" * 80)
     
     print("\n[1/3] Binance Futures coinleri cekiliyor...")
-    binance_futures = fetch_binance_futures_symbols()
+    binance_futures = get_adapter("binance").futures_symbols()
     if not binance_futures:
         print("[ERROR] Binance Futures verileri alinamadi!")
         return
     print(f"[OK] {len(binance_futures)} futures coin bulundu")
 
     print("\n[2/3] MEXC'de olup Binance'de olmayan coinler filtreleniyor...")
-    not_in_binance = sorted(list(mexc_futures_coins - binance_futures))
+    # 1000PEPE / PEPE gibi farklı adlar aynı asset ID'sine eşlenir
+    index = get_symbol_index()
+    not_in_binance = sorted(index.difference("mexc", mexc_futures_coins, "binance.futures", binance_futures))
+    index.save()
     print(f"[OK] {len(not_in_binance)} coin MEXC'de var, Binance'de yok")
 
     if not not_in_binance:
@@ -322,7 +245,7 @@ def process_binance(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str,
         return
 
     print("\n[3/3] CoinMarketCap market cap verileri cekiliyor...")
-    marketcaps = fetch_coinmarketcap_data(not_in_binance)
+    marketcaps = fetch_coinmarketcap_data(not_in_binance, venue="mexc")
     print(f"[OK] {len(marketcaps)} coin icin market cap alindi")
 
     coins_with_mc = []
@@ -339,47 +262,16 @@ def process_binance(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str,
     coins_with_mc.sort(key=lambda x: x[2], reverse=True)
     all_coins = coins_with_mc + coins_without_mc
 
-    print("\n" + "=" * 100)
-    print("MEXC VADELI'DE VAR - BINANCE VADELI'DE YOK")
-    print("=" * 100)
-    print(f"{'Sira':<6} {'Coin':<10} {'MEXC MaxPoz(USDT)':>25} {'CMC MC':>25}")
-    print("-" * 100)
-
-    for idx, (symbol, max_pos, mc) in enumerate(all_coins[:50], 1):
-        max_str = grouped_currency(max_pos, decimals=0)
-        mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
-        print(f"{idx:<6} {symbol:<10} {max_str:>25} {mc_str:>25}")
-
-    if len(all_coins) > 50:
-        print(f"... ve {len(all_coins) - 50} coin daha ...")
-
-    csv_filename = "2_mexc_yes_binance_no.csv"
-    with open(csv_filename, "w", encoding="utf-8") as f:
-        f.write("Rank,Symbol,MEXC_MaxPosition_USDT,MarketCap_USD,Pretty_MaxPos,Pretty_MC\n")
-        for idx, (symbol, max_pos, mc) in enumerate(all_coins, 1):
-            max_str = f"{max_pos:.2f}"
-            mc_str = f"{mc:.0f}" if mc else "N/A"
-            pretty_max = grouped_currency(max_pos, decimals=0)
-            pretty_mc = grouped_currency(mc, decimals=0) if mc else "N/A"
-            f.write(f"{idx},{symbol},{max_str},{mc_str},{pretty_max},{pretty_mc}\n")
-
-    txt_filename = "2_mexc_yes_binance_no.txt"
-    with open(txt_filename, "w", encoding="utf-8") as f:
-        f.write("="*100 + "\n")
-        f.write("MEXC VADELI'DE VAR - BINANCE VADELI'DE YOK\n")
-        f.write("="*100 + "\n")
-        f.write(f"{'Sira':<6} {'Coin':<10} {'MEXC MaxPoz(USDT)':>25} {'CMC MC':>25}\n")
-        f.write("-"*100 + "\n")
-        for idx, (symbol, max_pos, mc) in enumerate(all_coins, 1):
-            max_str = grouped_currency(max_pos, decimals=0)
-            mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
-            f.write(f"{idx:<6} {symbol:<10} {max_str:>25} {mc_str:>25}\n")
-        f.write("\n" + "="*100 + "\n")
-        f.write(f"MEXC Vadeli: {len(mexc_futures_coins)}, Binance Vadeli: {len(binance_futures)}\n")
-        f.write(f"MEXC'de var Binance'de yok: {len(not_in_binance)}\n")
-        f.write(f"Market Cap Verisi Olan: {len(coins_with_mc)} coin\n")
+    summary = [
+        f"MEXC Vadeli: {len(mexc_futures_coins)}, Binance Vadeli: {len(binance_futures)}",
+        f"MEXC'de var Binance'de yok: {len(not_in_binance)}",
+        f"Market Cap Verisi Olan: {len(coins_with_mc)} coin",
+    ]
+    saved = write_difference_report("MEXC VADELI'DE VAR - BINANCE VADELI'DE YOK",
+                                    "2_mexc_yes_binance_no.csv", "2_mexc_yes_binance_no.txt",
+                                    all_coins, summary, combined, order=2)
 
-    print(f"\n[OK] Dosyalar kaydedildi: {csv_filename}, {txt_filename}")
+    print(f"\n[OK] Dosyalar kaydedildi: {', '.join(saved)}")
     print(f"[OZET] MEXC'de var Binance'de yok: {len(not_in_binance)} coin, Market Cap: {len(coins_with_mc)} coin")
 
 
@@ -387,45 +279,25 @@ def process_binance(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str,
 # BYBIT FUNCTIONS
 # ---------------------------------------------------------------------------
 
-def fetch_bybit_futures_symbols() -> Set[str]:
-    """Bybit Futures'daki USDT çiftlerini çeker."""
-    try:
-        params = {"category": "linear"}
-        response = requests.get(BYBIT_FUTURES_SYMBOLS_URL, params=params, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        
-        symbols = set()
-        if data.get("retCode") == 0:
-            for item in data.get("result", {}).get("list", []):
-                status = item.get("status", "")
-                quote = item.get("quoteCoin", "")
-                base = item.get("baseCoin", "")
-                
-                if status == "Trading" and quote == "USDT" and base:
-                    symbols.add(base.upper())
-        
-        return symbols
-    except Exception as e:
-        print(f"[ERROR] Bybit Futures API hatasi: {e}")
-        return set()
-
-
-def process_bybit(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str, float]):
+def process_bybit(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str, float],
+                  combined: Optional[CombinedReport] = None):
     """MEXC vadeli'de olup Bybit vadeli'de OLMAYAN coinleri bulur."""
     print("\n" + "=" * 80)
     print("LISTE 3: MEXC VADELI'DE VAR - BYBIT VADELI'DE YOK")
     print("=" * 80)
     
     print("\n[1/3] Bybit Futures coinleri cekiliyor...")
-    bybit_futures = fetch_bybit_futures_symbols()
+    bybit_futures = get_adapter("bybit").futures_symbols()
     if not bybit_futures:
         print("[ERROR] Bybit Futures verileri alinamadi!")
         return
     print(f"[OK] {len(bybit_futures)} futures coin bulundu")
 
     print("\n[2/3] MEXC'de olup Bybit'te olmayan coinler filtreleniyor...")
-    not_in_bybit = sorted(list(mexc_futures_coins - bybit_futures))
+    # 1000PEPE / PEPE gibi farklı adlar aynı asset ID'sine eşlenir
+    index = get_symbol_index()
+    not_in_bybit = sorted(index.difference("mexc", mexc_futures_coins, "bybit.futures", bybit_futures))
+    index.save()
     print(f"[OK] {len(not_in_bybit)} coin MEXC'de var, Bybit'te yok")
 
     if not not_in_bybit:
@@ -433,7 +305,7 @@ def process_bybit(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str, fl
         return
 
     print("\n[3/3] CoinMarketCap market cap verileri cekiliyor...")
-    marketcaps = fetch_coinmarketcap_data(not_in_bybit)
+    marketcaps = fetch_coinmarketcap_data(not_in_bybit, venue="mexc")
     print(f"[OK] {len(marketcaps)} coin icin market cap alindi")
 
     coins_with_mc = []
@@ -450,79 +322,79 @@ def process_bybit(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str, fl
     coins_with_mc.sort(key=lambda x: x[2], reverse=True)
     all_coins = coins_with_mc + coins_without_mc
 
-    print("\n" + "=" * 100)
-    print("MEXC VADELI'DE VAR - BYBIT VADELI'DE YOK")
-    print("=" * 100)
-    print(f"{'Sira':<6} {'Coin':<10} {'MEXC MaxPoz(USDT)':>25} {'CMC MC':>25}")
-    print("-" * 100)
+    summary = [
+        f"MEXC Vadeli: {len(mexc_futures_coins)}, Bybit Vadeli: {len(bybit_futures)}",
+        f"MEXC'de var Bybit'te yok: {len(not_in_bybit)}",
+        f"Market Cap Verisi Olan: {len(coins_with_mc)} coin",
+    ]
+    saved = write_difference_report("MEXC VADELI'DE VAR - BYBIT VADELI'DE YOK",
+                                    "3_mexc_yes_bybit_no.csv", "3_mexc_yes_bybit_no.txt",
+                                    all_coins, summary, combined, order=3)
 
-    for idx, (symbol, max_pos, mc) in enumerate(all_coins[:50], 1):
-        max_str = grouped_currency(max_pos, decimals=0)
-        mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
-        print(f"{idx:<6} {symbol:<10} {max_str:>25} {mc_str:>25}")
+    print(f"\n[OK] Dosyalar kaydedildi: {', '.join(saved)}")
+    print(f"[OZET] MEXC'de var Bybit'te yok: {len(not_in_bybit)} coin, Market Cap: {len(coins_with_mc)} coin")
 
-    if len(all_coins) > 50:
-        print(f"... ve {len(all_coins) - 50} coin daha ...")
 
-    csv_filename = "3_mexc_yes_bybit_no.csv"
-    with open(csv_filename, "w", encoding="utf-8") as f:
-        f.write("Rank,Symbol,MEXC_MaxPosition_USDT,MarketCap_USD,Pretty_MaxPos,Pretty_MC\n")
-        for idx, (symbol, max_pos, mc) in enumerate(all_coins, 1):
-            max_str = f"{max_pos:.2f}"
-            mc_str = f"{mc:.0f}" if mc else "N/A"
-            pretty_max = grouped_currency(max_pos, decimals=0)
-            pretty_mc = grouped_currency(mc, decimals=0) if mc else "N/A"
-            f.write(f"{idx},{symbol},{max_str},{mc_str},{pretty_max},{pretty_mc}\n")
-
-    txt_filename = "3_mexc_yes_bybit_no.txt"
-    with open(txt_filename, "w", encoding="utf-8") as f:
-        f.write("="*100 + "\n")
-        f.write("MEXC VADELI'DE VAR - BYBIT VADELI'DE YOK\n")
-        f.write("="*100 + "\n")
-        f.write(f"{'Sira':<6} {'Coin':<10} {'MEXC MaxPoz(USDT)':>25} {'CMC MC':>25}\n")
-        f.write("-"*100 + "\n")
-        for idx, (symbol, max_pos, mc) in enumerate(all_coins, 1):
-            max_str = grouped_currency(max_pos, decimals=0)
-            mc_str = grouped_currency(mc, decimals=0) if mc else "N/A"
-            f.write(f"{idx:<6} {symbol:<10} {max_str:>25} {mc_str:>25}\n")
-        f.write("\n" + "="*100 + "\n")
-        f.write(f"MEXC Vadeli: {len(mexc_futures_coins)}, Bybit Vadeli: {len(bybit_futures)}\n")
-        f.write(f"MEXC'de var Bybit'te yok: {len(not_in_bybit)}\n")
-        f.write(f"Market Cap Verisi Olan: {len(coins_with_mc)} coin\n")
+# ---------------------------------------------------------------------------
+# PIPELINE
+# ---------------------------------------------------------------------------
 
-    print(f"\n[OK] Dosyalar kaydedildi: {csv_filename}, {txt_filename}")
-    print(f"[OZET] MEXC'de var Bybit'te yok: {len(not_in_bybit)} coin, Market Cap: {len(coins_with_mc)} coin")
+class StageOutput:
+    """Paralel aşamaların konsol çıktısını thread başına tamponlar.
+
+    sys.stdout yerine kurulur; capture() içindeki thread'lerin yazdıkları
+    tampona gider, diğerleri doğrudan konsola yazılır. Böylece aşamalar
+    paralel çalışırken çıktıları liste sırasıyla ve karışmadan basılır.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        return (getattr(self._local, "buffer", None) or self.stream).write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    @contextmanager
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
+    def run(self, fn: Callable, *args) -> str:
+        """fn'i çıktısını yakalayarak çalıştırır; yakalanan metni döndürür."""
+        with self.capture() as buffer:
+            fn(*args)
+        return buffer.getvalue()
+
+
+def prefetch_upstreams(pool: ThreadPoolExecutor, output: StageOutput) -> None:
+    """Aşamaların ihtiyaç duyduğu borsa verilerini hemen çekmeye başlar.
+
+    Yanıtlar fetch_cache'e yazılır; aşamalardaki aynı çağrılar sürmekte olan
+    isteği bekler veya önbellekten döner. Hatalar burada yutulur, aşamanın
+    kendi çağrısı yeniden dener ve hatayı raporlar.
+    """
+    mexc = get_adapter("mexc")
+    for fetch in (mexc.contract_specs, mexc.tickers,
+                  get_adapter("binance").futures_symbols, get_adapter("bybit").futures_symbols):
+        pool.submit(output.run, fetch)
 
 
 # ---------------------------------------------------------------------------
 # MAIN
 # ---------------------------------------------------------------------------
 
-def create_combined_txt():
-    """Tek TXT dosyasında 3 listeyi birleştirir."""
-    combined_filename = "crypto_listings.txt"
-    
+def write_combined_txt(combined: CombinedReport):
+    """Listelerin aynı geçişte toplanan bölümlerini tek TXT dosyasına yazar."""
     try:
-        with open(combined_filename, "w", encoding="utf-8") as outfile:
-            # Liste 1'i ekle
-            if os.path.exists("1_mexc_all_futures.txt"):
-                with open("1_mexc_all_futures.txt", "r", encoding="utf-8") as f:
-                    outfile.write(f.read())
-                    outfile.write("\n\n")
-            
-            # Liste 2'yi ekle
-            if os.path.exists("2_mexc_yes_binance_no.txt"):
-                with open("2_mexc_yes_binance_no.txt", "r", encoding="utf-8") as f:
-                    outfile.write(f.read())
-                    outfile.write("\n\n")
-            
-            # Liste 3'ü ekle
-            if os.path.exists("3_mexc_yes_bybit_no.txt"):
-                with open("3_mexc_yes_bybit_no.txt", "r", encoding="utf-8") as f:
-                    outfile.write(f.read())
-        
-        print(f"[OK] Tek TXT dosyasi olusturuldu: {combined_filename}")
-    except Exception as e:
+        combined.write()
+        print(f"[OK] Tek TXT dosyasi olusturuldu: {combined.path}")
+    except OSError as e:
         print(f"[WARNING] Tek TXT dosyasi olusturma hatasi: {e}")
 
 
@@ -531,24 +403,38 @@ def main():
     print("CRYPTO LISTINGS ALL-IN-ONE")
     print("MEXC Referans: Liste 1 Tum | Liste 2 vs Binance | Liste 3 vs Bybit")
     print("=" * 80)
-    
-    # Liste 1: MEXC TÜM Vadeli Coinler
-    mexc_futures_coins, mexc_positions_map = process_mexc()
-    
-    if mexc_futures_coins is None or mexc_positions_map is None:
-        print("[ERROR] MEXC verileri alinamadi, diger listeler olusturulamaz!")
-        return
-    
-    # Liste 2: MEXC'de var, Binance'de yok
-    binance_results = process_binance(mexc_futures_coins, mexc_positions_map)
-    
-    # Liste 3: MEXC'de var, Bybit'te yok
-    bybit_results = process_bybit(mexc_futures_coins, mexc_positions_map)
-    
+
+    combined = CombinedReport("crypto_listings.txt")
+    output = StageOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=STAGE_WORKERS) as pool:
+            # Binance/Bybit vadeli listeleri MEXC aşamasıyla eş zamanlı çekilir
+            prefetch_upstreams(pool, output)
+
+            # Liste 1: MEXC TÜM Vadeli Coinler. CMC sorgusu tüm MEXC coinlerini
+            # (Liste 2 ve 3'ün birleşimini) tek seferde kapsar; sonraki
+            # aşamalar market cap'leri süreç içi önbellekten alır.
+            mexc_futures_coins, mexc_positions_map = process_mexc(combined)
+
+            if mexc_futures_coins is None or mexc_positions_map is None:
+                print("[ERROR] MEXC verileri alinamadi, diger listeler olusturulamaz!")
+                return
+
+            # Liste 2 ve 3 paralel çalışır, çıktıları sırayla basılır
+            stages = [
+                pool.submit(output.run, process_binance, mexc_futures_coins, mexc_positions_map, combined),
+                pool.submit(output.run, process_bybit, mexc_futures_coins, mexc_positions_map, combined),
+            ]
+            for stage in stages:
+                output.stream.write(stage.result())
+    finally:
+        sys.stdout = output.stream
+
     # TEK TXT DOSYASI OLUŞTUR
     print("\n[FINAL] Tek TXT dosyasi olusturuluyor...")
-    create_combined_txt()
-    
+    write_combined_txt(combined)
+
     print("\n" + "=" * 80)
     print("TUM LISTELER TAMAMLANDI!")
     print("=" * 80)
@@ -561,4 +447,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_cli(main, ["mexc.futures", "binance.futures", "bybit.futures"], "MEXC vadeli listeleri (Liste 1-3)")
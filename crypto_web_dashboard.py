@@ -6,33 +6,35 @@ Web üzerinden canlı olarak güncellenen kripto para listeleri.
 Her saniye otomatik olarak yenilenir.
 """
 
-import requests
+import hashlib
+import json
 import time
 import os
+import zlib
 from typing import Dict, List, Set, Tuple, Optional
 import warnings
+from bisect import bisect_left
 from flask import Flask, render_template, jsonify, request
 from threading import Thread, Lock
 from datetime import datetime
 
+from async_ingest import warm_exchange_cache
+from coinmarketcap import fetch_coinmarketcap_data
+from exchange_adapters import (BINANCE_FUTURES_SYMBOLS_URL, MEXC_CONTRACT_DETAIL_URL, MEXC_SPOT_TICKER_URL,
+                               fetch_cache, get_adapter)
+from http_transport import ResilientTransport, get_transport
+from membership import PRESET_EXPRESSIONS, matrix_from_sets, referenced_columns
+from symbol_index import get_symbol_index
+
 warnings.filterwarnings("ignore")
 
 # ---------------------------------------------------------------------------
-# API ENDPOINTS
+# SETTINGS
 # ---------------------------------------------------------------------------
 
-# MEXC
-MEXC_CONTRACT_DETAIL_URL = "https://contract.mexc.com/api/v1/contract/detail"
-MEXC_SPOT_TICKER_URL = "https://api.mexc.com/api/v3/ticker/price"
-
-# Binance
-BINANCE_SPOT_SYMBOLS_URL = "https://api.binance.com/api/v3/exchangeInfo"
-BINANCE_FUTURES_SYMBOLS_URL = "https://fapi.binance.com/fapi/v1/exchangeInfo"
-
-# CoinMarketCap
-COINMARKETCAP_QUOTES_URL = "https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest"
-CMC_API_KEY = "951a1c7c-4e63-466e-8db7-3f4238162fd1"
 WORKER_SECRET = os.environ.get("WORKER_SECRET")
+# Worker gövdesinin (gzip açıldıktan sonra) kabul edilen en büyük boyutu
+WORKER_MAX_PAYLOAD_BYTES = int(os.environ.get("WORKER_MAX_PAYLOAD_BYTES", str(16 * 1024 * 1024)))
 _disable_server_binance_flag = os.environ.get("DISABLE_SERVER_BINANCE", os.environ.get("DISABLE_SERVER_BINANCE_BYBIT", "0"))
 DISABLE_SERVER_BINANCE = (_disable_server_binance_flag or "0") == "1"
 
@@ -44,6 +46,7 @@ BLACKLIST = {"SHIB", "PEPE", "XAUT", "FLOKI", "RAY"}
 # ---------------------------------------------------------------------------
 
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = WORKER_MAX_PAYLOAD_BYTES
 
 # Global veri deposu
 data_store = {
@@ -55,6 +58,40 @@ data_store = {
 }
 data_lock = Lock()
 
+# Kaynaklar: 'mexc' satır listesi, 'binance' / 'bybit' vadeli coin listesi.
+# Her kaynak ayrı worker'dan (veya sunucunun kendisinden) gelebilir.
+SOURCE_NAMES = ('mexc', 'binance', 'bybit')
+
+# Türetilmiş liste -> girdisi olan kaynaklar
+DERIVED_LISTS = {
+    'mexc_list': ('mexc',),
+    'binance_list': ('mexc', 'binance'),
+    'bybit_list': ('mexc', 'bybit'),
+}
+
+# Bu süreden uzun süredir güncellenmeyen kaynak "stale" işaretlenir
+SOURCE_STALE_SECONDS = int(os.environ.get('SOURCE_STALE_SECONDS', '7200'))
+
+# Kaynak verileri ve türevlerin hesaplandığı girdi versiyonları (data_lock ile korunur)
+source_store: Dict[str, Dict] = {}
+derived_inputs: Dict[str, Tuple] = {}
+
+# Upstream girdilerinin son başarılı ayrıştırılmış sonuçları (mexc_contracts, mexc_tickers,
+# binance_futures); çekim başarısız olursa bunlar kullanılır
+last_good_store: Dict[str, Dict] = {}
+last_good_lock = Lock()
+
+# Girdi -> upstream uç noktası; devre açıkken transport'un eski yanıt verip vermediği buradan sorulur
+LAST_GOOD_ENDPOINTS = {
+    'mexc_contracts': MEXC_CONTRACT_DETAIL_URL,
+    'mexc_tickers': MEXC_SPOT_TICKER_URL,
+    'binance_futures': BINANCE_FUTURES_SYMBOLS_URL,
+}
+
+# Hiç son iyi veri yokken MEXC alınamazsa yeniden deneme beklemesi (sn, her denemede 2 katı)
+UPDATE_RETRY_SECONDS = 5
+UPDATE_RETRY_MAX_SECONDS = 300
+
 # Arka plan thread kontrolü
 update_thread = None
 update_thread_started = False
@@ -86,91 +123,80 @@ def grouped_currency(value: Optional[float], decimals: int = 0) -> str:
         return "$" + format(v, spec)
 
 
-def fetch_coinmarketcap_data(symbols: List[str]) -> Dict[str, float]:
-    """CoinMarketCap'ten market cap verilerini çeker."""
-    if not symbols or CMC_API_KEY == "DEMO":
-        return {}
-    
-    marketcaps: Dict[str, float] = {}
-    batch_size = 100
-    
-    headers = {
-        'X-CMC_PRO_API_KEY': CMC_API_KEY,
-        'Accept': 'application/json'
-    }
-    
-    for i in range(0, len(symbols), batch_size):
-        batch = symbols[i:i + batch_size]
-        symbols_str = ",".join(batch)
-        
-        params = {
-            'symbol': symbols_str,
-            'convert': 'USD'
-        }
-        
-        try:
-            response = requests.get(COINMARKETCAP_QUOTES_URL, headers=headers, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status', {}).get('error_code') == 0:
-                coin_data = data.get('data', {})
-                for symbol, info_list in coin_data.items():
-                    if isinstance(info_list, list) and len(info_list) > 0:
-                        info = info_list[0]
-                        quote = info.get('quote', {}).get('USD', {})
-                        mc = quote.get('market_cap')
-                        if mc:
-                            marketcaps[symbol.upper()] = float(mc)
-        except Exception as e:
-            print(f"[WARNING] CoinMarketCap batch hatasi ({i}-{i+batch_size}): {e}")
-        
-        if i + batch_size < len(symbols):
-            time.sleep(0.3)
-    
-    return marketcaps
-
-
 # ---------------------------------------------------------------------------
-# MEXC FUNCTIONS
+# LAST-GOOD CACHE
 # ---------------------------------------------------------------------------
 
-def fetch_mexc_contracts() -> List[Dict]:
-    """MEXC vadeli işlem sözleşmelerini çeker."""
-    try:
-        response = requests.get(MEXC_CONTRACT_DETAIL_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("success") and data.get("data"):
-            return data["data"]
-        return []
-    except Exception as e:
-        print(f"[ERROR] MEXC contract detail hatasi: {e}")
-        return []
+def _transport_stale_since(name: str) -> Optional[float]:
+    """Girdinin yanıtı devre kesicinin son iyi verisinden geldiyse o verinin çekildiği an."""
+    transport = get_transport()
+    url = LAST_GOOD_ENDPOINTS.get(name)
+    if url is None or not isinstance(transport, ResilientTransport):
+        return None
+    return transport.stale_since(url)
+
+
+def with_last_good(name: str, fresh):
+    """Taze sonuç boş değilse saklayıp döndürür; boşsa girdinin son iyi sonucunu döndürür.
+
+    Transport devre açıkken eski yanıt verdiyse sonuç taze sayılmaz; yaşı o
+    yanıtın çekildiği andan hesaplanır. Son iyi sonuç da yoksa taze (boş)
+    sonuç olduğu gibi döner.
+    """
+    now = time.time()
+    stale_at = _transport_stale_since(name) if fresh else None
+    with last_good_lock:
+        entry = last_good_store.get(name)
+        if fresh and (stale_at is None or entry is None or entry['updated_at'] < stale_at):
+            entry = last_good_store[name] = {
+                'data': fresh,
+                'fetched_at': _now_str() if stale_at is None else
+                datetime.fromtimestamp(stale_at).strftime('%Y-%m-%d %H:%M:%S'),
+                'updated_at': now if stale_at is None else stale_at,
+                'from_cache': False,
+                'failures': 0
+            }
+            if stale_at is None:
+                return fresh
+        if entry is None:
+            return fresh
+        entry['from_cache'] = True
+        entry['failures'] += 1
+    print(f"[WARNING] {name} alinamadi, {int(now - entry['updated_at'])} sn onceki son iyi veri kullaniliyor")
+    return entry['data']
+
+
+def last_good_status(now: Optional[float] = None) -> Dict[str, Dict]:
+    """Girdi başına son başarılı çekimin yaşı ve bu turda önbellekten gelip gelmediği."""
+    now = now if now is not None else time.time()
+    with last_good_lock:
+        entries = dict(last_good_store)
+    status = {}
+    for name, entry in entries.items():
+        age = now - entry['updated_at']
+        status[name] = {
+            'fetched_at': entry['fetched_at'],
+            'age_seconds': int(age),
+            'from_cache': entry['from_cache'],
+            'failures': entry['failures'],
+            'stale': age > SOURCE_STALE_SECONDS
+        }
+    return status
 
 
-def fetch_mexc_spot_prices() -> Dict[str, float]:
-    """MEXC spot fiyatlarini ceker (symbol -> price)."""
-    try:
-        response = requests.get(MEXC_SPOT_TICKER_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        price_map = {}
-        if isinstance(data, list):
-            for item in data:
-                symbol = item.get("symbol", "")
-                price = item.get("price")
-                if symbol and price is not None:
-                    try:
-                        price_map[symbol] = float(price)
-                    except (ValueError, TypeError):
-                        pass
-        return price_map
-    except Exception as e:
-        print(f"[ERROR] MEXC spot ticker hatasi: {e}")
-        return {}
+def oldest_fetched_at(names: Tuple[str, ...]) -> Optional[str]:
+    """Verilen girdilerden en eski başarılı çekim zamanı (yoksa None)."""
+    with last_good_lock:
+        entries = [last_good_store[name] for name in names if name in last_good_store]
+    if not entries:
+        return None
+    return min(entries, key=lambda entry: entry['updated_at'])['fetched_at']
 
 
+# ---------------------------------------------------------------------------
+# MEXC FUNCTIONS
+# ---------------------------------------------------------------------------
+
 def calculate_max_positions(contracts: List[Dict], spot_prices: Dict[str, float]) -> List[Tuple[str, str, float, float, float, float, float]]:
     """Max pozisyon degerlerini hesaplar."""
     results = []
@@ -213,14 +239,14 @@ def calculate_max_positions(contracts: List[Dict], spot_prices: Dict[str, float]
 def process_mexc():
     """MEXC vadeli işlem listesini işler."""
     print("\n[MEXC] Sozlesmeler cekiliyor...")
-    contracts = fetch_mexc_contracts()
+    contracts = with_last_good('mexc_contracts', get_adapter("mexc").contract_specs())
     if not contracts:
         print("[ERROR] MEXC sozlesmeleri alinamadi!")
         return None, None, []
     
     print(f"[MEXC] {len(contracts)} sozlesme bulundu")
 
-    tickers = fetch_mexc_spot_prices()
+    tickers = with_last_good('mexc_tickers', get_adapter("mexc").tickers())
     if not tickers:
         print("[ERROR] MEXC ticker verileri alinamadi!")
         return None, None, []
@@ -236,7 +262,7 @@ def process_mexc():
     mexc_positions_map = {base_coin.upper(): max_pos_usdt for _, base_coin, _, _, _, _, max_pos_usdt in positions}
 
     symbols_list = list(mexc_futures_coins)
-    marketcaps_cmc = fetch_coinmarketcap_data(symbols_list)
+    marketcaps_cmc = fetch_coinmarketcap_data(symbols_list, venue="mexc")
 
     positions_with_cmc = []
     positions_without_cmc = []
@@ -271,43 +297,23 @@ def process_mexc():
 # BINANCE FUNCTIONS
 # ---------------------------------------------------------------------------
 
-def fetch_binance_futures_symbols() -> Set[str]:
-    """Binance Futures'daki USDT çiftlerini çeker."""
-    try:
-        response = requests.get(BINANCE_FUTURES_SYMBOLS_URL, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        
-        symbols = set()
-        for symbol_info in data.get("symbols", []):
-            status = symbol_info.get("status", "")
-            quote = symbol_info.get("quoteAsset", "")
-            base = symbol_info.get("baseAsset", "")
-            
-            if status == "TRADING" and quote == "USDT" and base:
-                symbols.add(base.upper())
-        
-        return symbols
-    except Exception as e:
-        print(f"[ERROR] Binance Futures API hatasi: {e}")
-        return set()
-
-
 def process_binance(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str, float]):
     """MEXC vadeli'de olup Binance vadeli'de OLMAYAN coinleri bulur."""
     print("\n[BINANCE] Futures coinleri cekiliyor...")
-    binance_futures = fetch_binance_futures_symbols()
+    binance_futures = with_last_good('binance_futures', get_adapter("binance").futures_symbols())
     if not binance_futures:
         print("[ERROR] Binance Futures verileri alinamadi!")
         return []
     
-    not_in_binance = sorted(list(mexc_futures_coins - binance_futures))
+    index = get_symbol_index()
+    not_in_binance = sorted(index.difference('mexc', mexc_futures_coins, 'binance.futures', binance_futures))
+    index.save()
     print(f"[BINANCE] {len(not_in_binance)} coin MEXC'de var, Binance'de yok")
 
     if not not_in_binance:
         return []
 
-    marketcaps = fetch_coinmarketcap_data(not_in_binance)
+    marketcaps = fetch_coinmarketcap_data(not_in_binance, venue="mexc")
 
     coins_with_mc = []
     coins_without_mc = []
@@ -339,79 +345,411 @@ def process_binance(mexc_futures_coins: Set[str], mexc_positions_map: Dict[str,
     return binance_list
 
 
+def build_difference_list(mexc_list: List[Dict], other_symbols, venue: str) -> List[Dict]:
+    """MEXC satırlarından diğer borsanın vadeli listesinde OLMAYANLARI çıkarır.
+
+    Market cap ve max pozisyon MEXC satırlarından alınır; ek CMC çağrısı yapılmaz.
+    Semboller `<venue>.futures` için sembol indeksiyle eşlenir (1000PEPE == PEPE).
+    Sıralama process_binance ile aynıdır (MC azalan, MC'siz olanlar alfabetik).
+    """
+    index = get_symbol_index()
+    missing = set(index.difference('mexc', [row['symbol'].upper() for row in mexc_list], f'{venue}.futures', other_symbols))
+    index.save()
+    rows = sorted(
+        (row for row in mexc_list if row['symbol'].upper() in missing),
+        key=lambda row: row['symbol'].upper()
+    )
+    coins_with_mc = [row for row in rows if row.get('market_cap')]
+    coins_without_mc = [row for row in rows if not row.get('market_cap')]
+    coins_with_mc.sort(key=lambda row: row['market_cap'], reverse=True)
+
+    result = []
+    for idx, row in enumerate(coins_with_mc + coins_without_mc, 1):
+        max_pos = row.get('max_position', 0.0)
+        mc = row.get('market_cap')
+        result.append({
+            'rank': idx,
+            'symbol': row['symbol'].upper(),
+            'max_position': max_pos,
+            'max_position_pretty': grouped_currency(max_pos),
+            'market_cap': mc if mc else 0,
+            'market_cap_pretty': grouped_currency(mc) if mc else "N/A"
+        })
+    return result
+
+
+# ---------------------------------------------------------------------------
+# WORKER SYNC (VERSIYON + DELTA)
+# ---------------------------------------------------------------------------
+
+def _row_key(row) -> str:
+    """Satırın anahtarı (dict ise symbol, değilse kendisi)."""
+    return row.get('symbol') if isinstance(row, dict) else row
+
+
+def _strip_rank(row):
+    """Sıra bilgisini satırdan çıkarır; rank liste sırasından yeniden üretilir."""
+    if isinstance(row, dict) and 'rank' in row:
+        return {k: v for k, v in row.items() if k != 'rank'}
+    return row
+
+
+def data_digest(data) -> str:
+    """Kaynak verisinin içerik özetini (versiyon) hesaplar."""
+    blob = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]
+
+
+def _stable_keys(old_order: List, new_order: List) -> Set:
+    """Yeni sırada göreli yeri değişmeyen anahtarlar (en uzun artan alt dizi)."""
+    old_pos = {key: idx for idx, key in enumerate(old_order)}
+    seq = [(old_pos[key], key) for key in new_order if key in old_pos]
+
+    tails: List[int] = []
+    tails_idx: List[int] = []
+    prev = [-1] * len(seq)
+    for i, (pos, _) in enumerate(seq):
+        j = bisect_left(tails, pos)
+        if j:
+            prev[i] = tails_idx[j - 1]
+        if j == len(tails):
+            tails.append(pos)
+            tails_idx.append(i)
+        else:
+            tails[j] = pos
+            tails_idx[j] = i
+
+    stable = set()
+    i = tails_idx[-1] if tails_idx else -1
+    while i >= 0:
+        stable.add(seq[i][1])
+        i = prev[i]
+    return stable
+
+
+def diff_rows(old_rows: List, new_rows: List) -> Dict:
+    """İki liste arasındaki satır bazlı farkı çıkarır (symbol anahtarlı).
+
+    Sadece değişen satırlar gönderilir. Sıra için yalnızca yeni eklenen veya
+    göreli yeri değişen anahtarların yeni indeksi `moves` alanında taşınır.
+    """
+    old_order = [_row_key(row) for row in old_rows]
+    old_map = {key: _strip_rank(row) for key, row in zip(old_order, old_rows)}
+    new_order = [_row_key(row) for row in new_rows]
+
+    upsert = []
+    for key, row in zip(new_order, new_rows):
+        stripped = _strip_rank(row)
+        if old_map.get(key) != stripped:
+            upsert.append(stripped)
+
+    new_keys = set(new_order)
+    delta = {
+        'upsert': upsert,
+        'remove': [key for key in old_order if key not in new_keys],
+    }
+    stable = _stable_keys(old_order, new_order)
+    moves = {key: idx for idx, key in enumerate(new_order) if key not in stable}
+    if moves:
+        delta['moves'] = moves
+    return delta
+
+
+def apply_row_delta(rows: List, delta: Dict) -> List:
+    """diff_rows çıktısını listeye uygular ve YENİ bir liste döndürür.
+
+    Delta mevcut listeyle tutarsızsa ValueError fırlatır; girdi listesi
+    hiçbir durumda değiştirilmez.
+    """
+    by_key = {_row_key(row): _strip_rank(row) for row in rows}
+    for key in delta.get('remove') or []:
+        if key not in by_key:
+            raise ValueError(f"Silinecek satir bulunamadi: {key}")
+        del by_key[key]
+    for row in delta.get('upsert') or []:
+        by_key[_row_key(row)] = _strip_rank(row)
+
+    moves = delta.get('moves') or {}
+    slots: List = [None] * len(by_key)
+    for key, idx in moves.items():
+        if key not in by_key or not 0 <= idx < len(slots) or slots[idx] is not None:
+            raise ValueError(f"Gecersiz sira bilgisi: {key} -> {idx}")
+        slots[idx] = key
+
+    stable = [_row_key(row) for row in rows if _row_key(row) in by_key and _row_key(row) not in moves]
+    if len(stable) + len(moves) != len(slots):
+        raise ValueError("Delta sirasi satirlarla uyusmuyor")
+    remaining = iter(stable)
+    order = [key if key is not None else next(remaining) for key in slots]
+
+    result = []
+    for idx, key in enumerate(order, 1):
+        row = by_key[key]
+        result.append({'rank': idx, **row} if isinstance(row, dict) else row)
+    return result
+
+
+def _is_gzip_body() -> bool:
+    return request.headers.get('Content-Encoding', '').lower() == 'gzip'
+
+
+def _read_worker_payload() -> Optional[Dict]:
+    """Worker gövdesini okur (gzip sıkıştırılmış olabilir).
+
+    Açılmış gövde WORKER_MAX_PAYLOAD_BYTES'ı aşarsa None döner (413).
+    """
+    if _is_gzip_body():
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = decompressor.decompress(request.get_data(), WORKER_MAX_PAYLOAD_BYTES)
+            if decompressor.unconsumed_tail:
+                return None
+            payload = json.loads(body)
+        except (zlib.error, ValueError):
+            return {}
+        return payload if isinstance(payload, dict) else {}
+    return request.get_json(silent=True) or {}
+
+
+# ---------------------------------------------------------------------------
+# SOURCES (KAYNAK BAZLI BIRLESTIRME)
+# ---------------------------------------------------------------------------
+
+def _now_str() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _store_source(name: str, data: List, version: str, fetched_at: Optional[str], origin: str):
+    """Kaynağı kaydeder (data_lock altında çağrılır)."""
+    source_store[name] = {
+        'version': version,
+        'data': data,
+        'fetched_at': fetched_at or _now_str(),
+        'updated_at': time.time(),
+        'origin': origin
+    }
+
+
+def _recompute_derived() -> List[str]:
+    """Girdi versiyonlarından biri değişen türev listeleri yeniden hesaplar.
+
+    data_lock altında çağrılır; tüm girdileri henüz gelmemiş türevlere dokunulmaz.
+    """
+    changed = []
+    for list_name, inputs in DERIVED_LISTS.items():
+        if any(name not in source_store for name in inputs):
+            continue
+        key = tuple(source_store[name]['version'] for name in inputs)
+        if derived_inputs.get(list_name) == key:
+            continue
+
+        mexc_rows = source_store['mexc']['data']
+        if list_name == 'mexc_list':
+            data_store[list_name] = mexc_rows
+        else:
+            data_store[list_name] = build_difference_list(mexc_rows, source_store[inputs[1]]['data'], inputs[1])
+        derived_inputs[list_name] = key
+        changed.append(list_name)
+
+    if changed:
+        stats = data_store.get('stats', {}).copy()
+        for list_name in changed:
+            stats[list_name.replace('_list', '_count')] = len(data_store[list_name])
+        data_store['stats'] = stats
+        data_store['last_update'] = _now_str()
+    return changed
+
+
+def source_status(now: Optional[float] = None) -> Dict[str, Dict]:
+    """Kaynak başına versiyon, yaş ve stale bilgisini döndürür (data_lock altında)."""
+    now = now if now is not None else time.time()
+    status = {}
+    for name, entry in source_store.items():
+        age = now - entry['updated_at']
+        status[name] = {
+            'version': entry['version'],
+            'origin': entry['origin'],
+            'fetched_at': entry['fetched_at'],
+            'age_seconds': int(age),
+            'stale': age > SOURCE_STALE_SECONDS
+        }
+    return status
+
+
+def _worker_owned(name: str, now: float) -> bool:
+    """Kaynağı son SOURCE_STALE_SECONDS içinde bir worker yayınladı mı (data_lock altında)."""
+    entry = source_store.get(name)
+    return bool(entry) and entry['origin'] == 'worker' and now - entry['updated_at'] <= SOURCE_STALE_SECONDS
+
+
+def worker_owned_sources() -> Set[str]:
+    """Worker'ların sahiplendiği kaynaklar; sunucu bunları çekmez ve üzerine yazmaz.
+
+    Tek yayıncı kuralı: iki yayıncı aynı kaynağı güncellerse worker'ın delta'ları
+    her seferinde eski bir base_version'a düşer ve tam veri gönderimine (resync) döner.
+    """
+    now = time.time()
+    with data_lock:
+        return {name for name in source_store if _worker_owned(name, now)}
+
+
+def publish_sources(sources: Dict[str, List], origin: str = 'server',
+                    fetched_at: Optional[Dict[str, str]] = None) -> List[str]:
+    """Birden çok kaynağı tek seferde yayınlar; değişen türev listeleri döndürür.
+
+    Sunucu (origin='server') worker'ın sahiplendiği kaynakları atlar.
+    """
+    fetched_at = fetched_at or {}
+    now = time.time()
+    with data_lock:
+        for name, data in sources.items():
+            if origin == 'server' and _worker_owned(name, now):
+                continue
+            _store_source(name, data, data_digest(data), fetched_at.get(name), origin)
+        return _recompute_derived()
+
+
+def _apply_source_update(name: str, update: Dict) -> Dict:
+    """Worker'dan gelen tek kaynak güncellemesini uygular (data_lock altında).
+
+    mode=full tam veri, mode=delta base_version üzerine satır farkı,
+    mode=touch veri değişmeden tazelik bildirimi. Uyuşmazlıkta resync döner.
+    """
+    mode = update.get('mode', 'full')
+    version = update.get('version')
+    current = source_store.get(name)
+    current_version = current['version'] if current else None
+    resync = {'status': 'resync', 'version': current_version}
+
+    if mode == 'touch':
+        if current is None or version != current_version:
+            return resync
+        current['updated_at'] = time.time()
+        current['fetched_at'] = update.get('fetched_at') or _now_str()
+        return {'status': 'ok', 'version': current_version}
+
+    if mode == 'delta':
+        if current is None or update.get('base_version') != current_version:
+            return resync
+        try:
+            data = apply_row_delta(current['data'], update.get('delta') or {})
+        except (ValueError, TypeError, AttributeError, KeyError):
+            return resync
+        if data_digest(data) != version:
+            return resync
+    elif mode == 'full':
+        data = update.get('data')
+        if not isinstance(data, list):
+            return {'status': 'rejected', 'error': 'data liste olmali'}
+        if version and data_digest(data) != version:
+            return {'status': 'rejected', 'error': 'version icerikle uyusmuyor'}
+        version = version or data_digest(data)
+    else:
+        return {'status': 'rejected', 'error': f'Bilinmeyen mode: {mode}'}
+
+    _store_source(name, data, version, update.get('fetched_at'), 'worker')
+    return {'status': 'ok', 'version': version}
+
+
+def _apply_legacy_payload(payload: Dict) -> List[str]:
+    """Eski worker'ların tek parça gövdesini uygular (data_lock altında)."""
+    if isinstance(payload.get('mexc_list'), list):
+        _store_source('mexc', payload['mexc_list'], data_digest(payload['mexc_list']),
+                      payload.get('last_update'), 'worker')
+    changed = _recompute_derived()
+
+    # binance_list hazır hesaplanmış gelir; binance kaynağı yoksa olduğu gibi yayınlanır
+    if isinstance(payload.get('binance_list'), list) and 'binance' not in source_store:
+        data_store['binance_list'] = payload['binance_list']
+        changed.append('binance_list')
+
+    stats = payload.get('stats')
+    existing = data_store.get('stats', {}).copy()
+    if isinstance(stats, dict):
+        existing.update(stats)
+    else:
+        existing['mexc_count'] = len(data_store.get('mexc_list', []))
+        existing['binance_count'] = len(data_store.get('binance_list', []))
+    data_store['stats'] = existing
+    data_store['last_update'] = payload.get('last_update') or _now_str()
+    return changed
 
 
 # ---------------------------------------------------------------------------
 # DATA UPDATE THREAD
 # ---------------------------------------------------------------------------
 
+def run_update_cycle() -> bool:
+    """Sunucu tarafında çekilen kaynakları yayınlar; MEXC alınamazsa False döner.
+
+    Başarısız çekimlerde girdilerin son iyi sonuçları kullanılır (with_last_good);
+    yayınlanan kaynağın fetched_at'i en eski girdisinin çekim zamanıdır.
+    """
+    # Her tur borsalardan taze veri çekilir; tur içinde aynı uç nokta bir kez istenir
+    fetch_cache.clear()
+    # Worker'ın yayınladığı kaynaklar sunucuda çekilmez (kaynak başına tek yayıncı)
+    owned = worker_owned_sources()
+    if owned:
+        print(f"[INFO] Worker kaynaklari sunucuda cekilmiyor: {', '.join(sorted(owned))}")
+    exchanges = [name for name in (('mexc',) if DISABLE_SERVER_BINANCE else ('mexc', 'binance')) if name not in owned]
+    # Borsa uç noktaları tek event loop'ta eş zamanlı çekilir; aşağıdaki adımlar önbellekten okur
+    warm_exchange_cache(exchanges)
+
+    sources: Dict[str, List] = {}
+    fetched_at: Dict[str, Optional[str]] = {}
+    if 'mexc' in exchanges:
+        mexc_futures_coins, mexc_positions_map, mexc_list = process_mexc()
+        if mexc_futures_coins is None or mexc_positions_map is None:
+            return False
+        sources['mexc'] = mexc_list
+        fetched_at['mexc'] = oldest_fetched_at(('mexc_contracts', 'mexc_tickers'))
+
+    if 'binance' in exchanges:
+        print("\n[BINANCE] Futures coinleri cekiliyor...")
+        binance_futures = with_last_good('binance_futures', get_adapter("binance").futures_symbols())
+        if binance_futures:
+            sources['binance'] = sorted(binance_futures)
+            fetched_at['binance'] = oldest_fetched_at(('binance_futures',))
+        else:
+            print("[ERROR] Binance Futures verileri alinamadi!")
+    elif DISABLE_SERVER_BINANCE:
+        print("[INFO] Sunucu Binance verisini bekliyor (worker aracılığıyla).")
+
+    changed = publish_sources(sources, fetched_at=fetched_at)
+    print(f"[SOURCES] Guncellenen listeler: {', '.join(changed) or 'yok'}")
+    return True
+
+
 def update_data():
     """Verileri günceller."""
-    global data_store
-    
     # İlk veriyi hemen topla
     print("\n" + "="*80)
     print(f"[UPDATE] Ilk veri guncelleniyor... {datetime.now().strftime('%H:%M:%S')}")
     print("="*80)
     
     try:
-        mexc_futures_coins, mexc_positions_map, mexc_list = process_mexc()
-        
-        if mexc_futures_coins is not None and mexc_positions_map is not None:
-            if not DISABLE_SERVER_BINANCE:
-                binance_list = process_binance(mexc_futures_coins, mexc_positions_map)
-            else:
-                binance_list = data_store.get('binance_list', [])
-                print("[INFO] Sunucu Binance verisini bekliyor (worker aracılığıyla).")
-            
-            with data_lock:
-                data_store['mexc_list'] = mexc_list
-                if not DISABLE_SERVER_BINANCE:
-                    data_store['binance_list'] = binance_list
-                data_store['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                stats = data_store.get('stats', {})
-                stats['mexc_count'] = len(mexc_list)
-                if not DISABLE_SERVER_BINANCE:
-                    stats['binance_count'] = len(binance_list)
-                data_store['stats'] = stats
-            
-            print(f"\n[SUCCESS] Ilk veri yuklendi: MEXC={len(mexc_list)}, Binance={len(data_store['binance_list'])}")
+        if run_update_cycle():
+            print(f"\n[SUCCESS] Ilk veri yuklendi: MEXC={len(data_store['mexc_list'])}, Binance={len(data_store['binance_list'])}")
     except Exception as e:
         print(f"[ERROR] Ilk veri yukleme hatasi: {e}")
     
     # Sonra döngüye gir
+    retry_delay = UPDATE_RETRY_SECONDS
     while True:
         try:
             print("\n" + "="*80)
             print(f"[UPDATE] Veri guncelleniyor... {datetime.now().strftime('%H:%M:%S')}")
             print("="*80)
             
-            # Verileri çek
-            mexc_futures_coins, mexc_positions_map, mexc_list = process_mexc()
-            
-            if mexc_futures_coins is None or mexc_positions_map is None:
-                print("[ERROR] MEXC verileri alinamadi!")
-                time.sleep(5)
+            if not run_update_cycle():
+                # Son iyi veri de yok; upstream'i sık denemelerle yormamak için bekleme artar
+                print(f"[ERROR] MEXC verileri alinamadi! {retry_delay} sn sonra tekrar denenecek")
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, UPDATE_RETRY_MAX_SECONDS)
                 continue
+            retry_delay = UPDATE_RETRY_SECONDS
             
-            if not DISABLE_SERVER_BINANCE:
-                binance_list = process_binance(mexc_futures_coins, mexc_positions_map)
-            else:
-                binance_list = data_store.get('binance_list', [])
-            
-            # Global veri deposunu güncelle
-            with data_lock:
-                data_store['mexc_list'] = mexc_list
-                if not DISABLE_SERVER_BINANCE:
-                    data_store['binance_list'] = binance_list
-                data_store['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                stats = data_store.get('stats', {})
-                stats['mexc_count'] = len(mexc_list)
-                if not DISABLE_SERVER_BINANCE:
-                    stats['binance_count'] = len(binance_list)
-                data_store['stats'] = stats
-            
-            print(f"\n[SUCCESS] Veri guncellendi: MEXC={len(mexc_list)}, Binance={len(data_store['binance_list'])}")
+            print(f"\n[SUCCESS] Veri guncellendi: MEXC={len(data_store['mexc_list'])}, Binance={len(data_store['binance_list'])}")
             
         except Exception as e:
             print(f"[ERROR] Veri guncelleme hatasi: {e}")
@@ -443,8 +781,18 @@ def index():
 @app.route('/api/data')
 def get_data():
     """Tüm verileri JSON formatında döndür."""
+    inputs = last_good_status()
     with data_lock:
-        return jsonify(data_store)
+        status = source_status()
+        body = dict(data_store)
+        body['stats'] = {
+            **data_store.get('stats', {}),
+            'sources': status,
+            'stale_sources': sorted(name for name, item in status.items() if item['stale']),
+            'inputs': inputs,
+            'cached_inputs': sorted(name for name, item in inputs.items() if item['from_cache'])
+        }
+        return jsonify(body)
 
 
 @app.route('/api/mexc')
@@ -467,6 +815,76 @@ def get_binance():
         })
 
 
+@app.route('/api/bybit')
+def get_bybit():
+    """Bybit karşılaştırma verilerini döndür."""
+    with data_lock:
+        return jsonify({
+            'data': data_store['bybit_list'],
+            'last_update': data_store['last_update']
+        })
+
+
+@app.route('/api/membership')
+def get_membership():
+    """Kaynak listeleri üzerinde üyelik ifadesi değerlendirir.
+
+    Örnek: /api/membership?expr=mexc.futures and not binance.futures
+    Kolonlar: mexc.futures, binance.futures, bybit.futures (gelmiş olanlar).
+    Matris yalnızca ifadede geçen kolonlar ve evren olarak mexc.futures ile
+    kurulur; `not X` bunların birleşimine göre tümleyendir (membership.py).
+    """
+    expression = request.args.get('expr', '').strip()
+    expression = PRESET_EXPRESSIONS.get(expression, expression)
+    if not expression:
+        return jsonify({'error': 'expr parametresi gerekli', 'presets': PRESET_EXPRESSIONS}), 400
+
+    with data_lock:
+        mexc_rows = source_store['mexc']['data'] if 'mexc' in source_store else []
+        columns = {f'{name}.futures': source_store[name]['data'] for name in ('binance', 'bybit') if name in source_store}
+        if 'mexc' in source_store:
+            columns['mexc.futures'] = [row['symbol'] for row in mexc_rows]
+        last_update = data_store['last_update']
+
+    # Yüklenmiş ama ifadede geçmeyen kolonlar `not` evrenini değiştirmemeli
+    try:
+        selected = referenced_columns(expression, columns, universe=('mexc.futures',))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    columns = {name: columns[name] for name in selected}
+
+    # Kolonlar kanonik asset adlarıyla kurulur (1000PEPE == PEPE)
+    index = get_symbol_index()
+    columns = {name: index.canonical_symbols(name, symbols) for name, symbols in columns.items()}
+    index.save()
+    try:
+        matrix = matrix_from_sets(columns)
+        symbols = matrix.select(expression)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    marketcaps = {
+        index.canonical(index.asset_id('mexc', row['symbol'].upper())): row.get('market_cap') or 0
+        for row in mexc_rows
+    }
+    symbols.sort(key=lambda symbol: (-marketcaps.get(symbol, 0), symbol))
+    return jsonify({
+        'expression': expression,
+        'columns': {name: bin(bits).count('1') for name, bits in matrix.columns.items()},
+        'count': len(symbols),
+        'data': [{'symbol': symbol, 'market_cap': marketcaps.get(symbol, 0)} for symbol in symbols],
+        'last_update': last_update
+    })
+
+
+def upstream_health():
+    """HTTP transport'un host başına devre durumu ve p95 gecikmeleri."""
+    transport = get_transport()
+    if not isinstance(transport, ResilientTransport):
+        return {}
+    return {'hosts': transport.stats(), 'hedges': transport.hedges, 'served_stale': transport.served_stale}
+
+
 @app.route('/api/health')
 def health_check():
     """Sunucu yapılandırma durumunu kontrol eder."""
@@ -475,44 +893,64 @@ def health_check():
         'worker_secret_configured': bool(WORKER_SECRET),
         'worker_secret_length': len(WORKER_SECRET) if WORKER_SECRET else 0,
         'server_binance_disabled': DISABLE_SERVER_BINANCE,
+        'upstreams': upstream_health(),
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
 
 
 @app.route('/api/worker/update', methods=['POST'])
 def worker_update():
-    """Arka plan worker'ından gelen verileri kabul eder."""
+    """Arka plan worker'larından gelen verileri kabul eder.
+
+    Gövde `sources` altında kaynak başına güncelleme taşır:
+        {"sources": {"binance": {"mode": "full"|"delta"|"touch",
+                                 "version": ..., "base_version": ...,
+                                 "data": [...] | "delta": {...},
+                                 "fetched_at": ...}}}
+    Her kaynak ayrı ayrı ve kendi versiyonuna göre uygulanır; farklı
+    worker'lar farklı kaynakları gönderebilir. Türev listeler yalnızca
+    girdilerinden biri değiştiğinde yeniden hesaplanır. `sources` içermeyen
+    gövdeler eski tek parça biçim olarak işlenir.
+    """
     if not WORKER_SECRET:
         return jsonify({'error': 'WORKER_SECRET tanımlı değil'}), 503
 
-    payload = request.get_json(silent=True) or {}
-    provided_secret = payload.get('secret') or request.headers.get('X-Worker-Secret')
+    header_secret = request.headers.get('X-Worker-Secret')
+    if header_secret is not None and header_secret != WORKER_SECRET:
+        return jsonify({'error': 'Yetkisiz erişim'}), 401
+    # Sıkıştırılmış gövde yalnızca başlıkla doğrulanmış istekte açılır
+    if header_secret is None and _is_gzip_body():
+        return jsonify({'error': 'Yetkisiz erişim'}), 401
+
+    payload = _read_worker_payload()
+    if payload is None:
+        return jsonify({'error': 'Gövde çok büyük'}), 413
+    provided_secret = payload.get('secret') or header_secret
 
     if provided_secret != WORKER_SECRET:
         return jsonify({'error': 'Yetkisiz erişim'}), 401
 
-    with data_lock:
-        for key in ('mexc_list', 'binance_list'):
-            if isinstance(payload.get(key), list):
-                data_store[key] = payload[key]
-
-        stats = payload.get('stats')
-        if isinstance(stats, dict):
-            existing = data_store.get('stats', {}).copy()
-            existing.update(stats)
-            data_store['stats'] = existing
-        else:
-            data_store['stats'] = {
-                'mexc_count': len(data_store.get('mexc_list', [])),
-                'binance_count': len(data_store.get('binance_list', []))
-            }
+    sources = payload.get('sources')
+    results: Dict[str, Dict] = {}
 
-        if payload.get('last_update'):
-            data_store['last_update'] = payload['last_update']
+    with data_lock:
+        if isinstance(sources, dict):
+            for name, update in sources.items():
+                if name not in SOURCE_NAMES or not isinstance(update, dict):
+                    results[name] = {'status': 'rejected', 'error': 'Bilinmeyen kaynak'}
+                    continue
+                results[name] = _apply_source_update(name, update)
+            changed = _recompute_derived()
         else:
-            data_store['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            changed = _apply_legacy_payload(payload)
+        status = source_status()
 
-    return jsonify({'status': 'ok'})
+    return jsonify({
+        'status': 'ok',
+        'sources': results,
+        'changed': changed,
+        'stale_sources': sorted(name for name, item in status.items() if item['stale'])
+    })
 
 
 @app.before_request
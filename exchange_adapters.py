@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Exchange Adapters
+
+Borsa API'leri için ortak arayüz ve kayıt defteri. Her adapter şunları sağlar:
+    spot_symbols()    -> Spot'ta işlem gören USDT çiftlerinin base coinleri
+    futures_symbols() -> USDT vadelilerin base coinleri
+    tickers()         -> Spot fiyatları (symbol -> price)
+    contract_specs()  -> Vadeli sözleşme detayları (ham liste)
+
+Tüm istekler süreç içi `fetch_cache` üzerinden yapılır: aynı uç nokta (URL +
+parametreler) bir çalıştırmada en fazla bir kez çekilir, eş zamanlı aynı
+istekler tek isteğe indirgenir. Uzun süre çalışan süreçler (dashboard) her
+turda `fetch_cache.clear()` çağırır.
+
+Yeni borsa eklemek için ExchangeAdapter'dan türetip @register_adapter ile
+işaretlemek yeterlidir.
+"""
+
+import abc
+import os
+from threading import Lock
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from http_transport import get_transport
+
+# ---------------------------------------------------------------------------
+# API ENDPOINTS
+# ---------------------------------------------------------------------------
+
+# Base URL'ler ortam değişkeniyle değiştirilebilir (örn. fake_exchange_server)
+MEXC_CONTRACT_BASE = os.environ.get("MEXC_CONTRACT_BASE_URL", "https://contract.mexc.com")
+MEXC_SPOT_BASE = os.environ.get("MEXC_SPOT_BASE_URL", "https://api.mexc.com")
+BINANCE_SPOT_BASE = os.environ.get("BINANCE_SPOT_BASE_URL", "https://api.binance.com")
+BINANCE_FAPI_BASE = os.environ.get("BINANCE_FAPI_BASE_URL", "https://fapi.binance.com")
+BYBIT_BASE = os.environ.get("BYBIT_BASE_URL", "https://api.bybit.com")
+
+# MEXC
+MEXC_CONTRACT_DETAIL_URL = f"{MEXC_CONTRACT_BASE}/api/v1/contract/detail"
+MEXC_SPOT_TICKER_URL = f"{MEXC_SPOT_BASE}/api/v3/ticker/price"
+
+# Binance
+BINANCE_SPOT_SYMBOLS_URL = f"{BINANCE_SPOT_BASE}/api/v3/exchangeInfo"
+BINANCE_SPOT_TICKER_URL = f"{BINANCE_SPOT_BASE}/api/v3/ticker/price"
+BINANCE_FUTURES_SYMBOLS_URL = f"{BINANCE_FAPI_BASE}/fapi/v1/exchangeInfo"
+
+# Bybit
+BYBIT_INSTRUMENTS_URL = f"{BYBIT_BASE}/v5/market/instruments-info"
+BYBIT_TICKERS_URL = f"{BYBIT_BASE}/v5/market/tickers"
+
+
+# ---------------------------------------------------------------------------
+# FETCH CACHE
+# ---------------------------------------------------------------------------
+
+class FetchCache:
+    """Süreç içi, thread-safe yanıt önbelleği.
+
+    Hatalı yanıtlar saklanmaz; bir sonraki çağrı yeniden dener.
+    """
+
+    def __init__(self):
+        self._data: Dict[Hashable, object] = {}
+        self._key_locks: Dict[Hashable, Lock] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict]) -> Tuple:
+        return (url, tuple(sorted((params or {}).items())))
+
+    def get_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                 timeout: float = 15):
+        """GET yanıtını JSON olarak döndürür; aynı istek bir kez yapılır."""
+        key = self._key(url, params)
+        return self.memo(key, lambda: self.fetch_json(url, params, headers, timeout))
+
+    def fetch_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                   timeout: float = 15):
+        """Önbelleği atlayarak tek bir GET yapar (http_transport: live/record/replay)."""
+        return get_transport().get_json(url, params, headers, timeout)
+
+    def prime(self, url: str, params: Optional[Dict], value) -> None:
+        """Başka yoldan (örn. async_ingest) çekilmiş yanıtı get_json için önbelleğe koyar."""
+        key = self._key(url, params)
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = value
+                self.misses += 1
+
+    def memo(self, key: Hashable, compute: Callable[[], object]):
+        """Anahtar için değeri bir kez hesaplar; eş zamanlı çağrılar sonucu bekler."""
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                return self._data[key]
+            key_lock = self._key_locks.setdefault(key, Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._data:
+                    self.hits += 1
+                    return self._data[key]
+            value = compute()
+            with self._lock:
+                self._data[key] = value
+                self.misses += 1
+            return value
+
+    def lookup(self, namespace: str, keys: Iterable[Hashable]) -> Tuple[Dict, List]:
+        """Anahtar bazlı önbellek: (bulunanlar, eksikler) döndürür."""
+        found: Dict = {}
+        missing: List = []
+        with self._lock:
+            for key in keys:
+                cache_key = (namespace, key)
+                if cache_key in self._data:
+                    found[key] = self._data[cache_key]
+                else:
+                    missing.append(key)
+            self.hits += len(found)
+        return found, missing
+
+    def store(self, namespace: str, values: Dict) -> None:
+        with self._lock:
+            for key, value in values.items():
+                self._data[(namespace, key)] = value
+            self.misses += len(values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._key_locks.clear()
+
+
+fetch_cache = FetchCache()
+
+
+# ---------------------------------------------------------------------------
+# ADAPTER REGISTRY
+# ---------------------------------------------------------------------------
+
+ADAPTERS: Dict[str, "ExchangeAdapter"] = {}
+
+
+def register_adapter(cls):
+    """Adapter sınıfını adıyla kayıt defterine ekler (dekoratör)."""
+    ADAPTERS[cls.name] = cls()
+    return cls
+
+
+def get_adapter(name: str) -> "ExchangeAdapter":
+    try:
+        return ADAPTERS[name]
+    except KeyError:
+        raise KeyError(f"Bilinmeyen borsa: {name} (kayitli: {', '.join(sorted(ADAPTERS))})")
+
+
+class ExchangeAdapter(abc.ABC):
+    """Borsa adapter arayüzü. Hata durumunda boş sonuç döner ve hata yazdırılır.
+
+    Dört metodun hepsi zorunludur; eksik adapter register_adapter'da hata verir.
+    """
+
+    name = ""
+    label = ""
+
+    @abc.abstractmethod
+    def spot_symbols(self) -> Set[str]:
+        ...
+
+    @abc.abstractmethod
+    def futures_symbols(self) -> Set[str]:
+        ...
+
+    @abc.abstractmethod
+    def tickers(self) -> Dict[str, float]:
+        ...
+
+    @abc.abstractmethod
+    def contract_specs(self) -> List[Dict]:
+        ...
+
+    def _safe(self, what: str, fn: Callable, default):
+        try:
+            return fn()
+        except Exception as e:
+            print(f"[ERROR] {self.label} {what} API hatasi: {e}")
+            return default
+
+
+def _price_map(items: Iterable[Dict], price_key: str = "price") -> Dict[str, float]:
+    price_map: Dict[str, float] = {}
+    for item in items:
+        symbol = item.get("symbol", "")
+        price = item.get(price_key)
+        if symbol and price is not None:
+            try:
+                price_map[symbol] = float(price)
+            except (ValueError, TypeError):
+                pass
+    return price_map
+
+
+@register_adapter
+class BinanceAdapter(ExchangeAdapter):
+    name = "binance"
+    label = "Binance"
+
+    @staticmethod
+    def _usdt_bases(data: Dict) -> Set[str]:
+        symbols = set()
+        for symbol_info in data.get("symbols", []):
+            status = symbol_info.get("status", "")
+            quote = symbol_info.get("quoteAsset", "")
+            base = symbol_info.get("baseAsset", "")
+
+            # Sadece USDT çiftleri ve trading durumunda olanlar
+            if status == "TRADING" and quote == "USDT" and base:
+                symbols.add(base.upper())
+        return symbols
+
+    def spot_symbols(self) -> Set[str]:
+        return self._safe("Spot", lambda: self._usdt_bases(fetch_cache.get_json(BINANCE_SPOT_SYMBOLS_URL)), set())
+
+    def futures_symbols(self) -> Set[str]:
+        return self._safe("Futures", lambda: self._usdt_bases(fetch_cache.get_json(BINANCE_FUTURES_SYMBOLS_URL)), set())
+
+    def tickers(self) -> Dict[str, float]:
+        return self._safe("Spot ticker", lambda: _price_map(fetch_cache.get_json(BINANCE_SPOT_TICKER_URL)), {})
+
+    def contract_specs(self) -> List[Dict]:
+        return self._safe(
+            "Futures",
+            lambda: [item for item in fetch_cache.get_json(BINANCE_FUTURES_SYMBOLS_URL).get("symbols", [])
+                     if item.get("contractType") == "PERPETUAL"],
+            [],
+        )
+
+
+@register_adapter
+class BybitAdapter(ExchangeAdapter):
+    name = "bybit"
+    label = "Bybit"
+
+    @staticmethod
+    def _list(url: str, category: str) -> List[Dict]:
+        data = fetch_cache.get_json(url, params={"category": category})
+        if data.get("retCode") != 0:
+            return []
+        return data.get("result", {}).get("list", [])
+
+    def _usdt_bases(self, category: str) -> Set[str]:
+        symbols = set()
+        for item in self._list(BYBIT_INSTRUMENTS_URL, category):
+            status = item.get("status", "")
+            quote = item.get("quoteCoin", "")
+            base = item.get("baseCoin", "")
+
+            # Sadece USDT çiftleri ve trading durumunda olanlar
+            if status == "Trading" and quote == "USDT" and base:
+                symbols.add(base.upper())
+        return symbols
+
+    def spot_symbols(self) -> Set[str]:
+        return self._safe("Spot", lambda: self._usdt_bases("spot"), set())
+
+    def futures_symbols(self) -> Set[str]:
+        # linear = USDT perpetual contracts
+        return self._safe("Futures", lambda: self._usdt_bases("linear"), set())
+
+    def tickers(self) -> Dict[str, float]:
+        return self._safe("Spot ticker", lambda: _price_map(self._list(BYBIT_TICKERS_URL, "spot"), "lastPrice"), {})
+
+    def contract_specs(self) -> List[Dict]:
+        return self._safe("Futures", lambda: self._list(BYBIT_INSTRUMENTS_URL, "linear"), [])
+
+
+@register_adapter
+class MexcAdapter(ExchangeAdapter):
+    name = "mexc"
+    label = "MEXC"
+
+    def spot_symbols(self) -> Set[str]:
+        return {symbol[:-4].upper() for symbol in self.tickers() if symbol.endswith("USDT") and len(symbol) > 4}
+
+    def futures_symbols(self) -> Set[str]:
+        return {
+            contract["symbol"][:-len("_USDT")].upper()
+            for contract in self.contract_specs()
+            if contract.get("symbol", "").endswith("_USDT")
+        }
+
+    def tickers(self) -> Dict[str, float]:
+        def load():
+            data = fetch_cache.get_json(MEXC_SPOT_TICKER_URL, timeout=10)
+            return _price_map(data) if isinstance(data, list) else {}
+
+        return self._safe("spot ticker", load, {})
+
+    def contract_specs(self) -> List[Dict]:
+        def load():
+            data = fetch_cache.get_json(MEXC_CONTRACT_DETAIL_URL, timeout=10)
+            if data.get("success") and data.get("data"):
+                return data["data"]
+            return []
+
+        return self._safe("contract detail", load, [])
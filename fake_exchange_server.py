@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Fake Exchange Server
+
+Borsa ve CoinMarketCap uç noktalarını taklit eden yerel HTTP sunucusu.
+Sentetik bir evren (500 - 100k sembol) üretir ve istenen gecikme, hata
+oranı ve 429 (rate limit) enjeksiyonuyla yanıt verir. Gerçek listeler bu
+boyutlara ulaşmadan hattın nerede ölçeklenmeyi bıraktığını görmek için
+kullanılır.
+
+Her borsa kendi önekiyle sunulur; modüller base URL ortam değişkenleriyle
+sunucuya yönlendirilir (sunucu başlarken export satırlarını basar):
+
+    MEXC_CONTRACT_BASE_URL  -> /mexc-contract  (contract/detail, contract/ticker)
+    MEXC_SPOT_BASE_URL      -> /mexc           (api/v3/ticker/price)
+    BINANCE_SPOT_BASE_URL   -> /binance        (api/v3/exchangeInfo, ticker/price)
+    BINANCE_FAPI_BASE_URL   -> /binance-fapi   (fapi/v1/exchangeInfo, ticker/24hr, premiumIndex)
+    BYBIT_BASE_URL          -> /bybit          (v5/market/instruments-info, tickers)
+    CMC_BASE_URL            -> /cmc            (v1/cryptocurrency/map, v2/cryptocurrency/quotes/latest)
+
+Evren seed ile belirleyicidir: her coin borsalarda farklı olasılıklarla
+listelenir, düşük fiyatlı Binance/Bybit vadelileri çarpanlı (1000XXX) adla
+açılır, bir kısmı SETTLING durumundadır. Bybit `limit` verilirse
+`nextPageCursor` ile sayfalar, verilmezse tüm listeyi döner.
+
+Kullanım:
+    python3 fake_exchange_server.py --symbols 20000 --latency-ms 80 --jitter-ms 40
+    python3 fake_exchange_server.py --symbols 100000 --error-rate 0.02 --rate-limit-rate 0.05
+    eval "$(python3 fake_exchange_server.py --print-env)"   # yalnızca export satırları
+
+Sembol indeksi ve market cap önbelleği sentetik sembollerle büyür; ölçek
+denemelerinde SYMBOL_INDEX_PATH ve MARKETCAP_CACHE_PATH geçici dosyalara
+yönlendirilmelidir.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.environ.get("FAKE_EXCHANGE_PORT", "8765"))
+DEFAULT_SYMBOLS = 500
+MAX_SYMBOLS = 100_000
+
+# Ortam değişkeni -> sunucudaki önek
+BASE_URL_PREFIXES = {
+    "MEXC_CONTRACT_BASE_URL": "/mexc-contract",
+    "MEXC_SPOT_BASE_URL": "/mexc",
+    "BINANCE_SPOT_BASE_URL": "/binance",
+    "BINANCE_FAPI_BASE_URL": "/binance-fapi",
+    "BYBIT_BASE_URL": "/bybit",
+    "CMC_BASE_URL": "/cmc",
+}
+
+# Coin'in ilgili listede bulunma olasılığı
+LISTING_PROBABILITIES = {
+    "mexc_futures": 0.95,
+    "mexc_spot": 0.90,
+    "binance_futures": 0.60,
+    "binance_spot": 0.70,
+    "bybit_linear": 0.55,
+    "bybit_spot": 0.65,
+}
+SETTLING_PROBABILITY = 0.03
+# Bu fiyatın altındaki Binance/Bybit vadelileri 1000XXX olarak listelenir
+MULTIPLIER_PRICE = 0.01
+
+BYBIT_MAX_LIMIT = 1000
+
+
+def base_url_env(base_url: str) -> Dict[str, str]:
+    """Tüm modülleri `base_url`'deki sunucuya yönlendiren ortam değişkenleri."""
+    base_url = base_url.rstrip("/")
+    return {name: base_url + prefix for name, prefix in BASE_URL_PREFIXES.items()}
+
+
+# ---------------------------------------------------------------------------
+# SYNTHETIC UNIVERSE
+# ---------------------------------------------------------------------------
+
+def _coin_name(index: int) -> str:
+    """0 -> AAA, 1 -> AAB, ... (yalnızca harf; çarpan önekiyle karışmaz)."""
+    letters = ""
+    index += 26 * 26 * 26 // 25  # en az 3 harf
+    while index:
+        index, rest = divmod(index, 26)
+        letters = chr(ord("A") + rest) + letters
+    return "X" + letters
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+class SyntheticUniverse:
+    """Belirleyici sentetik coin evreni ve önceden serileştirilmiş yanıtlar."""
+
+    def __init__(self, size: int = DEFAULT_SYMBOLS, seed: int = 0):
+        self.size = size
+        rng = random.Random(seed)
+        now_ms = int(time.time() * 1000)
+        self.next_funding = now_ms - now_ms % 28_800_000 + 28_800_000
+        self.coins: List[Dict] = []
+        for index in range(size):
+            price = math.exp(rng.uniform(math.log(1e-6), math.log(5e4)))
+            quote_volume = 1e4 * rng.paretovariate(0.8)
+            coin = {
+                "id": index + 1,
+                "base": _coin_name(index),
+                "price": price,
+                "change": rng.uniform(-15, 15),
+                "quote_volume": quote_volume,
+                "market_cap": quote_volume * rng.uniform(5, 50) if rng.random() < 0.9 else None,
+                "funding": rng.uniform(-0.001, 0.001),
+                "precision": max(0, min(8, int(-math.log10(price)) + 4)),
+                "settling": rng.random() < SETTLING_PROBABILITY,
+            }
+            coin.update({name: rng.random() < p for name, p in LISTING_PROBABILITIES.items()})
+            coin["multiplier"] = 1000 if price < MULTIPLIER_PRICE else 1
+            self.coins.append(coin)
+        self.by_symbol = {coin["base"]: coin for coin in self.coins}
+        self.by_id = {coin["id"]: coin for coin in self.coins}
+        self.static = self._build_static()
+        self.bybit = self._build_bybit()
+
+    @staticmethod
+    def _fmt(value: float) -> str:
+        return f"{value:.10g}"
+
+    def _futures_symbol(self, coin: Dict) -> Tuple[str, float]:
+        if coin["multiplier"] > 1:
+            return f"{coin['multiplier']}{coin['base']}", coin["price"] * coin["multiplier"]
+        return coin["base"], coin["price"]
+
+    def _build_static(self) -> Dict[str, bytes]:
+        fmt = self._fmt
+        mexc_contracts = [c for c in self.coins if c["mexc_futures"]]
+        binance_futures = [c for c in self.coins if c["binance_futures"]]
+
+        fapi_info, fapi_tickers, fapi_funding = [], [], []
+        for coin in binance_futures:
+            base, price = self._futures_symbol(coin)
+            symbol = base + "USDT"
+            fapi_info.append({
+                "symbol": symbol, "pair": symbol, "contractType": "PERPETUAL", "deliveryDate": 4133404800000,
+                "status": "SETTLING" if coin["settling"] else "TRADING",
+                "baseAsset": base, "quoteAsset": "USDT", "marginAsset": "USDT",
+                "pricePrecision": coin["precision"], "quantityPrecision": max(0, 4 - coin["precision"]),
+            })
+            fapi_tickers.append({
+                "symbol": symbol, "priceChangePercent": f"{coin['change']:.3f}",
+                "lastPrice": fmt(price), "openPrice": fmt(price / (1 + coin["change"] / 100)),
+                "highPrice": fmt(price * 1.05), "lowPrice": fmt(price * 0.95),
+                "volume": fmt(coin["quote_volume"] / price), "quoteVolume": fmt(coin["quote_volume"]),
+            })
+            fapi_funding.append({
+                "symbol": symbol, "markPrice": fmt(price), "lastFundingRate": f"{coin['funding']:.8f}",
+                "interestRate": "0.00010000", "nextFundingTime": self.next_funding,
+            })
+
+        binance_spot = [c for c in self.coins if c["binance_spot"]]
+        mexc_spot = [c for c in self.coins if c["mexc_spot"]]
+        return {
+            "/mexc-contract/api/v1/contract/detail": _dumps({"success": True, "code": 0, "data": [{
+                "symbol": c["base"] + "_USDT", "baseCoin": c["base"], "quoteCoin": "USDT", "state": 0,
+                "contractSize": 10.0 ** -max(0, 4 - c["precision"]),
+                "maxVol": max(1, int(c["quote_volume"] / 50 / c["price"] * 10 ** max(0, 4 - c["precision"]))),
+            } for c in mexc_contracts]}),
+            "/mexc-contract/api/v1/contract/ticker": _dumps({"success": True, "code": 0, "data": [{
+                "symbol": c["base"] + "_USDT", "lastPrice": c["price"], "riseFallRate": c["change"] / 100,
+                "high24Price": c["price"] * 1.05, "lower24Price": c["price"] * 0.95,
+                "volume24": int(c["quote_volume"] / c["price"]), "amount24": c["quote_volume"],
+                "fundingRate": c["funding"],
+            } for c in mexc_contracts]}),
+            "/mexc/api/v3/ticker/price": _dumps(
+                [{"symbol": c["base"] + "USDT", "price": fmt(c["price"])} for c in mexc_spot]),
+            "/binance/api/v3/exchangeInfo": _dumps({"symbols": [
+                {"symbol": c["base"] + "USDT", "status": "TRADING", "baseAsset": c["base"], "quoteAsset": "USDT"}
+                for c in binance_spot]}),
+            "/binance/api/v3/ticker/price": _dumps(
+                [{"symbol": c["base"] + "USDT", "price": fmt(c["price"])} for c in binance_spot]),
+            "/binance-fapi/fapi/v1/exchangeInfo": _dumps({"symbols": fapi_info}),
+            "/binance-fapi/fapi/v1/ticker/24hr": _dumps(fapi_tickers),
+            "/binance-fapi/fapi/v1/premiumIndex": _dumps(fapi_funding),
+        }
+
+    def _build_bybit(self) -> Dict[Tuple[str, str], List[Dict]]:
+        fmt = self._fmt
+        linear = [c for c in self.coins if c["bybit_linear"]]
+        spot = [c for c in self.coins if c["bybit_spot"]]
+        linear_items, linear_tickers = [], []
+        for coin in linear:
+            base, price = self._futures_symbol(coin)
+            linear_items.append({
+                "symbol": base + "USDT", "contractType": "LinearPerpetual", "baseCoin": base, "quoteCoin": "USDT",
+                "status": "Settling" if coin["settling"] else "Trading",
+            })
+            linear_tickers.append({
+                "symbol": base + "USDT", "lastPrice": fmt(price), "price24hPcnt": f"{coin['change'] / 100:.6f}",
+                "highPrice24h": fmt(price * 1.05), "lowPrice24h": fmt(price * 0.95),
+                "volume24h": fmt(coin["quote_volume"] / price), "turnover24h": fmt(coin["quote_volume"]),
+                "fundingRate": f"{coin['funding']:.8f}", "nextFundingTime": str(self.next_funding),
+            })
+        return {
+            ("/bybit/v5/market/instruments-info", "linear"): linear_items,
+            ("/bybit/v5/market/instruments-info", "spot"): [
+                {"symbol": c["base"] + "USDT", "baseCoin": c["base"], "quoteCoin": "USDT", "status": "Trading"}
+                for c in spot],
+            ("/bybit/v5/market/tickers", "linear"): linear_tickers,
+            ("/bybit/v5/market/tickers", "spot"): [
+                {"symbol": c["base"] + "USDT", "lastPrice": fmt(c["price"])} for c in spot],
+        }
+
+    # -- dinamik yanıtlar ------------------------------------------------------
+
+    def bybit_page(self, path: str, query: Dict[str, str]) -> Optional[Dict]:
+        items = self.bybit.get((path, query.get("category", "")))
+        if items is None:
+            return {"retCode": 10001, "retMsg": "params error: category", "result": {}}
+        next_cursor = ""
+        if "limit" in query:
+            limit = max(1, min(BYBIT_MAX_LIMIT, int(query["limit"] or 0)))
+            start = int(query.get("cursor") or 0)
+            if start + limit < len(items):
+                next_cursor = str(start + limit)
+            items = items[start:start + limit]
+        return {"retCode": 0, "retMsg": "OK",
+                "result": {"category": query.get("category"), "list": items, "nextPageCursor": next_cursor}}
+
+    def _cmc_quote(self, coin: Dict) -> Dict:
+        return {"id": coin["id"], "symbol": coin["base"], "is_active": 1, "cmc_rank": coin["id"],
+                "quote": {"USD": {"price": coin["price"], "market_cap": coin["market_cap"]}}}
+
+    def cmc_map(self, query: Dict[str, str]) -> Dict:
+        coins = [self.by_symbol[s] for s in query.get("symbol", "").upper().split(",") if s in self.by_symbol]
+        return {"status": {"error_code": 0, "error_message": None},
+                "data": [{"id": c["id"], "symbol": c["base"], "rank": c["id"], "is_active": 1} for c in coins]}
+
+    def cmc_quotes(self, query: Dict[str, str]) -> Dict:
+        if "id" in query:
+            ids = [int(i) for i in query["id"].split(",") if i.isdigit()]
+            data = {str(i): self._cmc_quote(self.by_id[i]) for i in ids if i in self.by_id}
+        else:
+            symbols = query.get("symbol", "").upper().split(",")
+            data = {s: [self._cmc_quote(self.by_symbol[s])] for s in symbols if s in self.by_symbol}
+        return {"status": {"error_code": 0, "error_message": None}, "data": data}
+
+    def respond(self, path: str, query: Dict[str, str]) -> Optional[bytes]:
+        """Önekli yol için yanıt gövdesi; bilinmeyen uç noktada None."""
+        path = path.rstrip("/")
+        body = self.static.get(path)
+        if body is not None:
+            return body
+        if path.startswith("/bybit/"):
+            return _dumps(self.bybit_page(path, query))
+        if path == "/cmc/v1/cryptocurrency/map":
+            return _dumps(self.cmc_map(query))
+        if path == "/cmc/v2/cryptocurrency/quotes/latest":
+            return _dumps(self.cmc_quotes(query))
+        return None
+
+
+class InProcessTransport:
+    """Evreni HTTP'siz sunan http_transport uyumlu transport (benchmark'lar için).
+
+    Modüller base_url_env() ile yönlendirilmiş olmalıdır; host yok sayılır.
+    """
+
+    mode = "in-process"
+
+    def __init__(self, universe: SyntheticUniverse):
+        self.universe = universe
+
+    def get_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                 timeout: float = 15):
+        query = {str(key): str(value) for key, value in (params or {}).items()}
+        body = self.universe.respond(urlsplit(url).path, query)
+        if body is None:
+            raise LookupError(f"Bilinmeyen uc nokta: {url}")
+        return json.loads(body)
+
+
+# ---------------------------------------------------------------------------
+# HTTP SERVER
+# ---------------------------------------------------------------------------
+
+class FaultInjector:
+    """İstek başına gecikme, 5xx ve 429 kararları (seed ile tekrarlanabilir)."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 rate_limit_rate: float = 0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._rng = random.Random(seed)
+        self._lock = Lock()
+        self.counts = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    def decide(self) -> Tuple[float, Optional[int]]:
+        """(gecikme sn, enjekte edilecek durum kodu veya None)."""
+        with self._lock:
+            self.counts["requests"] += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self._rng.random()
+            if roll < self.rate_limit_rate:
+                self.counts["rate_limited"] += 1
+                return delay, 429
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.counts["errors"] += 1
+                return delay, 503
+            return delay, None
+
+
+class FakeExchangeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], universe: SyntheticUniverse, faults: FaultInjector):
+        super().__init__(address, FakeExchangeHandler)
+        self.universe = universe
+        self.faults = faults
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class FakeExchangeHandler(BaseHTTPRequestHandler):
+    server: FakeExchangeServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        universe = self.server.universe
+
+        delay, injected = self.server.faults.decide()
+        if delay:
+            time.sleep(delay)
+        if injected == 429:
+            self._send(429, _dumps({"code": -1003, "msg": "Too many requests"}), {"Retry-After": "1"})
+            return
+        if injected:
+            self._send(injected, _dumps({"code": -1001, "msg": "Service unavailable"}))
+            return
+
+        body = universe.respond(parts.path, query)
+        if body is None:
+            self._send(404, _dumps({"code": 404, "msg": f"Unknown endpoint: {parts.path}"}))
+            return
+        self._send(200, body)
+
+
+def create_server(symbols: int = DEFAULT_SYMBOLS, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  seed: int = 0, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                  rate_limit_rate: float = 0) -> FakeExchangeServer:
+    """Sunucuyu kurar (port=0 -> boş port). serve_forever() ile çalıştırılır."""
+    universe = SyntheticUniverse(symbols, seed)
+    faults = FaultInjector(latency_ms, jitter_ms, error_rate, rate_limit_rate, seed)
+    return FakeExchangeServer((host, port), universe, faults)
+
+
+def start_in_thread(**kwargs) -> FakeExchangeServer:
+    """Sunucuyu arka plan thread'inde başlatır (benchmark ve yük testleri için)."""
+    server = create_server(**kwargs)
+    Thread(target=server.serve_forever, name="fake-exchange", daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sentetik veriyle yerel borsa/CMC sunucusu")
+    parser.add_argument("--symbols", type=int, default=DEFAULT_SYMBOLS,
+                        help=f"Evrendeki coin sayisi (500 - {MAX_SYMBOLS})")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Istek basina ortalama gecikme")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Gecikmeye eklenen +/- tekduze jitter")
+    parser.add_argument("--error-rate", type=float, default=0, help="503 donen isteklerin orani (0-1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0, help="429 donen isteklerin orani (0-1)")
+    parser.add_argument("--print-env", action="store_true", help="Sadece export satirlarini yazdir ve cik")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.symbols <= MAX_SYMBOLS:
+        parser.error(f"--symbols 1 ile {MAX_SYMBOLS} arasinda olmali")
+    if args.print_env:
+        for name, value in base_url_env(f"http://{args.host}:{args.port}").items():
+            print(f"export {name}={value}")
+        return 0
+
+    started = time.perf_counter()
+    try:
+        server = create_server(args.symbols, args.host, args.port, args.seed, args.latency_ms,
+                               args.jitter_ms, args.error_rate, args.rate_limit_rate)
+    except OSError as e:
+        print(f"[ERROR] Sunucu baslatilamadi ({args.host}:{args.port}): {e}")
+        return 1
+    print(f"[OK] {args.symbols} coinlik evren {time.perf_counter() - started:.2f} sn'de uretildi, "
+          f"{server.base_url} dinleniyor")
+    for name, value in base_url_env(server.base_url).items():
+        print(f"export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        counts = server.faults.counts
+        print(f"\n[OK] Durduruldu: {counts['requests']} istek, {counts['errors']} hata, "
+              f"{counts['rate_limited']} rate limit")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
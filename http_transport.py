@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""HTTP Transport (live / record / replay)
+
+Tüm borsa ve CoinMarketCap GET istekleri bu katmandan geçer
+(`exchange_adapters.fetch_cache` ve `binance_perpetual_snapshot.fetch_json`).
+Mod HTTP_TRANSPORT ile seçilir:
+
+    live    -> gerçek istek (varsayılan, paylaşılan requests.Session)
+    record  -> gerçek istek + ham yanıtı fixture dizinine kaydeder
+    replay  -> ağa çıkmadan fixture'dan döner; gecikme ve jitter eklenebilir
+
+Fixture dosyaları HTTP_FIXTURE_DIR (varsayılan: fixtures) altında
+`<host>/<yol>[__<parametre özeti>].json` olarak tutulur ve yanıt gövdesini
+olduğu gibi içerir; istek başlıkları (API anahtarları) kaydedilmez. Replay
+sırasında önce parametreye özel dosya, yoksa parametresiz dosya aranır.
+
+Gecikme: REPLAY_LATENCY_MS + [-REPLAY_JITTER_MS, +REPLAY_JITTER_MS] aralığında
+tekdüze jitter (REPLAY_SEED ile tekrarlanabilir).
+
+Paylaşılan transport varsayılan olarak ResilientTransport ile sarılır
+(HTTP_RESILIENCE=0 ile kapatılır):
+    - hedge: uç noktanın son isteklerinin HEDGE_PERCENTILE (95) yüzdeliğini
+      aşan istek için ikinci kopya gönderilir (HEDGE_MIN_SAMPLES örnekten sonra,
+      en az HEDGE_MIN_MS); ilk başarılı yanıt kullanılır. Kredi/kota ile
+      ücretlendirilen hostlara (HEDGE_EXCLUDE_HOSTS, varsayılan
+      pro-api.coinmarketcap.com) ikinci kopya gönderilmez.
+    - devre kesici: host art arda BREAKER_FAILURES (5) kez hata verirse
+      BREAKER_COOLDOWN (30 sn, her başarısız denemede 2 katı, en fazla
+      BREAKER_MAX_COOLDOWN) boyunca istek gönderilmez, son iyi yanıt döner.
+
+Kullanım:
+    HTTP_TRANSPORT=record python3 crypto_listings_all_in_one.py
+    HTTP_TRANSPORT=replay REPLAY_LATENCY_MS=150 REPLAY_JITTER_MS=50 python3 crypto_listings_all_in_one.py
+    python3 http_transport.py seed                     # binance_snapshot.json'dan fixture üret
+    python3 http_transport.py seed --snapshot snap.json --dir /tmp/fixtures
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+TRANSPORT_MODES = ("live", "record", "replay")
+HTTP_TRANSPORT = os.environ.get("HTTP_TRANSPORT", "live")
+HTTP_FIXTURE_DIR = os.environ.get("HTTP_FIXTURE_DIR", "fixtures")
+REPLAY_LATENCY_MS = float(os.environ.get("REPLAY_LATENCY_MS", "0"))
+REPLAY_JITTER_MS = float(os.environ.get("REPLAY_JITTER_MS", "0"))
+REPLAY_SEED = int(os.environ.get("REPLAY_SEED", "0"))
+
+# Hedge ve devre kesici (ResilientTransport); HTTP_RESILIENCE=0 ile kapatılır
+HTTP_RESILIENCE = os.environ.get("HTTP_RESILIENCE", "1") == "1"
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_MS = float(os.environ.get("HEDGE_MIN_MS", "50"))
+HEDGE_WINDOW = 200
+# Her istek kredi harcayan hostlar; ikinci kopya krediyi iki kez düşer
+HEDGE_EXCLUDE_HOSTS = {h.strip() for h in os.environ.get(
+    "HEDGE_EXCLUDE_HOSTS", "pro-api.coinmarketcap.com").split(",") if h.strip()}
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "30"))
+BREAKER_MAX_COOLDOWN = float(os.environ.get("BREAKER_MAX_COOLDOWN", "600"))
+
+
+class FixtureNotFound(LookupError):
+    """Replay modunda istenen uç nokta için fixture yok."""
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Upstream devresi açık ve son iyi yanıt yok; istek gönderilmedi."""
+
+
+def fixture_path(fixture_dir: str, url: str, params: Optional[Dict] = None) -> str:
+    """İstek için fixture dosya yolu (parametreler sıralı özetle ayrılır)."""
+    parts = urlsplit(url)
+    name = parts.path.strip("/").replace("/", "_") or "index"
+    if params:
+        digest = hashlib.sha1(json.dumps(sorted((str(k), str(v)) for k, v in params.items())).encode("utf-8"))
+        name += "__" + digest.hexdigest()[:12]
+    return os.path.join(fixture_dir, parts.netloc, name + ".json")
+
+
+def write_fixture(path: str, body: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(body)
+    os.replace(tmp_path, path)
+
+
+# ---------------------------------------------------------------------------
+# TRANSPORTS
+# ---------------------------------------------------------------------------
+
+class LiveTransport:
+    """Gerçek HTTP; bağlantılar paylaşılan oturumda yeniden kullanılır."""
+
+    mode = "live"
+
+    def __init__(self):
+        self.session = requests.Session()
+
+    def _get(self, url: str, params: Optional[Dict], headers: Optional[Dict], timeout: float) -> requests.Response:
+        response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response
+
+    def get_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                 timeout: float = 15):
+        return self._get(url, params, headers, timeout).json()
+
+
+class RecordingTransport(LiveTransport):
+    """Gerçek istek yapar ve ham yanıt gövdesini fixture olarak kaydeder."""
+
+    mode = "record"
+
+    def __init__(self, fixture_dir: str = HTTP_FIXTURE_DIR):
+        super().__init__()
+        self.fixture_dir = fixture_dir
+
+    def get_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                 timeout: float = 15):
+        response = self._get(url, params, headers, timeout)
+        data = response.json()
+        try:
+            write_fixture(fixture_path(self.fixture_dir, url, params), response.content)
+        except OSError as e:
+            print(f"[WARNING] Fixture yazilamadi ({url}): {e}")
+        return data
+
+
+class ReplayTransport:
+    """Fixture'lardan yanıt döner; ağa çıkmaz. Her çağrı gövdeyi yeniden ayrıştırır."""
+
+    mode = "replay"
+
+    def __init__(self, fixture_dir: str = HTTP_FIXTURE_DIR, latency_ms: float = REPLAY_LATENCY_MS,
+                 jitter_ms: float = REPLAY_JITTER_MS, seed: int = REPLAY_SEED):
+        self.fixture_dir = fixture_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = Lock()
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _body(self, url: str, params: Optional[Dict]) -> bytes:
+        candidates = [fixture_path(self.fixture_dir, url, params)]
+        if params:
+            candidates.append(fixture_path(self.fixture_dir, url))
+        for path in candidates:
+            body = self._bodies.get(path)
+            if body is not None:
+                return body
+            try:
+                with open(path, "rb") as fp:
+                    body = fp.read()
+            except FileNotFoundError:
+                continue
+            self._bodies[path] = body
+            return body
+        raise FixtureNotFound(f"Fixture bulunamadi: {candidates[0]}")
+
+    def get_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                 timeout: float = 15):
+        delay = self._delay()
+        if delay:
+            time.sleep(min(delay, timeout))
+            if delay > timeout:
+                raise requests.Timeout(f"Replay gecikmesi zaman asimini asti: {url}")
+        return json.loads(self._body(url, params))
+
+
+# ---------------------------------------------------------------------------
+# RESILIENCE (HEDGE + CIRCUIT BREAKER)
+# ---------------------------------------------------------------------------
+
+class LatencyTracker:
+    """Uç noktanın son başarılı isteklerinin gecikmeleri (kayan pencere)."""
+
+    def __init__(self, window: int = HEDGE_WINDOW):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Yüzdelik (sn); yeterli örnek yoksa None."""
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Bu süreyi aşan istek için ikinci kopya gönderilir (None = hedge yok)."""
+        p = self.percentile(HEDGE_PERCENTILE)
+        return None if p is None else max(p, HEDGE_MIN_MS / 1000)
+
+
+class CircuitBreaker:
+    """closed -> (ardışık hatalar) open -> (bekleme) half-open -> tek deneme -> closed | open.
+
+    Her açılışta bekleme süresi ikiye katlanır (BREAKER_MAX_COOLDOWN'a kadar),
+    başarılı denemede sıfırlanır.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = max(1, failures)
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = Lock()
+
+    def allow(self) -> bool:
+        """İstek gönderilebilir mi? half-open'da aynı anda tek deneme geçer."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            self._probing = False
+
+    def release(self) -> None:
+        """Sonuçsuz biten (iptal edilen) denemenin half-open kilidini bırakır."""
+        with self._lock:
+            self._probing = False
+
+    def failure(self) -> bool:
+        """Hatayı kaydeder; devre bu çağrıyla açıldıysa True."""
+        with self._lock:
+            self._probing = False
+            if self.state == self.HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN)
+            else:
+                self.failures += 1
+                if self.state == self.OPEN or self.failures < self.threshold:
+                    return False
+            self.state = self.OPEN
+            self.opened_at = time.time()
+            return True
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Devre kesiciyi etkileyen hata mı? 4xx (429 hariç) ve eksik fixture sayılmaz."""
+    if isinstance(error, FixtureNotFound):
+        return False
+    status = getattr(getattr(error, "response", None), "status_code", None) or getattr(error, "status", None)
+    return not (isinstance(status, int) and 400 <= status < 500 and status != 429)
+
+
+class ResilientTransport:
+    """Başka bir transport'u hedge ve host başına devre kesiciyle sarar.
+
+    - Uç nokta (host + yol) başına gecikme izlenir; istek uç noktanın p95'ini
+      aşarsa aynı isteğin ikinci kopyası gönderilir, ilk başarılı yanıt kullanılır.
+    - Host art arda BREAKER_FAILURES kez hata verirse devre açılır: istek
+      gönderilmeden o isteğin son iyi yanıtı döner (yoksa CircuitOpenError).
+      Bekleme sonunda tek bir half-open deneme yapılır.
+    """
+
+    def __init__(self, inner, hedge_workers: int = 16):
+        self.inner = inner
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # istek -> (son iyi yanıt, çekildiği an); _stale_served: son yanıtı son iyi veriden verilenler
+        self._last_good: Dict[Tuple, Tuple[object, float]] = {}
+        self._stale_served: Dict[Tuple, float] = {}
+        self._lock = Lock()
+        self._pool = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="http-hedge")
+        self.hedges = 0
+        self.served_stale = 0
+
+    @property
+    def mode(self) -> str:
+        return self.inner.mode
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict]) -> Tuple:
+        return (url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+    def tracker(self, url: str) -> LatencyTracker:
+        parts = urlsplit(url)
+        name = parts.netloc + parts.path
+        with self._lock:
+            return self._trackers.setdefault(name, LatencyTracker())
+
+    def hedge_delay(self, url: str) -> Optional[float]:
+        """Uç noktanın hedge eşiği; HEDGE_EXCLUDE_HOSTS içindeki hostlar için None."""
+        if urlsplit(url).netloc in HEDGE_EXCLUDE_HOSTS:
+            return None
+        return self.tracker(url).hedge_delay()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        with self._lock:
+            return self._breakers.setdefault(urlsplit(url).netloc, CircuitBreaker())
+
+    # -- ortak kancalar (async_ingest de kullanır) --------------------------------
+
+    def before(self, url: str, params: Optional[Dict]) -> Tuple[bool, object]:
+        """(gönder, son iyi yanıt). Devre açıksa son iyi yanıt döner, yoksa CircuitOpenError."""
+        if self.breaker(url).allow():
+            return True, None
+        with self._lock:
+            key = self._key(url, params)
+            if key in self._last_good:
+                data, fetched = self._last_good[key]
+                self.served_stale += 1
+                self._stale_served[key] = fetched
+                return False, data
+        raise CircuitOpenError(f"Devre acik: {urlsplit(url).netloc}")
+
+    def after_success(self, url: str, params: Optional[Dict], data, seconds: float) -> None:
+        self.tracker(url).observe(seconds)
+        self.breaker(url).success()
+        key = self._key(url, params)
+        with self._lock:
+            self._last_good[key] = (data, time.time())
+            self._stale_served.pop(key, None)
+
+    def stale_since(self, url: str, params: Optional[Dict] = None) -> Optional[float]:
+        """İsteğin son yanıtı devre açıkken son iyi veriden verildiyse o verinin çekildiği an."""
+        with self._lock:
+            return self._stale_served.get(self._key(url, params))
+
+    def after_failure(self, url: str, error: BaseException) -> None:
+        breaker = self.breaker(url)
+        if not is_upstream_failure(error):
+            # Upstream yanıt verdi (ör. 404); half-open deneme başarılı sayılır
+            breaker.success()
+            return
+        if breaker.failure():
+            print(f"[WARNING] {urlsplit(url).netloc} devresi acildi ({error}); "
+                  f"{breaker.cooldown:.0f} sn son iyi veri kullanilacak")
+
+    # -- istek --------------------------------------------------------------------
+
+    def _timed(self, url: str, params: Optional[Dict], headers: Optional[Dict], timeout: float):
+        started = time.perf_counter()
+        data = self.inner.get_json(url, params, headers, timeout)
+        return data, time.perf_counter() - started
+
+    def _hedged(self, url: str, params: Optional[Dict], headers: Optional[Dict], timeout: float):
+        delay = self.hedge_delay(url)
+        if delay is None or delay >= timeout:
+            return self._timed(url, params, headers, timeout)
+        pending = {self._pool.submit(self._timed, url, params, headers, timeout)}
+        done, _ = wait(pending, timeout=delay)
+        if not done:
+            with self._lock:
+                self.hedges += 1
+            pending.add(self._pool.submit(self._timed, url, params, headers, max(1.0, timeout - delay)))
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def get_json(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                 timeout: float = 15):
+        send, cached = self.before(url, params)
+        if not send:
+            return cached
+        try:
+            data, seconds = self._hedged(url, params, headers, timeout)
+        except Exception as e:
+            self.after_failure(url, e)
+            raise
+        except BaseException:
+            self.breaker(url).release()
+            raise
+        self.after_success(url, params, data, seconds)
+        return data
+
+    def stats(self) -> Dict[str, Dict]:
+        """Host başına devre durumu ve uç nokta başına p95 (ms)."""
+        with self._lock:
+            breakers = dict(self._breakers)
+            trackers = dict(self._trackers)
+        result = {host: {"state": breaker.state, "failures": breaker.failures} for host, breaker in breakers.items()}
+        for name, tracker in trackers.items():
+            host = name.split("/", 1)[0]
+            p95 = tracker.percentile(HEDGE_PERCENTILE)
+            result.setdefault(host, {}).setdefault("p95_ms", {})[name[len(host):]] = \
+                None if p95 is None else round(p95 * 1000, 1)
+        return result
+
+
+def create_transport(mode: str = HTTP_TRANSPORT, fixture_dir: str = HTTP_FIXTURE_DIR):
+    if mode == "record":
+        return RecordingTransport(fixture_dir)
+    if mode == "replay":
+        return ReplayTransport(fixture_dir)
+    if mode != "live":
+        print(f"[WARNING] Bilinmeyen HTTP_TRANSPORT: {mode} ({' | '.join(TRANSPORT_MODES)}), live kullaniliyor")
+    return LiveTransport()
+
+
+_transport = None
+_transport_lock = Lock()
+
+
+def get_transport():
+    """Süreç içinde paylaşılan transport (ilk çağrıda HTTP_TRANSPORT'a göre kurulur)."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = create_transport()
+            if HTTP_RESILIENCE:
+                _transport = ResilientTransport(_transport)
+        return _transport
+
+
+def set_transport(transport) -> None:
+    """Paylaşılan transport'u değiştirir (benchmark/test kurulumları için)."""
+    global _transport
+    with _transport_lock:
+        _transport = transport
+
+
+# ---------------------------------------------------------------------------
+# FIXTURE SEEDING
+# ---------------------------------------------------------------------------
+
+# Sentetik veride bu aralıkla seçilen sözleşmeler farklılaştırılır
+SEED_SETTLING_EVERY = 11   # Binance'de SETTLING (vadeli listesinde sayılmaz)
+SEED_BYBIT_SKIP_EVERY = 5  # Bybit vadelide yok
+
+
+def seed_responses(snapshot: Dict) -> Dict[str, object]:
+    """binance_snapshot.json biçimindeki kayıtlardan tüm uç noktaların yanıtlarını üretir.
+
+    Binance vadeli uç noktaları snapshot'ın tersidir (build_snapshot aynı
+    kayıtları üretir). MEXC, Bybit ve CMC yanıtları aynı evrenden
+    belirleyici olarak türetilir: her SEED_SETTLING_EVERY'inci sözleşme
+    Binance'de SETTLING, her SEED_BYBIT_SKIP_EVERY'inci Bybit vadelide yok;
+    böylece karşılaştırma listeleri boş kalmaz.
+    """
+    import binance_perpetual_snapshot as bps
+    import coinmarketcap as cmc
+    import exchange_adapters as ea
+    from symbol_index import SymbolIndex
+
+    normalizer = SymbolIndex()
+    records = sorted(snapshot.get("symbols", []), key=lambda record: record["symbol"])
+    info, tickers, funding = [], [], []
+    bases: Dict[str, Dict] = {}
+    for idx, record in enumerate(records):
+        status = record.get("status") or ("SETTLING" if idx % SEED_SETTLING_EVERY == SEED_SETTLING_EVERY - 1 else "TRADING")
+        info.append({
+            "symbol": record["symbol"], "pair": record.get("pair", record["symbol"]), "contractType": "PERPETUAL",
+            "deliveryDate": record.get("deliveryDate"), "status": status,
+            "baseAsset": record.get("baseAsset"), "quoteAsset": record.get("quoteAsset", "USDT"),
+            "marginAsset": record.get("marginAsset", "USDT"), "pricePrecision": record.get("pricePrecision"),
+            "quantityPrecision": record.get("quantityPrecision"),
+        })
+        tickers.append({"symbol": record["symbol"], **{
+            field: str(record.get(field, 0.0))
+            for field in ("priceChangePercent", "volume", "quoteVolume", "openPrice", "highPrice", "lowPrice", "lastPrice")
+        }})
+        funding.append({
+            "symbol": record["symbol"], "markPrice": str(record.get("lastPrice", 0.0)),
+            "lastFundingRate": str(record.get("fundingRate", 0.0)), "interestRate": str(record.get("interestRate", 0.0)),
+            "nextFundingTime": record.get("nextFundingTime"),
+        })
+        canonical, multiplier = normalizer.normalize("binance.futures", record.get("baseAsset") or "")
+        if canonical and canonical not in bases:
+            bases[canonical] = {"raw": record.get("baseAsset"), "idx": idx,
+                                "price": float(record.get("lastPrice") or 0.0) / multiplier,
+                                "quoteVolume": float(record.get("quoteVolume") or 0.0),
+                                "precision": int(record.get("quantityPrecision") or 0)}
+
+    spot_symbols = [{"symbol": base + "USDT", "status": "TRADING", "baseAsset": base, "quoteAsset": "USDT"}
+                    for base in sorted(bases)]
+    spot_prices = [{"symbol": base + "USDT", "price": f"{item['price']:.10g}"} for base, item in sorted(bases.items())]
+    mexc_contracts = [{
+        "symbol": base + "_USDT",
+        "contractSize": 10.0 ** -item["precision"],
+        "maxVol": max(1, int(item["quoteVolume"] / 50 / max(item["price"], 1e-12) * 10 ** item["precision"])),
+    } for base, item in sorted(bases.items())]
+    bybit_linear = [{"symbol": item["raw"] + "USDT", "status": "Trading", "baseCoin": item["raw"], "quoteCoin": "USDT"}
+                    for _, item in sorted(bases.items()) if item["idx"] % SEED_BYBIT_SKIP_EVERY]
+    bybit_spot = [{"symbol": base + "USDT", "status": "Trading", "baseCoin": base, "quoteCoin": "USDT"}
+                  for base in sorted(bases)]
+    bybit_tickers = [{"symbol": base + "USDT", "lastPrice": f"{item['price']:.10g}"} for base, item in sorted(bases.items())]
+
+    # CMC: hacme göre sıra, market cap = 24s hacim x 20
+    ranked = sorted(bases, key=lambda base: (-bases[base]["quoteVolume"], base))
+    cmc_map = [{"id": rank, "symbol": base, "rank": rank, "is_active": 1} for rank, base in enumerate(ranked, 1)]
+    cmc_quotes = {str(rank): {"id": rank, "symbol": base, "quote": {"USD": {"market_cap": bases[base]["quoteVolume"] * 20}}}
+                  for rank, base in enumerate(ranked, 1)}
+    ok = {"error_code": 0, "error_message": None}
+
+    def bybit(items):
+        return {"retCode": 0, "retMsg": "OK", "result": {"list": items}}
+
+    return {
+        fixture_path("", bps.EXCHANGE_INFO_URL): {"symbols": info},
+        fixture_path("", bps.TICKER_24H_URL): tickers,
+        fixture_path("", bps.FUNDING_URL): funding,
+        fixture_path("", ea.BINANCE_SPOT_SYMBOLS_URL): {"symbols": spot_symbols},
+        fixture_path("", ea.BINANCE_SPOT_TICKER_URL): spot_prices,
+        fixture_path("", ea.MEXC_CONTRACT_DETAIL_URL): {"success": True, "code": 0, "data": mexc_contracts},
+        fixture_path("", ea.MEXC_SPOT_TICKER_URL): spot_prices,
+        fixture_path("", ea.BYBIT_INSTRUMENTS_URL, {"category": "linear"}): bybit(bybit_linear),
+        fixture_path("", ea.BYBIT_INSTRUMENTS_URL, {"category": "spot"}): bybit(bybit_spot),
+        fixture_path("", ea.BYBIT_TICKERS_URL, {"category": "spot"}): bybit(bybit_tickers),
+        fixture_path("", cmc.COINMARKETCAP_MAP_URL): {"status": ok, "data": cmc_map},
+        fixture_path("", cmc.COINMARKETCAP_QUOTES_URL): {"status": ok, "data": cmc_quotes},
+    }
+
+
+def seed_fixtures(snapshot_path: str, fixture_dir: str) -> List[str]:
+    with open(snapshot_path, "r", encoding="utf-8") as fp:
+        snapshot = json.load(fp)
+    written = []
+    for relative, body in seed_responses(snapshot).items():
+        path = os.path.join(fixture_dir, relative)
+        write_fixture(path, json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        written.append(path)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP fixture araclari")
+    sub = parser.add_subparsers(dest="command")
+    seed = sub.add_parser("seed", help="Snapshot JSON'dan tum uc noktalar icin fixture uret")
+    seed.add_argument("--snapshot", default="binance_snapshot.json", help="binance_perpetual_snapshot ciktisi")
+    seed.add_argument("--dir", default=HTTP_FIXTURE_DIR, help="Fixture dizini")
+    args = parser.parse_args(argv)
+
+    if args.command != "seed":
+        parser.print_help()
+        return 0
+    try:
+        written = seed_fixtures(args.snapshot, args.dir)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Fixture uretilemedi: {e}")
+        return 1
+    print(f"[OK] {len(written)} fixture yazildi: {args.dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
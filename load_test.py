@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Dashboard Load Test
+
+Dashboard'u yerelde gunicorn ile N worker olarak başlatır; `/`, `/api/data`,
+`/api/mexc` ve `/api/binance` uç noktalarını istenen eş zamanlılıkla
+çağırırken aynı anda belirli hızda `/api/worker/update` yayınları yapar.
+Uç nokta başına p50/p95/p99 gecikme, throughput ve hata oranı raporlanır.
+
+- Sunucunun arka plan güncelleyicisi ağa çıkmaz: yük testi süreç içinde
+  fake_exchange_server başlatır ve gunicorn'u base URL değişkenleriyle
+  ona yönlendirir (sembol indeksi / market cap önbelleği geçici dizinde).
+- Yayınlar proxy_worker gibi gzip'li tam kaynak gövdesidir; her yayında
+  birkaç satırın market cap'i değişir, böylece türev listeler data_lock
+  altında gerçekten yeniden hesaplanır.
+- gunicorn worker'ları ayrı süreçlerdir ve data_store'u paylaşmaz; her
+  yayın yalnızca isteği alan worker'ı günceller (Render'daki durum).
+
+Kullanım:
+    python3 load_test.py --workers 2 --concurrency 32 --duration 30 --publish-rate 2
+    python3 load_test.py --symbols 20000 --threads 4 -o load_result.json
+    python3 load_test.py --url http://127.0.0.1:5000 --secret xxxx   # çalışan sunucuya
+"""
+
+import argparse
+import gzip
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Sequence
+
+import requests
+
+from fake_exchange_server import base_url_env, start_in_thread
+
+DEFAULT_PATHS = ("/", "/api/data", "/api/mexc", "/api/binance")
+PUBLISH_PATH = "/api/worker/update"
+DEFAULT_PORT = 8790
+LOAD_TEST_SECRET = "load-test-secret"
+READY_TIMEOUT = 30
+REQUEST_TIMEOUT = 30
+
+# ---------------------------------------------------------------------------
+# STATISTICS
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """En yakın sıra yöntemiyle yüzdelik (liste sıralı olmalı)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyRecorder:
+    """Uç nokta başına gecikme ve hata sayaçları (thread-safe)."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.latencies.setdefault(name, []).append(seconds)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, duration: float) -> Dict[str, Dict]:
+        result = {}
+        with self._lock:
+            names = sorted(self.latencies)
+            for name in names + ["TOPLAM"]:
+                if name == "TOPLAM":
+                    values = sorted(v for key, items in self.latencies.items() if key != PUBLISH_PATH for v in items)
+                    errors = sum(count for key, count in self.errors.items() if key != PUBLISH_PATH)
+                else:
+                    values = sorted(self.latencies[name])
+                    errors = self.errors.get(name, 0)
+                result[name] = {
+                    "requests": len(values),
+                    "errors": errors,
+                    "error_rate": errors / len(values) if values else 0.0,
+                    "throughput": len(values) / duration if duration else 0.0,
+                    "p50_ms": percentile(values, 50) * 1000,
+                    "p95_ms": percentile(values, 95) * 1000,
+                    "p99_ms": percentile(values, 99) * 1000,
+                    "max_ms": (values[-1] if values else 0.0) * 1000,
+                }
+        return result
+
+
+# ---------------------------------------------------------------------------
+# SERVER
+# ---------------------------------------------------------------------------
+
+def start_gunicorn(port: int, workers: int, threads: int, env: Dict[str, str]) -> subprocess.Popen:
+    gunicorn = shutil.which("gunicorn")
+    if gunicorn is None:
+        raise RuntimeError("gunicorn bulunamadi (pip install gunicorn)")
+    command = [gunicorn, "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--threads", str(threads),
+               "--log-level", "warning", "--chdir", os.path.dirname(os.path.abspath(__file__)),
+               "crypto_web_dashboard:app"]
+    return subprocess.Popen(command, env={**os.environ, **env}, stdout=subprocess.DEVNULL)
+
+
+def wait_ready(base_url: str, timeout: float = READY_TIMEOUT) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(base_url + "/api/health", timeout=2).ok:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def build_rows(count: int, seed: int = 0) -> List[Dict]:
+    """Dashboard MEXC satırı biçiminde sentetik liste."""
+    rng = random.Random(seed)
+    rows = []
+    for idx in range(count):
+        max_pos = rng.uniform(1e3, 1e7)
+        market_cap = rng.uniform(1e6, 1e10)
+        rows.append({
+            "rank": idx + 1,
+            "symbol": f"LT{idx:05d}",
+            "max_position": max_pos,
+            "max_position_pretty": f"${max_pos:,.0f}",
+            "market_cap": market_cap,
+            "market_cap_pretty": f"${market_cap:,.0f}",
+        })
+    rows.sort(key=lambda row: -row["market_cap"])
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# LOAD
+# ---------------------------------------------------------------------------
+
+def reader_loop(base_url: str, paths: Sequence[str], recorder: LatencyRecorder, stop: Event, offset: int) -> None:
+    session = requests.Session()
+    idx = offset
+    while not stop.is_set():
+        path = paths[idx % len(paths)]
+        idx += 1
+        started = time.perf_counter()
+        try:
+            response = session.get(base_url + path, timeout=REQUEST_TIMEOUT)
+            response.content
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        recorder.record(path, time.perf_counter() - started, ok)
+
+
+def publisher_loop(base_url: str, secret: str, rate: float, rows: List[Dict], binance: List[str],
+                   recorder: LatencyRecorder, stop: Event, seed: int) -> None:
+    """`rate` yayın/sn hızında tam kaynak gövdesi gönderir."""
+    session = requests.Session()
+    rng = random.Random(seed)
+    interval = 1.0 / rate
+    next_at = time.perf_counter()
+    while not stop.is_set():
+        for row in rng.sample(rows, min(5, len(rows))):
+            row["market_cap"] = rng.uniform(1e6, 1e10)
+            row["market_cap_pretty"] = f"${row['market_cap']:,.0f}"
+        body = {"secret": secret, "sources": {
+            "mexc": {"mode": "full", "data": rows},
+            "binance": {"mode": "full", "data": binance},
+        }}
+        data = gzip.compress(json.dumps(body, separators=(",", ":")).encode("utf-8"))
+        headers = {"X-Worker-Secret": secret, "Content-Type": "application/json", "Content-Encoding": "gzip"}
+        started = time.perf_counter()
+        try:
+            response = session.post(base_url + PUBLISH_PATH, data=data, headers=headers, timeout=REQUEST_TIMEOUT)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        recorder.record(PUBLISH_PATH, time.perf_counter() - started, ok)
+        next_at += interval
+        stop.wait(max(0.0, next_at - time.perf_counter()))
+
+
+def run_load(base_url: str, secret: str, concurrency: int, duration: float, publish_rate: float,
+             rows: int, warmup: float, paths: Sequence[str] = DEFAULT_PATHS, seed: int = 0) -> Dict:
+    mexc_rows = build_rows(rows, seed)
+    binance = sorted(row["symbol"] for row in mexc_rows[::3])
+
+    # Isınma: worker'lar ilk isteklerde güncelleyicisini başlatır ve veriyi yükler
+    warm = LatencyRecorder()
+    warm_stop = Event()
+    warm_threads = [Thread(target=reader_loop, args=(base_url, paths, warm, warm_stop, i), daemon=True)
+                    for i in range(min(4, concurrency))]
+    for thread in warm_threads:
+        thread.start()
+    time.sleep(warmup)
+    warm_stop.set()
+    for thread in warm_threads:
+        thread.join()
+
+    recorder = LatencyRecorder()
+    stop = Event()
+    threads = [Thread(target=reader_loop, args=(base_url, paths, recorder, stop, i), daemon=True)
+               for i in range(concurrency)]
+    if publish_rate > 0:
+        threads.append(Thread(target=publisher_loop, daemon=True,
+                              args=(base_url, secret, publish_rate, mexc_rows, binance, recorder, stop, seed)))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return recorder.summary(time.perf_counter() - started)
+
+
+def print_report(summary: Dict[str, Dict]) -> None:
+    print(f"\n{'Uc nokta':<22} {'Istek':>8} {'Hata %':>7} {'Istek/sn':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9}")
+    print("-" * 90)
+    for name, item in summary.items():
+        print(f"{name:<22} {item['requests']:>8} {item['error_rate'] * 100:>6.2f}% {item['throughput']:>9.1f} "
+              f"{item['p50_ms']:>9.1f} {item['p95_ms']:>9.1f} {item['p99_ms']:>9.1f} {item['max_ms']:>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Dashboard API yuk testi (gunicorn + eszamanli yayinlar)")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker sayisi")
+    parser.add_argument("--threads", type=int, default=1, help="gunicorn worker basina thread")
+    parser.add_argument("--concurrency", type=int, default=16, help="Eszamanli okuyucu sayisi")
+    parser.add_argument("--duration", type=float, default=20, help="Olcum suresi (sn)")
+    parser.add_argument("--warmup", type=float, default=3, help="Olcum oncesi isinma (sn)")
+    parser.add_argument("--publish-rate", type=float, default=1.0, help="Saniyede /api/worker/update yayini (0 = kapali)")
+    parser.add_argument("--rows", type=int, default=2000, help="Yayinlanan MEXC satir sayisi")
+    parser.add_argument("--symbols", type=int, default=2000, help="Sahte borsa evreni (sunucu guncelleyicisi icin)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--url", help="Calisan sunucuya yuk ver (gunicorn baslatilmaz)")
+    parser.add_argument("--secret", default=LOAD_TEST_SECRET, help="--url ile sunucunun WORKER_SECRET'i")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Sonuclari JSON olarak kaydet")
+    args = parser.parse_args(argv)
+
+    process = None
+    workdir = None
+    base_url = args.url.rstrip("/") if args.url else f"http://127.0.0.1:{args.port}"
+    try:
+        if not args.url:
+            exchange = start_in_thread(symbols=args.symbols, port=0, seed=args.seed)
+            workdir = tempfile.mkdtemp(prefix="load_test_")
+            env = {**base_url_env(exchange.base_url), "WORKER_SECRET": args.secret,
+                   "SYMBOL_INDEX_PATH": os.path.join(workdir, "symbol_index.json"),
+                   "MARKETCAP_CACHE_PATH": os.path.join(workdir, "marketcap_cache.sqlite3")}
+            try:
+                process = start_gunicorn(args.port, args.workers, args.threads, env)
+            except RuntimeError as e:
+                print(f"[ERROR] {e}")
+                return 1
+        if not wait_ready(base_url):
+            print(f"[ERROR] Sunucu hazir olmadi: {base_url}")
+            return 1
+
+        print(f"[LOAD] {base_url}: {args.concurrency} okuyucu, {args.publish_rate:g} yayin/sn, "
+              f"{args.duration:g} sn (worker: {args.workers if not args.url else '-'}, satir: {args.rows})")
+        summary = run_load(base_url, args.secret, args.concurrency, args.duration, args.publish_rate,
+                           args.rows, args.warmup, seed=args.seed)
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if workdir:
+            shutil.rmtree(workdir, True)
+
+    print_report(summary)
+    if args.output:
+        report = {"config": {key: value for key, value in vars(args).items() if key != "secret"},
+                  "results": summary}
+        try:
+            with open(args.output, "w", encoding="utf-8") as fp:
+                json.dump(report, fp, indent=2)
+            print(f"\n[OK] Sonuclar kaydedildi: {args.output}")
+        except OSError as e:
+            print(f"[ERROR] Sonuclar yazilamadi ({args.output}): {e}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Market Cap Disk Cache
+
+Dashboard, proxy worker ve liste scriptlerinin paylaştığı SQLite tabanlı
+market cap önbelleği. Her kanonik asset için market cap ve çekilme zamanı
+tutulur; birden fazla süreç aynı dosyayı eş zamanlı okuyup yazabilir (WAL).
+
+Okuma stale-while-revalidate mantığıyla çalışır:
+    yaş < MARKETCAP_TTL          -> taze, doğrudan kullanılır
+    yaş < MARKETCAP_MAX_STALE    -> bayat, hemen döner; arka planda yenilenir
+    daha eski / hiç yok          -> çağıran senkron olarak çeker
+
+Aynı bayat kaydı birden fazla süreç aynı anda yenilemesin diye kayıtlar
+kısa süreliğine "sahiplenilir" (refresh_claim).
+
+Dosya yolu MARKETCAP_CACHE_PATH ile değiştirilir; boş değer önbelleği kapatır.
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MARKETCAP_CACHE_PATH = os.environ.get("MARKETCAP_CACHE_PATH", "marketcap_cache.sqlite3")
+MARKETCAP_TTL = int(os.environ.get("MARKETCAP_TTL", "900"))
+MARKETCAP_MAX_STALE = int(os.environ.get("MARKETCAP_MAX_STALE", str(7 * 24 * 3600)))
+
+# Yenileme sahipliğinin geçerli olduğu süre
+REFRESH_CLAIM_SECONDS = 120
+
+# SQLite tek sorguda sınırlı sayıda parametre kabul eder
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS marketcaps (
+    asset TEXT PRIMARY KEY,
+    market_cap REAL,
+    fetched_at REAL NOT NULL,
+    refresh_claim REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+class MarketCapCache:
+    """Kanonik sembol -> (market cap, çekilme zamanı) SQLite önbelleği."""
+
+    def __init__(self, path: str = MARKETCAP_CACHE_PATH, ttl: float = MARKETCAP_TTL,
+                 max_stale: float = MARKETCAP_MAX_STALE):
+        self.path = path
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._ready = False
+
+    @contextmanager
+    def _transaction(self):
+        """Tek işlemlik bağlantı; çıkışta commit edilip kapatılır."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(_SCHEMA)
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, assets: Iterable[str], now: Optional[float] = None) -> Tuple[Dict[str, Optional[float]], List[str]]:
+        """(kullanılabilir değerler, bayat olanlar) döndürür.
+
+        Değerler taze ve bayat kayıtları içerir; None = CMC'de market cap yok.
+        Dönüşte olmayan asset'ler senkron çekilmelidir.
+        """
+        now = time.time() if now is None else now
+        assets = list(dict.fromkeys(assets))
+        values: Dict[str, Optional[float]] = {}
+        stale: List[str] = []
+        try:
+            with self._transaction() as conn:
+                for i in range(0, len(assets), _QUERY_CHUNK):
+                    chunk = assets[i:i + _QUERY_CHUNK]
+                    rows = conn.execute(
+                        f"SELECT asset, market_cap, fetched_at FROM marketcaps WHERE asset IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    for asset, market_cap, fetched_at in rows:
+                        age = now - fetched_at
+                        if age >= self.max_stale:
+                            continue
+                        values[asset] = market_cap
+                        if age >= self.ttl:
+                            stale.append(asset)
+        except sqlite3.Error as e:
+            print(f"[WARNING] Market cap onbellegi okunamadi ({self.path}): {e}")
+            return {}, []
+        return values, stale
+
+    def store(self, values: Dict[str, Optional[float]], now: Optional[float] = None) -> None:
+        if not values:
+            return
+        now = time.time() if now is None else now
+        try:
+            with self._transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO marketcaps (asset, market_cap, fetched_at, refresh_claim) VALUES (?, ?, ?, 0) "
+                    "ON CONFLICT(asset) DO UPDATE SET market_cap=excluded.market_cap, "
+                    "fetched_at=excluded.fetched_at, refresh_claim=0",
+                    [(asset, market_cap, now) for asset, market_cap in values.items()],
+                )
+        except sqlite3.Error as e:
+            print(f"[WARNING] Market cap onbellegine yazilamadi ({self.path}): {e}")
+
+    def claim(self, assets: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Başka bir sürecin yenilemediği bayat kayıtları sahiplenir."""
+        now = time.time() if now is None else now
+        claimed = []
+        try:
+            with self._transaction() as conn:
+                for asset in assets:
+                    cursor = conn.execute(
+                        "UPDATE marketcaps SET refresh_claim=? WHERE asset=? AND refresh_claim<?",
+                        (now, asset, now - REFRESH_CLAIM_SECONDS),
+                    )
+                    if cursor.rowcount:
+                        claimed.append(asset)
+        except sqlite3.Error as e:
+            print(f"[WARNING] Market cap onbellegi guncellenemedi ({self.path}): {e}")
+            return []
+        return claimed
+
+
+_shared_cache: Optional[MarketCapCache] = None
+
+
+def get_marketcap_cache() -> Optional[MarketCapCache]:
+    """Süreç içinde paylaşılan önbellek; MARKETCAP_CACHE_PATH boşsa None."""
+    global _shared_cache
+    if not MARKETCAP_CACHE_PATH:
+        return None
+    if _shared_cache is None:
+        _shared_cache = MarketCapCache(MARKETCAP_CACHE_PATH)
+    return _shared_cache
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Exchange Membership Matrix
+
+Her base asset'e bir tamsayı ID atanır ve her (borsa, piyasa) kolonu bir bitset
+olarak tutulur (Python int; bit i = ID'si i olan asset). Raporlar elle yazılmış
+küme farkları yerine bitset'ler üzerinde tek geçişte değerlendirilen boolean
+ifadelerdir:
+
+    mexc.futures and not binance.futures
+    on mexc.futures and bybit.futures but not binance.futures
+    binance.spot - binance.futures
+    (bybit.spot | binance.spot) & ~mexc.futures
+
+Kolon adları `<borsa>.<piyasa>` biçimindedir (piyasa: spot | futures); yalnızca
+borsa adı yazılırsa o borsanın tüm piyasaları (birleşim) kastedilir. `not X`,
+matristeki kolonların birleşimine göre tümleyendir; matris yalnızca ifadede
+geçen kolonlarla (ve varsa verilen evren kolonlarıyla) kurulur, böylece sonuç
+başka kolonların yüklenmiş olup olmamasına bağlı değildir. CLI evren kolonu
+eklemez; dashboard (/api/membership) evrene her zaman mexc.futures'ı ekler.
+Borsa sembolleri symbol_index ile kanonik adlara çevrilir (1000PEPE -> PEPE).
+
+Kullanım:
+    python3 membership.py "mexc.futures and not binance.futures"
+    python3 membership.py mexc_not_bybit --output fark.csv
+    python3 membership.py --presets
+"""
+
+import argparse
+import csv
+import re
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+MARKETS = ("spot", "futures")
+
+# Mevcut scriptlerin ürettiği karşılaştırmalar
+PRESET_EXPRESSIONS = {
+    "mexc_not_binance": "mexc.futures and not binance.futures",
+    "mexc_not_bybit": "mexc.futures and not bybit.futures",
+    "binance_spot_no_futures": "binance.spot and not binance.futures",
+    "bybit_spot_no_futures": "bybit.spot and not bybit.futures",
+}
+
+# ---------------------------------------------------------------------------
+# MATRIX
+# ---------------------------------------------------------------------------
+
+class MembershipMatrix:
+    """Asset ID'leri ve kolon bitset'leri."""
+
+    def __init__(self):
+        self.assets: List[str] = []
+        self.asset_ids: Dict[str, int] = {}
+        self.columns: Dict[str, int] = {}
+
+    def asset_id(self, symbol: str) -> int:
+        symbol = symbol.upper()
+        idx = self.asset_ids.get(symbol)
+        if idx is None:
+            idx = len(self.assets)
+            self.asset_ids[symbol] = idx
+            self.assets.append(symbol)
+        return idx
+
+    def add_column(self, name: str, symbols: Iterable[str]) -> None:
+        bits = self.columns.get(name, 0)
+        for symbol in symbols:
+            if symbol:
+                bits |= 1 << self.asset_id(symbol)
+        self.columns[name] = bits
+
+    @property
+    def universe(self) -> int:
+        return (1 << len(self.assets)) - 1
+
+    def column(self, name: str) -> int:
+        if name in self.columns:
+            return self.columns[name]
+        # Sadece borsa adı: tüm piyasaların birleşimi
+        parts = [bits for column, bits in self.columns.items() if column.split(".", 1)[0] == name]
+        if not parts:
+            raise KeyError(name)
+        bits = 0
+        for part in parts:
+            bits |= part
+        return bits
+
+    def evaluate(self, expression: str) -> int:
+        return evaluate_node(parse_expression(expression), self)
+
+    def members(self, bits: int) -> List[str]:
+        """Bitset'teki asset'leri ID sırasıyla döndürür."""
+        digits = bin(bits)[:1:-1]
+        result = []
+        idx = digits.find("1")
+        while idx >= 0:
+            result.append(self.assets[idx])
+            idx = digits.find("1", idx + 1)
+        return result
+
+    def select(self, expression: str) -> List[str]:
+        return self.members(self.evaluate(expression))
+
+
+def matrix_from_sets(columns: Dict[str, Iterable[str]]) -> MembershipMatrix:
+    matrix = MembershipMatrix()
+    for name, symbols in columns.items():
+        matrix.add_column(name, symbols)
+    return matrix
+
+
+# ---------------------------------------------------------------------------
+# EXPRESSION PARSER
+# ---------------------------------------------------------------------------
+
+# Öncelik: or/| < and/but/&/- < not/~
+_TOKEN_RE = re.compile(r"\s*(?:([A-Za-z0-9_]+(?:\.[A-Za-z]+)?)|([()&|~\-]))")
+_WORD_OPERATORS = {"and": "&", "but": "&", "or": "|", "not": "~"}
+_FILLER_WORDS = {"on", "in"}
+
+
+def _tokenize(expression: str) -> List[str]:
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if not match:
+            raise ValueError(f"Gecersiz ifade karakteri: {expression[pos:].strip()[:1]!r}")
+        word, symbol = match.groups()
+        pos = match.end()
+        if symbol:
+            tokens.append(symbol)
+            continue
+        lowered = word.lower()
+        if lowered in _FILLER_WORDS:
+            continue
+        tokens.append(_WORD_OPERATORS.get(lowered, lowered))
+    return tokens
+
+
+def parse_expression(expression: str) -> Tuple:
+    """İfadeyi ('col', ad) / ('not', x) / ('and'|'or'|'diff', a, b) ağacına çevirir."""
+    tokens = _tokenize(expression)
+    pos = 0
+
+    def peek() -> Optional[str]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take() -> str:
+        nonlocal pos
+        token = peek()
+        if token is None:
+            raise ValueError("Ifade beklenmedik sekilde bitti")
+        pos += 1
+        return token
+
+    def parse_or():
+        node = parse_and()
+        while peek() == "|":
+            take()
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() in ("&", "-"):
+            op = "and" if take() == "&" else "diff"
+            node = (op, node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == "~":
+            take()
+            return ("not", parse_not())
+        token = take()
+        if token == "(":
+            node = parse_or()
+            if take() != ")":
+                raise ValueError("Kapanmayan parantez")
+            return node
+        if token in ("&", "|", "-", ")"):
+            raise ValueError(f"Beklenmeyen operator: {token}")
+        return ("col", token)
+
+    node = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Beklenmeyen ifade parcasi: {peek()}")
+    return node
+
+
+def expression_columns(node: Tuple) -> Set[str]:
+    if node[0] == "col":
+        return {node[1]}
+    return set().union(*(expression_columns(child) for child in node[1:]))
+
+
+def referenced_columns(expression: str, available: Iterable[str], universe: Iterable[str] = ()) -> List[str]:
+    """Mevcut kolonlardan ifadede geçenleri (borsa adı -> tüm piyasaları) ve evren kolonlarını seçer."""
+    names = expression_columns(parse_expression(expression)) | set(universe)
+    return [column for column in available if column in names or column.split(".", 1)[0] in names]
+
+
+def evaluate_node(node: Tuple, matrix: MembershipMatrix) -> int:
+    kind = node[0]
+    if kind == "col":
+        try:
+            return matrix.column(node[1])
+        except KeyError:
+            raise ValueError(f"Bilinmeyen kolon: {node[1]} (mevcut: {', '.join(sorted(matrix.columns))})")
+    if kind == "not":
+        return matrix.universe & ~evaluate_node(node[1], matrix)
+    left = evaluate_node(node[1], matrix)
+    right = evaluate_node(node[2], matrix)
+    if kind == "and":
+        return left & right
+    if kind == "or":
+        return left | right
+    return left & ~right
+
+
+# ---------------------------------------------------------------------------
+# EXCHANGE LOADING
+# ---------------------------------------------------------------------------
+
+def _column_loaders(name: str) -> Dict[str, Callable[[], Set[str]]]:
+    from exchange_adapters import get_adapter
+
+    exchange, _, market = name.partition(".")
+    adapter = get_adapter(exchange)
+    markets = [market] if market else list(MARKETS)
+    loaders = {}
+    for item in markets:
+        if item not in MARKETS:
+            raise ValueError(f"Bilinmeyen piyasa: {item} (spot | futures)")
+        loaders[f"{exchange}.{item}"] = getattr(adapter, f"{item}_symbols")
+    return loaders
+
+
+def build_matrix(expression: str) -> MembershipMatrix:
+    """İfadede geçen kolonları borsa adapter'larından çekip matrisi kurar."""
+    loaders: Dict[str, Callable[[], Set[str]]] = {}
+    for name in sorted(expression_columns(parse_expression(expression))):
+        try:
+            loaders.update(_column_loaders(name))
+        except KeyError as e:
+            raise ValueError(str(e).strip("'"))
+
+    from symbol_index import get_symbol_index
+
+    # Kolonlar kanonik asset adlarıyla kurulur (1000PEPE == PEPE)
+    index = get_symbol_index()
+    matrix = MembershipMatrix()
+    for name, loader in loaders.items():
+        symbols = loader()
+        if not symbols:
+            print(f"[WARNING] {name} verileri alinamadi, kolon bos")
+        matrix.add_column(name, index.canonical_symbols(name, symbols))
+    index.save()
+    return matrix
+
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Borsa x piyasa uyelik ifadeleri")
+    parser.add_argument("expression", nargs="?", help="Ifade veya hazir rapor adi (--presets)")
+    parser.add_argument("--output", "-o", help="CSV cikti dosyasi")
+    parser.add_argument("--no-mc", action="store_true", help="CoinMarketCap verisi cekme, alfabetik sirala")
+    parser.add_argument("--presets", action="store_true", help="Hazir raporlari listele")
+    args = parser.parse_args(argv)
+
+    if args.presets or not args.expression:
+        for name, expression in PRESET_EXPRESSIONS.items():
+            print(f"{name:<26} {expression}")
+        return 0
+
+    expression = PRESET_EXPRESSIONS.get(args.expression, args.expression)
+    try:
+        matrix = build_matrix(expression)
+        symbols = sorted(matrix.select(expression))
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 2
+
+    marketcaps: Dict[str, float] = {}
+    if symbols and not args.no_mc:
+        from coinmarketcap import fetch_coinmarketcap_data
+        marketcaps = fetch_coinmarketcap_data(symbols)
+
+    # MC azalan, MC'siz olanlar alfabetik
+    rows = sorted(symbols, key=lambda symbol: (symbol not in marketcaps, -marketcaps.get(symbol, 0.0)))
+
+    print("=" * 70)
+    print(expression)
+    print("=" * 70)
+    print(f"{'Sira':<6} {'Coin':<10} {'Market Cap (CMC)':>25}")
+    print("-" * 70)
+    for idx, symbol in enumerate(rows, 1):
+        mc = marketcaps.get(symbol)
+        mc_str = f"${mc:,.0f}" if mc else "N/A"
+        print(f"{idx:<6} {symbol:<10} {mc_str:>25}")
+    columns = ", ".join(f"{name}={bin(bits).count('1')}" for name, bits in sorted(matrix.columns.items()))
+    print(f"\n[OZET] {len(rows)} coin ({columns})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Rank", "Symbol", "MarketCap_USD"])
+            for idx, symbol in enumerate(rows, 1):
+                mc = marketcaps.get(symbol)
+                writer.writerow([idx, symbol, f"{mc:.0f}" if mc else "N/A"])
+        print(f"[OK] CSV dosyasi kaydedildi: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
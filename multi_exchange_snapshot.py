@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Multi-Exchange Perpetual Snapshot
+
+Binance, MEXC ve Bybit USDT perpetual sözleşmelerinin metadata, 24 saatlik
+ticker ve funding bilgilerini paralel çeker, tek bir kayıt şemasına
+dönüştürür ve base asset'e göre birleştirilmiş kolonsal bir snapshot yazar.
+
+Çıktı biçimi:
+    {
+      "generated_at": "...",
+      "venues": ["binance", "mexc", "bybit"],
+      "fields": ["symbol", "status", "lastPrice", ...],
+      "count": <asset sayısı>,
+      "assets": ["BTC", "ETH", ...],
+      "columns": {"binance.lastPrice": [...], "mexc.fundingRate": [...], ...}
+    }
+Bir asset bir borsada yoksa ilgili kolon değeri null'dır.
+
+Kullanım:
+    python3 multi_exchange_snapshot.py --output multi.json
+    python3 multi_exchange_snapshot.py --venues binance,bybit --bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from binance_perpetual_snapshot import (
+    EXCHANGE_INFO_URL,
+    FUNDING_URL,
+    TICKER_24H_URL,
+    fetch_json,
+    get_perpetual_usdt_symbols,
+    map_by_symbol,
+)
+from exchange_adapters import (
+    BYBIT_INSTRUMENTS_URL,
+    BYBIT_TICKERS_URL,
+    MEXC_CONTRACT_BASE,
+    MEXC_CONTRACT_DETAIL_URL,
+)
+from symbol_index import get_symbol_index
+
+MEXC_CONTRACT_TICKER_URL = f"{MEXC_CONTRACT_BASE}/api/v1/contract/ticker"
+
+VENUES = ("binance", "mexc", "bybit")
+
+# Ortak kayıt şeması
+FIELDS = (
+    "symbol",
+    "status",
+    "lastPrice",
+    "priceChangePercent",
+    "highPrice",
+    "lowPrice",
+    "volume",
+    "quoteVolume",
+    "fundingRate",
+    "nextFundingTime",
+    "multiplier",
+)
+
+# Çarpanlı sözleşmelerde (1000PEPE) birim başına çevrilen alanlar
+PER_UNIT_PRICE_FIELDS = ("lastPrice", "highPrice", "lowPrice")
+
+# Borsaya özgü durumlar Binance isimlerine çevrilir
+MEXC_STATES = {0: "TRADING", 1: "DELIVERING", 2: "DELIVERED", 3: "CLOSE", 4: "PAUSED"}
+BYBIT_STATES = {
+    "Trading": "TRADING",
+    "PreLaunch": "PENDING_TRADING",
+    "Settling": "SETTLING",
+    "Delivering": "DELIVERING",
+    "Closed": "CLOSE",
+}
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# VENUE FETCHERS (ham yanıt -> ortak şemada kayıt listesi)
+# ---------------------------------------------------------------------------
+
+def fetch_binance_records(pool: ThreadPoolExecutor) -> List[Dict]:
+    info = pool.submit(fetch_json, EXCHANGE_INFO_URL)
+    tickers = pool.submit(fetch_json, TICKER_24H_URL)
+    funding = pool.submit(fetch_json, FUNDING_URL)
+
+    symbols = get_perpetual_usdt_symbols(info.result())
+    ticker_map = map_by_symbol(tickers.result())
+    funding_map = map_by_symbol(funding.result())
+
+    records = []
+    for symbol, meta in symbols.items():
+        ticker = ticker_map.get(symbol, {})
+        funding_item = funding_map.get(symbol, {})
+        records.append({
+            "base": meta["baseAsset"],
+            "symbol": symbol,
+            "status": meta.get("status"),
+            "lastPrice": _float(ticker.get("lastPrice")),
+            "priceChangePercent": _float(ticker.get("priceChangePercent")),
+            "highPrice": _float(ticker.get("highPrice")),
+            "lowPrice": _float(ticker.get("lowPrice")),
+            "volume": _float(ticker.get("volume")),
+            "quoteVolume": _float(ticker.get("quoteVolume")),
+            "fundingRate": _float(funding_item.get("lastFundingRate")),
+            "nextFundingTime": funding_item.get("nextFundingTime"),
+        })
+    return records
+
+
+def fetch_mexc_records(pool: ThreadPoolExecutor) -> List[Dict]:
+    detail = pool.submit(fetch_json, MEXC_CONTRACT_DETAIL_URL)
+    tickers = pool.submit(fetch_json, MEXC_CONTRACT_TICKER_URL)
+
+    ticker_map = map_by_symbol(tickers.result().get("data") or [])
+    records = []
+    for contract in detail.result().get("data") or []:
+        if contract.get("quoteCoin") != "USDT" or not contract.get("baseCoin"):
+            continue
+        symbol = contract.get("symbol")
+        ticker = ticker_map.get(symbol, {})
+        change = _float(ticker.get("riseFallRate"))
+        records.append({
+            "base": contract["baseCoin"],
+            "symbol": symbol,
+            "status": MEXC_STATES.get(contract.get("state"), str(contract.get("state"))),
+            "lastPrice": _float(ticker.get("lastPrice")),
+            "priceChangePercent": change * 100 if change is not None else None,
+            "highPrice": _float(ticker.get("high24Price")),
+            "lowPrice": _float(ticker.get("lower24Price")),
+            # volume24 sözleşme adedidir; contractSize ile base miktarına çevrilir
+            "volume": (_float(ticker.get("volume24")) or 0.0) * (_float(contract.get("contractSize")) or 0.0)
+            if ticker else None,
+            "quoteVolume": _float(ticker.get("amount24")),
+            "fundingRate": _float(ticker.get("fundingRate")),
+            "nextFundingTime": None,
+        })
+    return records
+
+
+def _fetch_bybit_list(url: str) -> List[Dict]:
+    """Bybit v5 linear listesini sayfalayarak çeker."""
+    items: List[Dict] = []
+    cursor = None
+    while True:
+        params = {"category": "linear", "limit": 1000}
+        if cursor:
+            params["cursor"] = cursor
+        data = fetch_json(url, params)
+        if data.get("retCode") != 0:
+            raise RuntimeError(f"Bybit hatasi: {data.get('retMsg')}")
+        result = data.get("result") or {}
+        items.extend(result.get("list") or [])
+        cursor = result.get("nextPageCursor")
+        if not cursor:
+            return items
+
+
+def fetch_bybit_records(pool: ThreadPoolExecutor) -> List[Dict]:
+    instruments = pool.submit(_fetch_bybit_list, BYBIT_INSTRUMENTS_URL)
+    tickers = pool.submit(_fetch_bybit_list, BYBIT_TICKERS_URL)
+
+    ticker_map = map_by_symbol(tickers.result())
+    records = []
+    for item in instruments.result():
+        if item.get("contractType") != "LinearPerpetual" or item.get("quoteCoin") != "USDT":
+            continue
+        symbol = item.get("symbol")
+        ticker = ticker_map.get(symbol, {})
+        change = _float(ticker.get("price24hPcnt"))
+        next_funding = ticker.get("nextFundingTime")
+        records.append({
+            "base": item.get("baseCoin"),
+            "symbol": symbol,
+            "status": BYBIT_STATES.get(item.get("status"), item.get("status")),
+            "lastPrice": _float(ticker.get("lastPrice")),
+            "priceChangePercent": change * 100 if change is not None else None,
+            "highPrice": _float(ticker.get("highPrice24h")),
+            "lowPrice": _float(ticker.get("lowPrice24h")),
+            "volume": _float(ticker.get("volume24h")),
+            "quoteVolume": _float(ticker.get("turnover24h")),
+            "fundingRate": _float(ticker.get("fundingRate")),
+            "nextFundingTime": int(next_funding) if next_funding else None,
+        })
+    return records
+
+
+VENUE_FETCHERS: Dict[str, Callable[[ThreadPoolExecutor], List[Dict]]] = {
+    "binance": fetch_binance_records,
+    "mexc": fetch_mexc_records,
+    "bybit": fetch_bybit_records,
+}
+
+
+def fetch_all_venues(venues=VENUES) -> Dict[str, List[Dict]]:
+    """Seçili borsaların tüm uç noktalarını aynı havuzda paralel çeker.
+
+    Bir borsa hata verirse diğerleri etkilenmez; o borsa için boş liste döner.
+    """
+    results: Dict[str, List[Dict]] = {}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        with ThreadPoolExecutor(max_workers=len(venues)) as venue_pool:
+            futures = {venue: venue_pool.submit(VENUE_FETCHERS[venue], pool) for venue in venues}
+            for venue, future in futures.items():
+                try:
+                    results[venue] = future.result()
+                except Exception as e:
+                    print(f"[ERROR] {venue} verileri alinamadi: {e}", file=sys.stderr)
+                    results[venue] = []
+    return results
+
+
+# ---------------------------------------------------------------------------
+# JOIN
+# ---------------------------------------------------------------------------
+
+def _per_unit(record: Dict, multiplier: int) -> Dict:
+    record = dict(record, multiplier=multiplier)
+    if multiplier != 1:
+        for field in PER_UNIT_PRICE_FIELDS:
+            if record.get(field) is not None:
+                record[field] = record[field] / multiplier
+        if record.get("volume") is not None:
+            record["volume"] = record["volume"] * multiplier
+    return record
+
+
+def join_by_base(venue_records: Dict[str, List[Dict]]) -> Dict:
+    """Borsa kayıtlarını base asset'e göre tek kolonsal tabloda birleştirir.
+
+    Base asset'ler sembol indeksiyle kanonik asset ID'sine eşlenir (1000PEPE ve
+    PEPE aynı satıra düşer); çarpanlı sözleşmelerin fiyatları birim başına,
+    hacimleri birim adedine çevrilir. Bir borsada aynı asset için birden fazla
+    sözleşme varsa en yüksek quoteVolume'lü olan seçilir.
+    """
+    index = get_symbol_index()
+    venues = list(venue_records)
+    chosen: Dict[str, Dict[int, Dict]] = {venue: {} for venue in venues}
+    for venue, records in venue_records.items():
+        picked = chosen[venue]
+        for record in records:
+            base = (record.get("base") or "").upper()
+            if not base:
+                continue
+            asset_id, multiplier = index.resolve(f"{venue}.futures", base)
+            current = picked.get(asset_id)
+            if current is None or (record.get("quoteVolume") or 0) > (current.get("quoteVolume") or 0):
+                picked[asset_id] = _per_unit(record, multiplier)
+    index.save()
+
+    asset_ids = sorted(set().union(*(picked.keys() for picked in chosen.values())), key=index.canonical)
+    assets = [index.canonical(asset_id) for asset_id in asset_ids]
+    columns: Dict[str, List] = {}
+    for venue in venues:
+        picked = chosen[venue]
+        rows = [picked.get(asset_id) for asset_id in asset_ids]
+        for field in FIELDS:
+            columns[f"{venue}.{field}"] = [row.get(field) if row else None for row in rows]
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "venues": venues,
+        "fields": list(FIELDS),
+        "count": len(assets),
+        "assets": assets,
+        "columns": columns,
+    }
+
+
+def build_multi_snapshot(venues=VENUES) -> Dict:
+    return join_by_base(fetch_all_venues(venues))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Binance + MEXC + Bybit perpetual snapshot")
+    parser.add_argument("--output", "-o", help="JSON çıktısı (boş bırakılırsa stdout)")
+    parser.add_argument("--venues", default=",".join(VENUES), help="Virgülle ayrılmış borsa listesi")
+    parser.add_argument("--pretty", action="store_true", help="Girintili JSON yaz")
+    parser.add_argument("--bench", action="store_true", help="Çekme ve birleştirme sürelerini stderr'e raporla")
+    args = parser.parse_args(argv)
+
+    venues = [venue.strip() for venue in args.venues.split(",") if venue.strip()]
+    unknown = [venue for venue in venues if venue not in VENUE_FETCHERS]
+    if unknown:
+        parser.error(f"bilinmeyen borsa: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    venue_records = fetch_all_venues(venues)
+    fetched = time.perf_counter()
+    snapshot = join_by_base(venue_records)
+    joined = time.perf_counter()
+
+    if args.pretty:
+        text = json.dumps(snapshot, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":"))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(text)
+    else:
+        print(text)
+
+    if args.bench:
+        sizes = ", ".join(f"{venue}={len(records)}" for venue, records in venue_records.items())
+        print(
+            f"[BENCH] fetch={fetched - started:.3f}s join={joined - fetched:.3f}s "
+            f"assets={snapshot['count']} ({sizes}) bytes={len(text.encode('utf-8'))}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
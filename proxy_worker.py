@@ -15,18 +15,46 @@ Ortam değişkenleri:
     DASHBOARD_URL   -> Varsayılan https://crypto-dashboard-uh1e.onrender.com
     WORKER_INTERVAL -> Döngüler arası saniye (varsayılan 3600)
     WORKER_ONCE     -> "1" ise sadece bir kez çalışır.
+    WORKER_SOURCES  -> Gönderilecek kaynaklar (varsayılan "binance": sunucu
+                       DISABLE_SERVER_BINANCE=1 ile Binance'i çekmez, MEXC'i
+                       kendisi çeker; örn. Bybit için ikinci bir worker "bybit").
+                       Her kaynağın tek yayıncısı olmalı: worker'ın gönderdiği
+                       kaynağı sunucu SOURCE_STALE_SECONDS boyunca çekmez.
+    WORKER_HEARTBEAT-> Hiçbir kaynak değişmese de en geç bu kadar saniyede bir
+                       tazelik bildirimi gönderilir (varsayılan 1800)
+    WORKER_QUEUE_DIR-> Gönderilemeyen payload'ların tutulduğu klasör
+                       (varsayılan .worker_queue)
+    WORKER_QUEUE_MAX-> Kuyrukta tutulacak en fazla payload (varsayılan 20)
+    WORKER_RETRY_BASE / WORKER_RETRY_MAX
+                    -> Gönderim tekrarları için üstel bekleme tabanı ve üst
+                       sınırı, saniye (varsayılan 5 / 300)
+
+Gönderim kaynak başınadır: içerik özeti (versiyon) değişmeyen kaynak için
+sadece küçük bir "touch" bildirimi, son kabul edilen versiyon biliniyorsa
+satır bazlı delta, sunucu resync isterse tam veri (gzip) gönderilir.
+
+Veri çekme ile gönderim birbirinden ayrıdır: hazırlanan payload önce diskteki
+kuyruğa yazılır, dashboard erişilemezken (örn. Render cold start) jitter'lı
+üstel bekleme ile yeniden denenir ve MEXC/Binance/CMC çağrıları tekrarlanmaz.
+Kuyruk birikirse kaynak başına yalnızca en yeni veri gönderilir.
 """
 
 import os
 import sys
+import gzip
+import json
+import random
 import time
 import requests
 from datetime import datetime
 
+from async_ingest import warm_exchange_cache
 from crypto_web_dashboard import (
-    process_mexc,
-    process_binance
+    data_digest,
+    diff_rows,
+    process_mexc
 )
+from exchange_adapters import fetch_cache, get_adapter
 
 
 def _ensure_utf8_stdio():
@@ -46,63 +74,246 @@ DASHBOARD_URL = os.environ.get('DASHBOARD_URL', 'https://crypto-dashboard-uh1e.o
 WORKER_SECRET = os.environ.get('WORKER_SECRET')
 WORKER_INTERVAL = int(os.environ.get('WORKER_INTERVAL', '3600'))
 RUN_ONCE = os.environ.get('WORKER_ONCE', '0') == '1'
+WORKER_SOURCES = [name.strip() for name in os.environ.get('WORKER_SOURCES', 'binance').split(',') if name.strip()]
+WORKER_HEARTBEAT = int(os.environ.get('WORKER_HEARTBEAT', '1800'))
+
+# Vadeli coin listesi olarak gönderilen kaynaklar (exchange_adapters kayıt adları)
+SYMBOL_SOURCES = ('binance', 'bybit')
+
+WORKER_QUEUE_DIR = os.environ.get('WORKER_QUEUE_DIR', '.worker_queue')
+WORKER_QUEUE_MAX = int(os.environ.get('WORKER_QUEUE_MAX', '20'))
+WORKER_RETRY_BASE = float(os.environ.get('WORKER_RETRY_BASE', '5'))
+WORKER_RETRY_MAX = float(os.environ.get('WORKER_RETRY_MAX', '300'))
+
+# Payload hazırlanamazsa yeniden denemeden önce beklenen süre
+BUILD_RETRY_SECONDS = 300
+
+# Bu boyutun üzerindeki gövdeler gzip ile sıkıştırılır
+GZIP_MIN_BYTES = 1024
+
+# Kaynak başına sunucunun son kabul ettiği versiyon ve o versiyondaki veri
+sync_state = {}
+last_push = {'at': 0.0}
+
+
+def _post_body(url, body):
+    """Gövdeyi JSON (gerekirse gzip) olarak gönderir; gönderilen bayt sayısını da döndürür."""
+    headers = {'X-Worker-Secret': WORKER_SECRET, 'Content-Type': 'application/json'}
+    data = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if len(data) >= GZIP_MIN_BYTES:
+        data = gzip.compress(data)
+        headers['Content-Encoding'] = 'gzip'
+    response = requests.post(url, data=data, headers=headers, timeout=30)
+    response.raise_for_status()
+    return response.json(), len(data)
+
+
+def _source_update(name, data, fetched_at, full=False):
+    """Kaynak için touch, delta veya tam güncelleme gövdesi hazırlar."""
+    version = data_digest(data)
+    state = sync_state.get(name)
+    if state is None or full:
+        return {'mode': 'full', 'version': version, 'data': data, 'fetched_at': fetched_at}
+    if state['version'] == version:
+        return {'mode': 'touch', 'version': version, 'fetched_at': fetched_at}
+    return {
+        'mode': 'delta',
+        'base_version': state['version'],
+        'version': version,
+        'delta': diff_rows(state['data'], data),
+        'fetched_at': fetched_at
+    }
+
+
+def _send_updates(url, updates, sources):
+    """Güncellemeleri gönderir; kabul edilenleri kaydeder, resync isteyenleri döndürür."""
+    result, size = _post_body(url, {'sources': updates})
+    resync = []
+    for name, item in result.get('sources', {}).items():
+        status = item.get('status')
+        if status == 'ok':
+            sync_state[name] = {'version': updates[name]['version'], 'data': sources[name]}
+        elif status == 'resync':
+            sync_state.pop(name, None)
+            resync.append(name)
+        else:
+            print(f"[WORKER][WARNING] {name} reddedildi: {item.get('error')}")
+
+    modes = ', '.join(f"{name}={update['mode']}" for name, update in updates.items())
+    print(f"[WORKER] Gönderildi ({size} bayt; {modes}) -> {url}")
+    if result.get('stale_sources'):
+        print(f"[WORKER] Sunucuda eski (stale) kaynaklar: {', '.join(result['stale_sources'])}")
+    return resync
 
 
 def push_payload(payload):
-    """Dashboard API'sine payload gönder."""
+    """Dashboard API'sine kaynak bazlı güncellemeleri gönder."""
     url = DASHBOARD_URL.rstrip('/') + '/api/worker/update'
-    headers = {'X-Worker-Secret': WORKER_SECRET}
-    response = requests.post(url, json=payload, headers=headers, timeout=30)
-    response.raise_for_status()
-    print(f"[WORKER] Payload gönderildi -> {url}")
+    sources = payload['sources']
+    fetched_at = payload.get('fetched_at') or {}
+
+    updates = {name: _source_update(name, data, fetched_at.get(name)) for name, data in sources.items()}
+    unchanged = all(update['mode'] == 'touch' for update in updates.values())
+    if unchanged and time.time() - last_push['at'] < WORKER_HEARTBEAT:
+        print("[WORKER] Veri degismedi, gonderim atlandi")
+        return
+
+    resync = _send_updates(url, updates, sources)
+    if resync:
+        print(f"[WORKER] Sunucu resync istedi ({', '.join(resync)}), tam veri gonderiliyor...")
+        full = {name: _source_update(name, sources[name], fetched_at.get(name), full=True) for name in resync}
+        _send_updates(url, full, sources)
+    last_push['at'] = time.time()
 
 
 def build_payload():
-    """MEXC + Binance verilerini hazırla."""
-    mexc_futures_coins, mexc_positions_map, mexc_list = process_mexc()
-    if mexc_futures_coins is None or mexc_positions_map is None:
-        raise RuntimeError("MEXC verileri alınamadı, worker durdu.")
-
-    binance_list = process_binance(mexc_futures_coins, mexc_positions_map) or []
-
-    payload = {
-        'secret': WORKER_SECRET,
-        'mexc_list': mexc_list,
-        'binance_list': binance_list,
-        'stats': {
-            'mexc_count': len(mexc_list),
-            'binance_count': len(binance_list)
-        },
-        'last_update': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+    """WORKER_SOURCES içindeki kaynakların verilerini hazırla."""
+    sources = {}
+    fetch_cache.clear()
+    warm_exchange_cache([name for name in ('mexc',) + SYMBOL_SOURCES if name in WORKER_SOURCES])
+
+    if 'mexc' in WORKER_SOURCES:
+        mexc_futures_coins, mexc_positions_map, mexc_list = process_mexc()
+        if mexc_futures_coins is None or mexc_positions_map is None:
+            raise RuntimeError("MEXC verileri alınamadı, worker durdu.")
+        sources['mexc'] = mexc_list
+
+    for name in SYMBOL_SOURCES:
+        if name not in WORKER_SOURCES:
+            continue
+        symbols = get_adapter(name).futures_symbols()
+        if symbols:
+            sources[name] = sorted(symbols)
+        else:
+            # Boş liste yayınlamak yerine sunucudaki son veri korunur
+            print(f"[WORKER][WARNING] {name} verileri alinamadi, bu turda gonderilmiyor")
+
+    if not sources:
+        raise RuntimeError("Hiçbir kaynak verisi alınamadı.")
+
+    fetched_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+    return {
+        'sources': sources,
+        'fetched_at': {name: fetched_at for name in sources}
     }
-    return payload
+
+
+# ---------------------------------------------------------------------------
+# OUTBOUND QUEUE
+# ---------------------------------------------------------------------------
+
+def enqueue_payload(payload):
+    """Payload'ı diskteki kuyruğa atomik olarak yazar; kuyruk sınırını korur."""
+    os.makedirs(WORKER_QUEUE_DIR, exist_ok=True)
+    path = os.path.join(WORKER_QUEUE_DIR, f"{time.time_ns():020d}.json.gz")
+    _write_entry(path, payload)
+
+    # Sınır aşılırsa kuyruk tek kayda sıkıştırılır (kaynak başına en yeni veri)
+    entries = pending_entries()
+    if len(entries) > WORKER_QUEUE_MAX:
+        _write_entry(path, coalesce_entries(entries))
+        for old in entries[:-1]:
+            os.remove(old)
+    return path
+
+
+def _write_entry(path, payload):
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as fp:
+        json.dump(payload, fp, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def pending_entries():
+    """Kuyruktaki payload dosyalarını eskiden yeniye döndürür."""
+    if not os.path.isdir(WORKER_QUEUE_DIR):
+        return []
+    names = sorted(name for name in os.listdir(WORKER_QUEUE_DIR) if name.endswith('.json.gz'))
+    return [os.path.join(WORKER_QUEUE_DIR, name) for name in names]
+
+
+def coalesce_entries(paths):
+    """Kuyruktaki payload'ları birleştirir: her kaynak için en yeni veri kalır."""
+    sources = {}
+    fetched_at = {}
+    for path in paths:
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as fp:
+                payload = json.load(fp)
+        except (OSError, ValueError, EOFError) as exc:
+            print(f"[WORKER][WARNING] Bozuk kuyruk kaydi atlandi ({path}): {exc}")
+            continue
+        sources.update(payload.get('sources') or {})
+        fetched_at.update(payload.get('fetched_at') or {})
+    return {'sources': sources, 'fetched_at': fetched_at}
+
+
+def deliver_pending():
+    """Kuyruğu tek gönderimde boşaltır; hata olursa kayıtlar kuyrukta kalır."""
+    paths = pending_entries()
+    if not paths:
+        return False
+    if len(paths) > 1:
+        print(f"[WORKER] Kuyrukta {len(paths)} payload var, en yeni veriler birlestiriliyor")
+
+    payload = coalesce_entries(paths)
+    if payload['sources']:
+        push_payload(payload)
+    for path in paths:
+        os.remove(path)
+    return True
+
+
+def retry_delay(attempt):
+    """Jitter'lı üstel bekleme süresi (full jitter)."""
+    return random.uniform(0, min(WORKER_RETRY_MAX, WORKER_RETRY_BASE * (2 ** attempt)))
 
 
 def run_once():
-    payload = build_payload()
-    push_payload(payload)
+    enqueue_payload(build_payload())
+    deliver_pending()
 
 
 def main():
     if not WORKER_SECRET:
         raise SystemExit("WORKER_SECRET tanımlanmadan worker çalıştırılamaz.")
 
+    if RUN_ONCE:
+        run_once()
+        return
+
+    # Önceki çalışmadan kalan kayıtlar ilk gönderimde yeni veriyle birleştirilir
+    next_build = time.time()
+    next_delivery = time.time()
+    attempt = 0
+
     while True:
-        try:
-            run_once()
-        except Exception as exc:
-            print(f"[WORKER][ERROR] {exc}")
-            if RUN_ONCE:
-                raise
-            # hata sonrası 5 dk bekle
-            time.sleep(300)
-            continue
+        now = time.time()
 
-        if RUN_ONCE:
-            break
+        if now >= next_build:
+            try:
+                enqueue_payload(build_payload())
+                next_build = now + WORKER_INTERVAL
+                next_delivery = now
+                print(f"[WORKER] {WORKER_INTERVAL} saniye sonra yeniden veri cekilecek...")
+            except Exception as exc:
+                print(f"[WORKER][ERROR] {exc}")
+                next_build = now + BUILD_RETRY_SECONDS
+
+        if pending_entries() and now >= next_delivery:
+            try:
+                deliver_pending()
+                attempt = 0
+            except Exception as exc:
+                delay = retry_delay(attempt)
+                attempt += 1
+                next_delivery = now + delay
+                print(f"[WORKER][ERROR] Gonderim basarisiz ({exc}); {delay:.0f} sn sonra tekrar denenecek")
 
-        print(f"[WORKER] {WORKER_INTERVAL} saniye sonra yeniden çalışacak...")
-        time.sleep(WORKER_INTERVAL)
+        wake_at = next_build
+        if pending_entries():
+            wake_at = min(wake_at, next_delivery)
+        time.sleep(max(1.0, wake_at - time.time()))
 
 
 if __name__ == '__main__':
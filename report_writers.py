@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Report Writers
+
+Liste scriptlerinin konsol/CSV/TXT/Markdown çıktıları için tek geçişli
+rapor hattı. Her satır bir kez biçimlendirilir ve ReportSink üzerinden
+seçilen tüm yazıcılara dağıtılır:
+
+    layout = TableLayout("BASLIK", 70, [("Sira", "<6"), ("Coin", "<10"), ("Market Cap (CMC)", ">25")])
+    with ReportSink(layout, [TextReportWriter(sys.stdout), CsvReportWriter("x.csv", "Rank,Symbol")]) as sink:
+        for idx, symbol in enumerate(symbols, 1):
+            sink.row((idx, symbol, mc_str), csv=(idx, symbol))
+        sink.finish(["Toplam: 3"])
+
+Dosyalar büyük tamponla geçici dosyaya yazılır ve başarıyla kapanınca
+atomik olarak yerine taşınır; yarım kalmış dosya görünmez. İçerik özeti
+(SHA-256) mevcut dosyayla aynıysa dosyaya dokunulmaz; değişen dosyalar
+pop_changed_paths() ile alınır (--watch modu). Bir yazıcı hata
+verirse uyarı basılır, diğer yazıcılar devam eder. Birleşik TXT
+(CombinedReport) bölümleri bellekte toplar ve tek seferde yazar; dosyalar
+geri okunmaz. Parquet/Arrow yazıcısı columnar_export modülündedir.
+"""
+
+import hashlib
+import io
+import os
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple, Union
+
+WRITE_BUFFER_SIZE = 1 << 16
+
+# path -> ((mtime_ns, boyut), sha256) son yazılan/okunan içerik
+_digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_changed_paths: List[str] = []
+_digest_lock = Lock()
+
+
+def _file_digest(path: str) -> Optional[str]:
+    """Mevcut dosyanın içerik özeti; dosya değişmediyse önbellekten."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _digests.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(WRITE_BUFFER_SIZE), b""):
+            digest.update(chunk)
+    _digests[path] = (signature, digest.hexdigest())
+    return _digests[path][1]
+
+
+def replace_if_changed(tmp_path: str, path: str, digest: str) -> bool:
+    """Geçici dosyayı içerik farklıysa yerine taşır, aynıysa siler."""
+    with _digest_lock:
+        if digest == _file_digest(path):
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, path)
+        stat = os.stat(path)
+        _digests[path] = ((stat.st_mtime_ns, stat.st_size), digest)
+        _changed_paths.append(path)
+        return True
+
+
+def pop_changed_paths() -> List[str]:
+    """Son çağrıdan bu yana içeriği değişen dosyalar."""
+    with _digest_lock:
+        paths = list(_changed_paths)
+        _changed_paths.clear()
+    return paths
+
+
+class TableLayout:
+    """Sabit genişlikli tablo: başlık, çizgi genişliği ve kolon biçimleri."""
+
+    def __init__(self, title: str, width: int, columns: Sequence[Tuple[str, str]]):
+        self.title = title
+        self.width = width
+        self.row_format = " ".join("{:%s}" % spec for _, spec in columns)
+        self.header = self.row_format.format(*(name for name, _ in columns))
+
+    def format_row(self, cells: Sequence) -> str:
+        return self.row_format.format(*cells)
+
+
+# ---------------------------------------------------------------------------
+# WRITERS
+# ---------------------------------------------------------------------------
+
+class ReportWriter:
+    """Yazıcı arayüzü. Dosya yazıcıları geçici dosyaya yazar, close() ile taşır."""
+
+    label = ""
+
+    def __init__(self, target: Union[str, TextIO]):
+        self.path: Optional[str] = target if isinstance(target, str) else None
+        self._fp: Optional[TextIO] = None if self.path else target
+        self._digest = hashlib.sha256() if self.path else None
+        self.changed = False
+
+    @property
+    def fp(self) -> TextIO:
+        if self._fp is None:
+            self._fp = open(self.path + ".tmp", "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE)
+        return self._fp
+
+    def write(self, text: str) -> None:
+        self.fp.write(text)
+        if self._digest is not None:
+            self._digest.update(text.encode("utf-8"))
+
+    def begin(self, layout: TableLayout) -> None:
+        pass
+
+    def row(self, line: str, cells: Sequence, csv_line: str, values: Sequence) -> None:
+        pass
+
+    def end(self, layout: TableLayout, summary: Sequence[str]) -> None:
+        pass
+
+    def close(self) -> None:
+        if self.path and self._fp is not None:
+            self._fp.close()
+            self.changed = replace_if_changed(self.path + ".tmp", self.path, self._digest.hexdigest())
+        elif self._fp is not None:
+            self._fp.flush()
+
+    def abort(self) -> None:
+        if self.path and self._fp is not None:
+            self._fp.close()
+            try:
+                os.remove(self.path + ".tmp")
+            except OSError:
+                pass
+
+
+class TextReportWriter(ReportWriter):
+    """Sabit genişlikli tablo (konsol veya TXT).
+
+    limit: yalnızca ilk N satırı yazar, kalanı "... ve N coin daha ..." olarak özetler.
+    leading_newline: başlıktan önce boş satır (konsol çıktısı için).
+    summary: finish() özet satırlarını yazar.
+    """
+
+    label = "TXT"
+
+    def __init__(self, target: Union[str, TextIO], limit: Optional[int] = None,
+                 leading_newline: bool = False, summary: bool = True):
+        super().__init__(target)
+        self.limit = limit
+        self.leading_newline = leading_newline
+        self.summary = summary
+        self.count = 0
+
+    def begin(self, layout: TableLayout) -> None:
+        rule = "=" * layout.width
+        prefix = "\n" if self.leading_newline else ""
+        self.write(f"{prefix}{rule}\n{layout.title}\n{rule}\n{layout.header}\n{'-' * layout.width}\n")
+
+    def row(self, line: str, cells: Sequence, csv_line: str, values: Sequence) -> None:
+        self.count += 1
+        if self.limit is None or self.count <= self.limit:
+            self.write(line + "\n")
+
+    def end(self, layout: TableLayout, summary: Sequence[str]) -> None:
+        if self.limit is not None and self.count > self.limit:
+            self.write(f"... ve {self.count - self.limit} coin daha ...\n")
+        if self.summary and summary:
+            self.write("\n" + "=" * layout.width + "\n")
+            self.write("".join(line + "\n" for line in summary))
+
+
+class CsvReportWriter(ReportWriter):
+    label = "CSV"
+
+    def __init__(self, target: Union[str, TextIO], header: str):
+        super().__init__(target)
+        self.header = header
+
+    def begin(self, layout: TableLayout) -> None:
+        self.write(self.header + "\n")
+
+    def row(self, line: str, cells: Sequence, csv_line: str, values: Sequence) -> None:
+        self.write(csv_line + "\n")
+
+
+class MarkdownReportWriter(ReportWriter):
+    label = "Markdown"
+
+    def __init__(self, target: Union[str, TextIO], heading: str, headers: Sequence[str], separator: str):
+        super().__init__(target)
+        self.heading = heading
+        self.headers = headers
+        self.separator = separator
+
+    def begin(self, layout: TableLayout) -> None:
+        self.write(f"# {self.heading}\n\n| {' | '.join(self.headers)} |\n{self.separator}\n")
+
+    def row(self, line: str, cells: Sequence, csv_line: str, values: Sequence) -> None:
+        self.write("| " + " | ".join(str(cell) for cell in cells) + " |\n")
+
+
+class CombinedReport:
+    """Birden çok raporu tek TXT dosyasında sırasıyla birleştirir.
+
+    Her rapor section(sıra) ile bir yazıcı alır; bölümler paralel üretilebilir,
+    dosya write() çağrısında sıra numarasına göre tek seferde yazılır.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sections: Dict[int, io.StringIO] = {}
+
+    def section(self, order: int) -> TextReportWriter:
+        buffer = io.StringIO()
+        self.sections[order] = buffer
+        writer = TextReportWriter(buffer)
+        writer.label = "Tek TXT"
+        return writer
+
+    def write(self) -> bool:
+        """Dosyayı yazar; içerik değiştiyse True."""
+        text = "\n\n".join(self.sections[order].getvalue() for order in sorted(self.sections))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as fp:
+            fp.write(text)
+        return replace_if_changed(tmp_path, self.path, hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+
+# ---------------------------------------------------------------------------
+# SINK
+# ---------------------------------------------------------------------------
+
+class ReportSink:
+    """Satırları bir kez biçimlendirip tüm yazıcılara dağıtır."""
+
+    def __init__(self, layout: TableLayout, writers: Sequence[ReportWriter]):
+        self.layout = layout
+        self.writers: List[ReportWriter] = list(writers)
+        self.completed: List[ReportWriter] = []
+        self.finished = False
+
+    def _each(self, method: str, *args) -> None:
+        for writer in list(self.writers):
+            try:
+                getattr(writer, method)(*args)
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] {writer.label} kayit hatasi: {e}")
+                writer.abort()
+                self.writers.remove(writer)
+
+    def __enter__(self) -> "ReportSink":
+        self._each("begin", self.layout)
+        return self
+
+    def row(self, cells: Sequence, csv: Sequence = (), values: Sequence = ()) -> None:
+        """cells: tablo hücreleri, csv: CSV alanları, values: tipli ham değerler (kolonsal)."""
+        line = self.layout.format_row(cells)
+        csv_line = ",".join(str(value) for value in csv)
+        self._each("row", line, cells, csv_line, values)
+
+    def finish(self, summary: Sequence[str] = ()) -> List[ReportWriter]:
+        """Özetleri yazar ve dosyaları yerine taşır; başarılı yazıcıları döndürür."""
+        if not self.finished:
+            self.finished = True
+            self._each("end", self.layout, summary)
+            self._each("close")
+            self.completed = list(self.writers)
+        return self.completed
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            for writer in self.writers:
+                writer.abort()
+            self.writers = []
+            return
+        self.finish()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Perpetual Snapshot Analytics
+
+snapshot_store geçmişini NumPy matrislerine (zaman x sembol) yükler ve
+funding / hacim analizlerini vektörel olarak hesaplar:
+    - sembol başına funding'in kayan ortalaması ve z-skoru
+    - kesitsel (aynı andaki semboller arası) yüzdelik sıra
+    - yıllıklandırılmış funding taşıma getirisi (carry)
+    - hacim ağırlıklı kesitsel aykırı değerler
+
+İlk K sonuç tam sıralama yerine argpartition ile seçilir.
+
+Kullanım:
+    python3 snapshot_analytics.py DIR --since 2025-11-01 --window 21 --top 10
+    python3 snapshot_analytics.py --bench --symbols 600 --snapshots 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from snapshot_store import SnapshotStore, record_value
+
+ANALYTICS_FIELDS = ("fundingRate", "quoteVolume", "lastPrice", "priceChangePercent")
+
+# Binance USDT-M funding çoğunlukla 8 saatte bir (günde 3 kez) ödenir
+DEFAULT_FUNDINGS_PER_DAY = 3.0
+
+
+class SnapshotMatrix:
+    """Snapshot geçmişinin kolonsal hali: her alan için (zaman, sembol) matrisi."""
+
+    def __init__(self, symbols: List[str], ts: np.ndarray, fields: Dict[str, np.ndarray]):
+        self.symbols = symbols
+        self.ts = ts
+        self.fields = fields
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+
+def load_matrix(store: SnapshotStore, start=None, end=None,
+                fields: Sequence[str] = ANALYTICS_FIELDS) -> SnapshotMatrix:
+    """Depodaki aralığı (T, S) float64 matrislere yükler; eksik değerler NaN'dir."""
+    timestamps = store.timestamps(start, end)
+    n_time = len(timestamps)
+    columns: Dict[str, int] = {}
+    symbols: List[str] = []
+    data = {field: np.full((n_time, max(len(store.symbols), 1)), np.nan) for field in fields}
+
+    index_cache: Tuple[Optional[List[str]], Optional[np.ndarray]] = (None, None)
+    ts = np.empty(n_time, dtype=np.int64)
+    for row, (block_ts, block_symbols, block_columns) in enumerate(store.iter_blocks(start, end, fields)):
+        if index_cache[0] is not block_symbols:
+            for symbol in block_symbols:
+                if symbol not in columns:
+                    columns[symbol] = len(symbols)
+                    symbols.append(symbol)
+            index_cache = (block_symbols, np.fromiter((columns[s] for s in block_symbols), dtype=np.intp))
+        ts[row] = block_ts
+        for field in fields:
+            data[field][row, index_cache[1]] = np.frombuffer(block_columns[field], dtype=np.float64)
+
+    return SnapshotMatrix(symbols, ts, {field: data[field][:, :len(symbols)] for field in fields})
+
+
+def matrix_from_snapshots(snapshots: Iterable[Dict],
+                          fields: Sequence[str] = ANALYTICS_FIELDS) -> SnapshotMatrix:
+    """build_snapshot biçimindeki snapshot listesinden matris oluşturur."""
+    snapshots = list(snapshots)
+    symbols = sorted({record["symbol"] for snap in snapshots for record in snap.get("symbols", [])})
+    columns = {symbol: idx for idx, symbol in enumerate(symbols)}
+    data = {field: np.full((len(snapshots), len(symbols)), np.nan) for field in fields}
+    ts = np.arange(len(snapshots), dtype=np.int64)
+    for row, snap in enumerate(snapshots):
+        for record in snap.get("symbols", []):
+            col = columns[record["symbol"]]
+            for field in fields:
+                data[field][row, col] = record_value(record, field)
+    return SnapshotMatrix(symbols, ts, data)
+
+
+# ---------------------------------------------------------------------------
+# VEKTOREL HESAPLAR
+# ---------------------------------------------------------------------------
+
+def _rolling_sums(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Zaman ekseninde kayan toplam, kare toplamı ve geçerli değer sayısı."""
+    valid = ~np.isnan(x)
+    filled = np.where(valid, x, 0.0)
+    sums = np.cumsum(filled, axis=0)
+    squares = np.cumsum(filled * filled, axis=0)
+    counts = np.cumsum(valid, axis=0, dtype=np.float64)
+    for arr in (sums, squares, counts):
+        arr[window:] = arr[window:] - arr[:-window]
+    return sums, squares, counts
+
+
+def rolling_mean(x: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Sembol başına kayan ortalama (NaN'ler atlanır)."""
+    min_periods = window if min_periods is None else min_periods
+    sums, _, counts = _rolling_sums(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / counts
+    mean[counts < min_periods] = np.nan
+    return mean
+
+
+def rolling_zscore(x: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Sembol başına, kayan pencereye göre z-skoru."""
+    min_periods = window if min_periods is None else min_periods
+    sums, squares, counts = _rolling_sums(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / counts
+        var = np.maximum(squares / counts - mean * mean, 0.0)
+        std = np.sqrt(var)
+        z = (x - mean) / std
+    z[(counts < min_periods) | (std == 0)] = np.nan
+    return z
+
+
+def cross_sectional_rank(x: np.ndarray) -> np.ndarray:
+    """Her zaman satırında semboller arası yüzdelik sıra (0 = en düşük, 1 = en yüksek)."""
+    order = np.argsort(x, axis=1, kind="stable")  # NaN'ler sona düşer
+    ranks = np.empty_like(x)
+    rows = np.arange(x.shape[0])[:, None]
+    ranks[rows, order] = np.arange(x.shape[1], dtype=np.float64)
+    valid = ~np.isnan(x)
+    n_valid = valid.sum(axis=1, keepdims=True)
+    pct = ranks / np.maximum(n_valid - 1, 1)
+    pct[~valid] = np.nan
+    return pct
+
+
+def annualized_carry(funding: np.ndarray, window: int,
+                     fundings_per_day: float = DEFAULT_FUNDINGS_PER_DAY) -> np.ndarray:
+    """Kayan ortalama funding'den yıllık taşıma getirisi (long pozisyon öder, pozitif = short kazanır)."""
+    return rolling_mean(funding, window, min_periods=1) * fundings_per_day * 365.0
+
+
+def volume_weighted_outliers(values: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Son satırdaki değerlerin hacim ağırlıklı kesitsel z-skoru.
+
+    Ortalama ve standart sapma quoteVolume ağırlıklı hesaplanır; böylece
+    likit semboller dağılımın merkezini belirler, düşük hacimli uçlar
+    aykırı değer olarak öne çıkar.
+    """
+    valid = ~np.isnan(values) & ~np.isnan(volume) & (volume > 0)
+    if not valid.any():
+        return np.full(values.shape, np.nan)
+    weights = np.where(valid, volume, 0.0)
+    filled = np.where(valid, values, 0.0)
+    total = weights.sum()
+    mean = (weights * filled).sum() / total
+    std = np.sqrt((weights * (filled - mean) ** 2).sum() / total)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (values - mean) / std
+    z[~valid] = np.nan
+    return z
+
+
+def top_k(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """NaN olmayan değerlerden ilk K'nın indekslerini (sıralı) döndürür.
+
+    Tam sıralama yerine argpartition kullanır: O(S + K log K).
+    """
+    key = -values if largest else values
+    key = np.where(np.isnan(key), np.inf, key)
+    k = min(k, int((~np.isnan(values)).sum()))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(key, k - 1)[:k]
+    return idx[np.argsort(key[idx], kind="stable")]
+
+
+# ---------------------------------------------------------------------------
+# RAPOR
+# ---------------------------------------------------------------------------
+
+def build_report(matrix: SnapshotMatrix, window: int = 21, k: int = 10,
+                 fundings_per_day: float = DEFAULT_FUNDINGS_PER_DAY) -> Dict[str, List[Tuple[str, float]]]:
+    """Son snapshot için ilk K listelerini hesaplar."""
+    funding = matrix["fundingRate"]
+    volume = matrix["quoteVolume"]
+    last = -1
+
+    z = rolling_zscore(funding, window, min_periods=max(2, window // 2))[last]
+    carry = annualized_carry(funding, window, fundings_per_day)[last]
+    volume_rank = cross_sectional_rank(volume[last:])[0]
+    outliers = np.abs(volume_weighted_outliers(funding[last], volume[last]))
+
+    def pick(values: np.ndarray, largest: bool = True) -> List[Tuple[str, float]]:
+        return [(matrix.symbols[i], float(values[i])) for i in top_k(values, k, largest)]
+
+    return {
+        "funding_zscore_high": pick(z),
+        "funding_zscore_low": pick(z, largest=False),
+        "carry_high": pick(carry),
+        "carry_low": pick(carry, largest=False),
+        "volume_rank_high": pick(volume_rank),
+        "funding_vw_outliers": pick(outliers),
+    }
+
+
+def print_report(report: Dict[str, List[Tuple[str, float]]]) -> None:
+    for title, rows in report.items():
+        print("\n" + "=" * 50)
+        print(title.upper())
+        print("=" * 50)
+        for idx, (symbol, value) in enumerate(rows, 1):
+            print(f"{idx:<4} {symbol:<18} {value:>16.6f}")
+
+
+def run_benchmark(n_symbols: int, n_snapshots: int, window: int, k: int, seed: int = 7) -> Dict[str, float]:
+    """Sentetik veriyle her hesabın süresini ölçer."""
+    rng = np.random.default_rng(seed)
+    funding = rng.normal(0.0001, 0.0003, size=(n_snapshots, n_symbols))
+    volume = rng.lognormal(15, 2, size=(n_snapshots, n_symbols))
+    funding[rng.random(funding.shape) < 0.01] = np.nan
+
+    timings: Dict[str, float] = {}
+
+    def timed(name, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings[name] = time.perf_counter() - started
+        return result
+
+    timed("rolling_mean", rolling_mean, funding, window)
+    timed("rolling_zscore", rolling_zscore, funding, window)
+    timed("cross_sectional_rank", cross_sectional_rank, volume)
+    carry = timed("annualized_carry", annualized_carry, funding, window)
+    timed("volume_weighted_outliers", volume_weighted_outliers, funding[-1], volume[-1])
+    timed("top_k(argpartition)", top_k, carry[-1], k)
+    timed("full_sort (karsilastirma)", np.argsort, -carry[-1])
+    return timings
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Perpetual snapshot analizleri")
+    parser.add_argument("store", nargs="?", help="snapshot_store dizini")
+    parser.add_argument("--since", help="Başlangıç (ISO tarih veya epoch)")
+    parser.add_argument("--until", help="Bitiş (ISO tarih veya epoch)")
+    parser.add_argument("--window", type=int, default=21, help="Kayan pencere (snapshot sayısı)")
+    parser.add_argument("--top", type=int, default=10, help="Liste başına sonuç sayısı")
+    parser.add_argument("--fundings-per-day", type=float, default=DEFAULT_FUNDINGS_PER_DAY)
+    parser.add_argument("--bench", action="store_true", help="Sentetik veriyle süre ölç")
+    parser.add_argument("--symbols", type=int, default=600, help="--bench sembol sayısı")
+    parser.add_argument("--snapshots", type=int, default=10000, help="--bench snapshot sayısı")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        timings = run_benchmark(args.symbols, args.snapshots, args.window, args.top)
+        print(f"[BENCH] {args.symbols} sembol x {args.snapshots} snapshot, pencere={args.window}")
+        for name, seconds in timings.items():
+            print(f"  {name:<28} {seconds * 1000:>10.2f} ms")
+        return 0
+
+    if not args.store:
+        parser.error("store dizini veya --bench gerekli")
+
+    started = time.perf_counter()
+    matrix = load_matrix(SnapshotStore(args.store), args.since, args.until)
+    if not len(matrix.ts):
+        print("[ERROR] Aralikta snapshot bulunamadi!")
+        return 1
+    loaded = time.perf_counter()
+    report = build_report(matrix, args.window, args.top, args.fundings_per_day)
+    print_report(report)
+    print(f"\n[OZET] {len(matrix.ts)} snapshot x {len(matrix.symbols)} sembol, "
+          f"yukleme={loaded - started:.3f}s analiz={time.perf_counter() - loaded:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Perpetual Snapshot Daemon
+
+binance_perpetual_snapshot'ı tek seferlik çalıştırmak yerine sürekli çalışır:
+bağlantılar açık kalır, snapshot belirli aralıklarla çekilir ve son N snapshot
+sayısal bir halka tamponda (ring buffer) tutulur. Bellek kullanımı çalışma
+süresinden bağımsızdır: capacity × sembol satırı × len(FIELDS) × 8 bayt; satırlar
+görülen evrene pay eklenerek ayrılır (ör. 1440 snapshot, ~600 sembol -> ~750 satır -> ~86 MB).
+
+Küçük bir yerel HTTP uç noktası sunar:
+    GET /latest                               -> son snapshot (build_snapshot biçimi)
+    GET /history?symbol=BTCUSDT&n=60&fields=fundingRate,lastPrice
+    GET /health
+
+Kullanım:
+    python3 binance_perpetual_snapshot.py --daemon --interval 60 --history 1440
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import sys
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlparse
+
+from snapshot_store import FIELDS, STATUS_NAMES, record_value, to_millis
+
+DEFAULT_HISTORY = 1440
+DEFAULT_MAX_SYMBOLS = 2048
+# Satır kapasitesi görülen evren + max(SYMBOL_HEADROOM_MIN, %25) olarak ayrılır
+SYMBOL_HEADROOM_MIN = 64
+
+
+def ring_buffer_bytes(capacity: int, symbols: int) -> int:
+    """Halka tamponun değer dizisinin boyutu: capacity × symbols × len(FIELDS) × 8 bayt."""
+    return capacity * symbols * len(FIELDS) * 8
+
+
+class SnapshotRingBuffer:
+    """Son `capacity` snapshot'ı [zaman, sembol, alan] düzeninde tutan halka tampon.
+
+    Sembol satırları ilk snapshot'ın evrenine pay eklenerek ayrılır ve yeni
+    semboller geldikçe (en fazla `max_symbols`) büyütülür; bellek çalışma
+    süresinden bağımsızdır. `max_symbols` dolduğunda tamponun tamamı boyunca
+    görülmemiş bir sembolün satırı yeniden kullanılır.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY, max_symbols: int = DEFAULT_MAX_SYMBOLS):
+        self.capacity = capacity
+        self.max_symbols = max_symbols
+        self.width = len(FIELDS)
+        self.rows = 0
+        self.frame_size = 0
+        self._blank_frame = array("d")
+        self.values = array("d")
+        self.timestamps = array("q", [0]) * capacity
+        self.last_seen = array("q")
+        self.slots: Dict[str, int] = {}
+        self.slot_symbols: List[Optional[str]] = []
+        self.count = 0
+        self.lock = Lock()
+
+    def _grow(self, rows: int) -> None:
+        """Satır kapasitesini `rows`'a çıkarır; mevcut frame'ler yeni düzene kopyalanır."""
+        frame_size = rows * self.width
+        values = array("d", [math.nan]) * (self.capacity * frame_size)
+        if self.frame_size:
+            for frame in range(min(self.count, self.capacity)):
+                old = frame * self.frame_size
+                values[frame * frame_size:frame * frame_size + self.frame_size] = \
+                    self.values[old:old + self.frame_size]
+        self.values = values
+        self._blank_frame = array("d", [math.nan]) * frame_size
+        self.last_seen.extend(array("q", [-1]) * (rows - self.rows))
+        self.slot_symbols.extend([None] * (rows - self.rows))
+        self.rows = rows
+        self.frame_size = frame_size
+
+    def _reserve(self, symbols: Sequence[str]) -> None:
+        needed = len(self.slots) + sum(1 for symbol in set(symbols) if symbol not in self.slots)
+        if needed > self.rows and self.rows < self.max_symbols:
+            self._grow(min(self.max_symbols, needed + max(SYMBOL_HEADROOM_MIN, needed // 4)))
+
+    def _slot(self, symbol: str) -> int:
+        slot = self.slots.get(symbol)
+        if slot is not None:
+            return slot
+        if len(self.slots) < self.rows:
+            slot = len(self.slots)
+        else:
+            # Tampondaki hiçbir snapshot'ta görünmeyen satır yeniden kullanılır
+            oldest = self.count - self.capacity
+            slot = next((idx for idx, seen in enumerate(self.last_seen) if seen < oldest), -1)
+            if slot < 0:
+                return -1
+            del self.slots[self.slot_symbols[slot]]
+        self.slots[symbol] = slot
+        self.slot_symbols[slot] = symbol
+        return slot
+
+    def append(self, snapshot: Dict) -> None:
+        ts = to_millis(snapshot.get("generated_at") or time.time())
+        records = snapshot.get("symbols", [])
+        with self.lock:
+            self._reserve([record.get("symbol", "") for record in records])
+            frame = self.count % self.capacity
+            base = frame * self.frame_size
+            self.values[base:base + self.frame_size] = self._blank_frame
+            self.timestamps[frame] = ts
+            for record in records:
+                slot = self._slot(record.get("symbol", ""))
+                if slot < 0:
+                    continue
+                self.last_seen[slot] = self.count
+                offset = base + slot * self.width
+                for col, field in enumerate(FIELDS):
+                    self.values[offset + col] = record_value(record, field)
+            self.count += 1
+
+    def history(self, symbol: str, n: int, fields: Sequence[str]) -> Dict[str, List]:
+        """Sembolün son n snapshot'taki değerlerini eskiden yeniye döndürür."""
+        cols = [FIELDS.index(field) for field in fields]
+        status_col = FIELDS.index("status")
+        out: Dict[str, List] = {"ts": [], **{field: [] for field in fields}}
+        with self.lock:
+            slot = self.slots.get(symbol)
+            if slot is None:
+                return out
+            n = min(n, self.count, self.capacity)
+            for k in range(self.count - n, self.count):
+                frame = k % self.capacity
+                offset = (frame * self.rows + slot) * self.width
+                # Bu snapshot'ta olmayan sembolün satırı NaN kalır
+                if math.isnan(self.values[offset + status_col]):
+                    continue
+                out["ts"].append(self.timestamps[frame])
+                for field, col in zip(fields, cols):
+                    value = self.values[offset + col]
+                    if field == "status":
+                        value = STATUS_NAMES.get(value)
+                    out[field].append(None if isinstance(value, float) and math.isnan(value) else value)
+        return out
+
+
+class _DaemonState:
+    def __init__(self, ring: SnapshotRingBuffer):
+        self.ring = ring
+        self.latest = b"{}"
+        self.last_error: Optional[str] = None
+        self.last_fetch_seconds = 0.0
+
+
+def _make_handler(state: _DaemonState):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):  # noqa: N802 (http.server arayüzü)
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/latest":
+                self._send(200, state.latest)
+            elif url.path == "/history":
+                symbol = (query.get("symbol") or [""])[0]
+                fields = [field for field in (query.get("fields") or ["fundingRate,quoteVolume,lastPrice"])[0].split(",") if field]
+                n_text = (query.get("n") or [str(state.ring.capacity)])[0]
+                if not symbol or not n_text.isdigit() or any(field not in FIELDS for field in fields):
+                    self._send(400, b'{"error": "symbol, n ve gecerli fields gerekli"}')
+                    return
+                n = int(n_text)
+                body = state.ring.history(symbol, n, fields)
+                self._send(200, json.dumps(body, ensure_ascii=False).encode("utf-8"))
+            elif url.path == "/health":
+                body = {
+                    "snapshots": state.ring.count,
+                    "capacity": state.ring.capacity,
+                    "symbols": len(state.ring.slots),
+                    "symbol_rows": state.ring.rows,
+                    "buffer_bytes": ring_buffer_bytes(state.ring.capacity, state.ring.rows),
+                    "last_fetch_seconds": round(state.last_fetch_seconds, 3),
+                    "last_error": state.last_error,
+                }
+                self._send(200, json.dumps(body).encode("utf-8"))
+            else:
+                self._send(404, b'{"error": "bulunamadi"}')
+
+        def log_message(self, format, *args):  # noqa: A002
+            pass
+
+    return Handler
+
+
+def run_daemon(
+    interval: float,
+    history: int = DEFAULT_HISTORY,
+    max_symbols: int = DEFAULT_MAX_SYMBOLS,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    store=None,
+) -> None:
+    """Snapshot'ı `interval` saniyede bir çeker ve HTTP üzerinden sunar."""
+    from binance_perpetual_snapshot import build_snapshot
+
+    state = _DaemonState(SnapshotRingBuffer(history, max_symbols))
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[DAEMON] http://{host}:{port} (/latest, /history, /health), aralik={interval}s, gecmis={history}",
+          file=sys.stderr)
+
+    next_run = time.monotonic()
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                snapshot = build_snapshot()
+                state.ring.append(snapshot)
+                state.latest = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                if store is not None:
+                    store.append(snapshot)
+                state.last_error = None
+            except Exception as exc:
+                state.last_error = str(exc)
+                print(f"[DAEMON][ERROR] {exc}", file=sys.stderr)
+            state.last_fetch_seconds = time.monotonic() - started
+
+            # Sabit aralıklı zamanlama: kaçırılan turlar atlanır, kayma birikmez
+            next_run += interval
+            now = time.monotonic()
+            if next_run < now:
+                next_run = now + interval - (now - next_run) % interval
+            time.sleep(next_run - now)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Perpetual Snapshot Store
+
+binance_perpetual_snapshot çıktılarını yerel diskte, zamana göre parçalanmış
+(chunk) ve sadece sonuna eklenen (append-only) kolonsal bir depoda saklar.
+
+Dizin yapısı:
+    meta.json            -> chunk süresi ve saklanan alanlar
+    symbols.txt          -> sembol sözlüğü (satır numarası = sembol ID)
+    chunks/<ms>.bin      -> snapshot blokları
+    chunks/<ms>.idx      -> blok indeksi (zaman, ID dizisi ve değer ofsetleri)
+
+Her blok bir snapshot'tır: ID'ye göre sıralı uint32 sembol ID dizisi ve her
+alan için ardışık float64 kolon. ID dizisi bir önceki blokla aynıysa tekrar
+yazılmaz; böylece bir sembolün blok içindeki yeri chunk başına bir kez
+bulunur ve sorgular sadece ilgili değerleri okur.
+
+Kullanım:
+    python3 snapshot_store.py query DIR BTCUSDT --since 2025-11-01 --fields fundingRate,lastPrice
+    python3 snapshot_store.py retention DIR --days 30 --max-mb 500
+    python3 snapshot_store.py compact DIR --older-than-days 7 --every-minutes 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Saklanan sayısal alanlar (kolon sırası dosya biçiminin parçasıdır)
+FIELDS = (
+    "fundingRate",
+    "quoteVolume",
+    "lastPrice",
+    "priceChangePercent",
+    "volume",
+    "openPrice",
+    "highPrice",
+    "lowPrice",
+    "interestRate",
+    "status",
+)
+DEFAULT_QUERY_FIELDS = ("fundingRate", "quoteVolume", "lastPrice")
+
+# status metin alanı sayısal koda çevrilir (0 = bilinmiyor)
+STATUS_CODES = {
+    "TRADING": 1.0,
+    "PENDING_TRADING": 2.0,
+    "PRE_SETTLE": 3.0,
+    "SETTLING": 4.0,
+    "CLOSE": 5.0,
+    "PRE_DELIVERING": 6.0,
+    "DELIVERING": 7.0,
+    "DELIVERED": 8.0,
+}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+DEFAULT_CHUNK_SECONDS = 86400
+
+# İndeks kaydı: zaman (ms), ID dizisi ofseti, değer ofseti, sembol sayısı
+_INDEX_ENTRY = struct.Struct("<qqqI")
+_SWAP = sys.byteorder != "little"
+
+
+def _to_bytes(values: array) -> bytes:
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _SWAP:
+        values.byteswap()
+    return values
+
+
+def to_millis(value) -> int:
+    """ISO tarih, datetime veya epoch (sn/ms) değerini epoch milisaniyeye çevirir."""
+    if isinstance(value, datetime):
+        dt = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp() * 1000)
+    if isinstance(value, (int, float)):
+        return int(value if value > 10**11 else value * 1000)
+    text = str(value).strip()
+    if text.isdigit():
+        return to_millis(int(text))
+    dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    return to_millis(dt)
+
+
+def record_value(record: Dict, field: str) -> float:
+    """Snapshot kaydındaki alanı float olarak döndürür (eksikse NaN)."""
+    if field == "status":
+        return STATUS_CODES.get(record.get("status"), 0.0)
+    value = record.get(field)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class SnapshotStore:
+    """Zamana göre parçalanmış, append-only kolonsal snapshot deposu."""
+
+    def __init__(
+        self,
+        root: str,
+        chunk_seconds: int = DEFAULT_CHUNK_SECONDS,
+        retention_seconds: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.root = root
+        self.chunk_dir = os.path.join(root, "chunks")
+        os.makedirs(self.chunk_dir, exist_ok=True)
+
+        meta_path = os.path.join(root, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as fp:
+                meta = json.load(fp)
+            if tuple(meta.get("fields", ())) != FIELDS:
+                raise ValueError(f"Depo alanlari uyusmuyor: {meta_path}")
+        else:
+            meta = {"version": 1, "chunk_seconds": chunk_seconds, "fields": list(FIELDS)}
+            with open(meta_path, "w", encoding="utf-8") as fp:
+                json.dump(meta, fp)
+        self.chunk_ms = int(meta["chunk_seconds"]) * 1000
+
+        self.retention_seconds = retention_seconds
+        self.max_bytes = max_bytes
+
+        self._symbols_path = os.path.join(root, "symbols.txt")
+        self.symbols: List[str] = []
+        if os.path.exists(self._symbols_path):
+            with open(self._symbols_path, "r", encoding="utf-8") as fp:
+                self.symbols = [line.rstrip("\n") for line in fp if line.strip()]
+        self._ids = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+
+    def _symbol_id(self, symbol: str, new_symbols: List[str]) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self.symbols.append(symbol)
+            self._ids[symbol] = sid
+            new_symbols.append(symbol)
+        return sid
+
+    def _paths(self, chunk_key: int) -> Tuple[str, str]:
+        base = os.path.join(self.chunk_dir, f"{chunk_key:015d}")
+        return base + ".bin", base + ".idx"
+
+    def append(self, snapshot: Dict) -> int:
+        """Snapshot'ı depoya ekler; bloğun zaman damgasını (ms) döndürür."""
+        ts = to_millis(snapshot.get("generated_at") or time.time())
+        records = [record for record in snapshot.get("symbols", []) if record.get("symbol")]
+
+        new_symbols: List[str] = []
+        rows = sorted((self._symbol_id(record["symbol"], new_symbols), record) for record in records)
+        if new_symbols:
+            with open(self._symbols_path, "a", encoding="utf-8") as fp:
+                fp.write("".join(symbol + "\n" for symbol in new_symbols))
+
+        ids = _to_bytes(array("I", (sid for sid, _ in rows)))
+        n = len(rows)
+        chunk_key = ts - ts % self.chunk_ms
+        bin_path, idx_path = self._paths(chunk_key)
+        entries = self._read_index(chunk_key)
+
+        with open(bin_path, "ab") as fp:
+            offset = fp.tell()
+            ids_offset = -1
+            if entries and entries[-1][3] == n:
+                last_ids_offset = entries[-1][1]
+                with open(bin_path, "rb") as reader:
+                    reader.seek(last_ids_offset)
+                    if reader.read(len(ids)) == ids:
+                        ids_offset = last_ids_offset
+            if ids_offset < 0:
+                ids_offset = offset
+                fp.write(ids)
+            values_offset = fp.tell()
+            for field in FIELDS:
+                fp.write(_to_bytes(array("d", (record_value(record, field) for _, record in rows))))
+
+        # İndeks en son yazılır: yarım kalan blok indekslenmediği için görünmez
+        entry = (ts, ids_offset, values_offset, n)
+        if entries and ts < entries[-1][0]:
+            # Geç gelen (backfill) blok sıralı yerine konur; okumalar zamana göre bisect yapar
+            entries.insert(bisect_right([item[0] for item in entries], ts), entry)
+            with open(idx_path + ".tmp", "wb") as fp:
+                fp.write(b"".join(_INDEX_ENTRY.pack(*item) for item in entries))
+            os.replace(idx_path + ".tmp", idx_path)
+        else:
+            with open(idx_path, "ab") as fp:
+                fp.write(_INDEX_ENTRY.pack(*entry))
+
+        if self.retention_seconds or self.max_bytes:
+            self.apply_retention(self.retention_seconds, self.max_bytes)
+        return ts
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    def chunk_keys(self) -> List[int]:
+        keys = []
+        for name in os.listdir(self.chunk_dir):
+            if name.endswith(".idx"):
+                keys.append(int(name[:-4]))
+        return sorted(keys)
+
+    def _chunks_in_range(self, start_ms: Optional[int], end_ms: Optional[int]) -> List[int]:
+        return [
+            key for key in self.chunk_keys()
+            if (end_ms is None or key <= end_ms) and (start_ms is None or key + self.chunk_ms > start_ms)
+        ]
+
+    def _read_index(self, chunk_key: int) -> List[Tuple[int, int, int, int]]:
+        _, idx_path = self._paths(chunk_key)
+        if not os.path.exists(idx_path):
+            return []
+        with open(idx_path, "rb") as fp:
+            data = fp.read()
+        usable = len(data) - len(data) % _INDEX_ENTRY.size
+        return [entry for entry in _INDEX_ENTRY.iter_unpack(data[:usable])]
+
+    @staticmethod
+    def _window(entries: Sequence[Tuple], start_ms: Optional[int], end_ms: Optional[int]) -> Sequence[Tuple]:
+        times = [entry[0] for entry in entries]
+        lo = 0 if start_ms is None else bisect_left(times, start_ms)
+        hi = len(times) if end_ms is None else bisect_right(times, end_ms)
+        return entries[lo:hi]
+
+    def timestamps(self, start=None, end=None) -> List[int]:
+        """Aralıktaki snapshot zaman damgalarını (ms) döndürür."""
+        start_ms = None if start is None else to_millis(start)
+        end_ms = None if end is None else to_millis(end)
+        out: List[int] = []
+        for key in self._chunks_in_range(start_ms, end_ms):
+            out.extend(entry[0] for entry in self._window(self._read_index(key), start_ms, end_ms))
+        return out
+
+    def query(
+        self,
+        symbol: str,
+        start=None,
+        end=None,
+        fields: Sequence[str] = DEFAULT_QUERY_FIELDS,
+    ) -> Dict[str, List]:
+        """Bir sembolün aralıktaki seri değerlerini döndürür ({"ts": [...], alan: [...]}).
+
+        Her chunk için sembolün blok içindeki yeri ID dizisi değiştiğinde bir
+        kez aranır; değerler doğrudan ofsetten okunur.
+        """
+        column_idx = [FIELDS.index(field) for field in fields]
+        out: Dict[str, List] = {"ts": [], **{field: [] for field in fields}}
+        sid = self._ids.get(symbol)
+        if sid is None:
+            return out
+
+        start_ms = None if start is None else to_millis(start)
+        end_ms = None if end is None else to_millis(end)
+        for key in self._chunks_in_range(start_ms, end_ms):
+            entries = self._window(self._read_index(key), start_ms, end_ms)
+            if not entries:
+                continue
+            positions: Dict[int, int] = {}
+            with open(self._paths(key)[0], "rb") as fp:
+                for ts, ids_offset, values_offset, n in entries:
+                    pos = positions.get(ids_offset)
+                    if pos is None:
+                        fp.seek(ids_offset)
+                        ids = _from_bytes("I", fp.read(4 * n))
+                        pos = bisect_left(ids, sid)
+                        pos = pos if pos < n and ids[pos] == sid else -1
+                        positions[ids_offset] = pos
+                    if pos < 0:
+                        continue
+                    out["ts"].append(ts)
+                    for field, col in zip(fields, column_idx):
+                        fp.seek(values_offset + (col * n + pos) * 8)
+                        out[field].append(_from_bytes("d", fp.read(8))[0])
+        return out
+
+    def iter_blocks(
+        self, start=None, end=None, fields: Sequence[str] = FIELDS
+    ) -> Iterator[Tuple[int, List[str], Dict[str, array]]]:
+        """Aralıktaki snapshot'ları kolonsal olarak sırayla üretir.
+
+        (zaman_ms, semboller, {alan: array('d')}) döner; bellekte aynı anda
+        yalnızca bir blok tutulur.
+        """
+        start_ms = None if start is None else to_millis(start)
+        end_ms = None if end is None else to_millis(end)
+        column_idx = [FIELDS.index(field) for field in fields]
+        for key in self._chunks_in_range(start_ms, end_ms):
+            entries = self._window(self._read_index(key), start_ms, end_ms)
+            if not entries:
+                continue
+            cached_ids: Tuple[int, List[str]] = (-1, [])
+            with open(self._paths(key)[0], "rb") as fp:
+                for ts, ids_offset, values_offset, n in entries:
+                    if cached_ids[0] != ids_offset:
+                        fp.seek(ids_offset)
+                        ids = _from_bytes("I", fp.read(4 * n))
+                        cached_ids = (ids_offset, [self.symbols[sid] for sid in ids])
+                    columns = {}
+                    for field, col in zip(fields, column_idx):
+                        fp.seek(values_offset + col * n * 8)
+                        columns[field] = _from_bytes("d", fp.read(n * 8))
+                    yield ts, cached_ids[1], columns
+
+    def iter_snapshots(self, start=None, end=None) -> Iterator[Dict]:
+        """Blokları build_snapshot biçimine benzer sözlükler olarak üretir."""
+        for ts, symbols, columns in self.iter_blocks(start, end):
+            records = []
+            for pos, symbol in enumerate(symbols):
+                record = {"symbol": symbol}
+                for field in FIELDS:
+                    value = columns[field][pos]
+                    record[field] = STATUS_NAMES.get(value) if field == "status" else value
+                records.append(record)
+            records.sort(key=lambda item: item["symbol"])
+            yield {
+                "generated_at": datetime.fromtimestamp(ts / 1000, tz=timezone.utc).isoformat(),
+                "count": len(records),
+                "symbols": records,
+            }
+
+    # ------------------------------------------------------------------
+    # Saklama ve sıkıştırma
+    # ------------------------------------------------------------------
+
+    def disk_usage(self) -> int:
+        total = 0
+        for name in os.listdir(self.chunk_dir):
+            total += os.path.getsize(os.path.join(self.chunk_dir, name))
+        return total
+
+    def _remove_chunk(self, chunk_key: int) -> None:
+        for path in self._paths(chunk_key):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def apply_retention(
+        self, retention_seconds: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> List[int]:
+        """Süresi dolan veya boyut sınırını aşan en eski chunk'ları siler.
+
+        İçinde bulunulan (en yeni) chunk hiçbir zaman silinmez.
+        """
+        removed: List[int] = []
+        keys = self.chunk_keys()
+        if retention_seconds:
+            cutoff = int(time.time() * 1000) - retention_seconds * 1000
+            for key in keys[:-1]:
+                if key + self.chunk_ms <= cutoff:
+                    self._remove_chunk(key)
+                    removed.append(key)
+            keys = [key for key in keys if key not in removed]
+        if max_bytes:
+            usage = self.disk_usage()
+            for key in keys[:-1]:
+                if usage <= max_bytes:
+                    break
+                usage -= sum(os.path.getsize(path) for path in self._paths(key) if os.path.exists(path))
+                self._remove_chunk(key)
+                removed.append(key)
+        return removed
+
+    def compact(self, older_than_seconds: int, every_seconds: int) -> int:
+        """Eski chunk'larda her `every_seconds` aralığı için tek snapshot bırakır.
+
+        Chunk yeniden yazılıp atomik olarak değiştirilir; silinen blok sayısını döndürür.
+        """
+        if every_seconds <= 0:
+            raise ValueError(f"every_seconds pozitif olmali: {every_seconds}")
+        cutoff = int(time.time() * 1000) - older_than_seconds * 1000
+        bucket_ms = every_seconds * 1000
+        dropped = 0
+        for key in self.chunk_keys():
+            if key + self.chunk_ms > cutoff:
+                continue
+            entries = self._read_index(key)
+            keep = []
+            last_bucket = None
+            for entry in entries:
+                bucket = entry[0] // bucket_ms
+                if bucket != last_bucket:
+                    keep.append(entry)
+                    last_bucket = bucket
+            if len(keep) == len(entries):
+                continue
+
+            bin_path, idx_path = self._paths(key)
+            with open(bin_path, "rb") as src, open(bin_path + ".tmp", "wb") as dst, \
+                    open(idx_path + ".tmp", "wb") as idx:
+                moved: Dict[int, int] = {}
+                for ts, ids_offset, values_offset, n in keep:
+                    if ids_offset not in moved:
+                        src.seek(ids_offset)
+                        moved[ids_offset] = dst.tell()
+                        dst.write(src.read(4 * n))
+                    src.seek(values_offset)
+                    new_values_offset = dst.tell()
+                    dst.write(src.read(len(FIELDS) * n * 8))
+                    idx.write(_INDEX_ENTRY.pack(ts, moved[ids_offset], new_values_offset, n))
+            os.replace(bin_path + ".tmp", bin_path)
+            os.replace(idx_path + ".tmp", idx_path)
+            dropped += len(entries) - len(keep)
+        return dropped
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _positive_float(text: str) -> float:
+    value = float(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"pozitif olmali: {text}")
+    return value
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Perpetual snapshot deposu")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    query = sub.add_parser("query", help="Sembol serisini JSON olarak yazdır")
+    query.add_argument("store")
+    query.add_argument("symbol")
+    query.add_argument("--since", help="Başlangıç (ISO tarih veya epoch)")
+    query.add_argument("--until", help="Bitiş (ISO tarih veya epoch)")
+    query.add_argument("--fields", default=",".join(DEFAULT_QUERY_FIELDS))
+
+    retention = sub.add_parser("retention", help="Eski chunk'ları sil")
+    retention.add_argument("store")
+    retention.add_argument("--days", type=float)
+    retention.add_argument("--max-mb", type=float)
+
+    compact = sub.add_parser("compact", help="Eski chunk'ları seyrelt")
+    compact.add_argument("store")
+    compact.add_argument("--older-than-days", type=float, default=7)
+    compact.add_argument("--every-minutes", type=_positive_float, default=60)
+
+    args = parser.parse_args(argv)
+    store = SnapshotStore(args.store)
+
+    if args.command == "query":
+        fields = [field.strip() for field in args.fields.split(",") if field.strip()]
+        series = store.query(args.symbol, args.since, args.until, fields)
+        print(json.dumps(series, ensure_ascii=False))
+    elif args.command == "retention":
+        removed = store.apply_retention(
+            int(args.days * 86400) if args.days else None,
+            int(args.max_mb * 1024 * 1024) if args.max_mb else None,
+        )
+        print(f"[OK] {len(removed)} chunk silindi, disk: {store.disk_usage()} bayt")
+    else:
+        dropped = store.compact(int(args.older_than_days * 86400), int(args.every_minutes * 60))
+        print(f"[OK] {dropped} snapshot seyreltildi, disk: {store.disk_usage()} bayt")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Symbol Normalisation Index
+
+Borsalar aynı coini farklı adlarla listeleyebilir: Binance/Bybit vadelide
+`1000PEPE`, `1000000MOG`, `1MBABYDOGE` gibi çarpanlı sözleşmeler, yeniden
+adlandırılmış tickerlar (`MATIC` -> `POL`) veya borsaya özgü adlar
+(Bybit `LUNA2`). Bu modül her (borsa, ham sembol) çiftini kalıcı bir
+tamsayı asset ID'sine ve birim çarpanına eşler:
+
+    index.resolve("binance.futures", "1000PEPE")  -> (asset_id, 1000)
+    index.resolve("mexc", "PEPE")                 -> (aynı asset_id, 1)
+
+Borsa anahtarı `<borsa>` veya `<borsa>.<piyasa>` biçimindedir. Çarpan önekleri
+yalnızca bunları gerçekten kullanan piyasalarda (MULTIPLIER_MARKETS: Binance
+ve Bybit vadeli) ayrıştırılır: vadeli `1000CAT` -> (CAT, 1000), `1000X` ->
+(X, 1000); spot listelerdeki adlar olduğu gibi kalır. O piyasada adı gerçekten
+rakamla başlayan sözleşmeler NUMERIC_TICKERS'ta piyasa bazında tutulur.
+
+Normalizasyon bir sembol ilk görüldüğünde bir kez yapılır; sonuç diske
+yazılır ve sonraki çalıştırmalarda yalnızca yeni semboller işlenir. Borsalar
+arası karşılaştırmalar string yerine asset ID kümeleri üzerinden yapılır.
+
+Dosya yolu SYMBOL_INDEX_PATH ile değiştirilebilir (varsayılan:
+symbol_index.json). Dosyadaki "aliases" bölümü elle düzenlenebilir:
+    {"aliases": {"*": {"OLD": "NEW"}, "bybit": {"LUNA2": "LUNA"}}}
+
+Kullanım:
+    python3 symbol_index.py                 # indeks özetini yazdır
+    python3 symbol_index.py --venue binance.futures PEPE 1000PEPE   # sembolleri çözümle
+"""
+
+import json
+import os
+import re
+import sys
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SYMBOL_INDEX_PATH = os.environ.get("SYMBOL_INDEX_PATH", "symbol_index.json")
+INDEX_VERSION = 3
+
+# Sözleşme başına birim çarpanı olan önekler (en uzun önce denenir)
+_MULTIPLIER_RE = re.compile(r"^(1000000|100000|10000|1000|1M)(?=[A-Z])")
+
+# Çarpanlı sözleşme adları kullanan piyasalar (borsa.piyasa)
+MULTIPLIER_MARKETS = {"binance.futures", "bybit.futures"}
+
+# Tüm borsalarda geçerli yeniden adlandırmalar (eski -> yeni)
+RENAMED_TICKERS = {
+    "MATIC": "POL",
+    "RNDR": "RENDER",
+    "BEAMX": "BEAM",
+}
+
+# Çarpanlı piyasalarda adı gerçekten rakamla başlayan sözleşmeler (piyasa -> ham ad);
+# bunlar çarpan öneki olarak ayrıştırılmaz. Binance/Bybit vadelide 1000CAT, 1000SATS,
+# 1000CHEEMS gibi adlar 1000'lik sözleşme birimidir ve buraya girmez.
+NUMERIC_TICKERS: Dict[str, Set[str]] = {
+    "binance.futures": set(),
+    "bybit.futures": set(),
+}
+
+# Borsaya özgü adlar
+VENUE_ALIASES = {
+    "bybit": {"LUNA2": "LUNA", "SHIB1000": "1000SHIB"},
+}
+
+
+def _multiplier(prefix: str) -> int:
+    return 1_000_000 if prefix == "1M" else int(prefix)
+
+
+class SymbolIndex:
+    """(borsa, ham sembol) -> (asset_id, çarpan) eşlemesi; thread-safe."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.assets: List[Dict] = []
+        self.asset_ids: Dict[str, int] = {}
+        self.venues: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self.aliases: Dict[str, Dict[str, str]] = {}
+        self.dirty = False
+        self.lock = Lock()
+
+    # -- kalıcılık ----------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: str = SYMBOL_INDEX_PATH) -> "SymbolIndex":
+        index = cls(path)
+        if not path or not os.path.exists(path):
+            return index
+        try:
+            with open(path, "r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Sembol indeksi okunamadi, yeniden olusturulacak ({path}): {e}")
+            return index
+        if data.get("version") != INDEX_VERSION:
+            return index
+        index.assets = data.get("assets", [])
+        index.asset_ids = {asset["symbol"]: asset["id"] for asset in index.assets}
+        index.venues = {
+            venue: {raw: (entry[0], entry[1]) for raw, entry in symbols.items()}
+            for venue, symbols in data.get("venues", {}).items()
+        }
+        index.aliases = data.get("aliases", {})
+        return index
+
+    def save(self) -> bool:
+        """Değişiklik varsa indeksi atomik olarak yazar."""
+        with self.lock:
+            if not self.dirty or not self.path:
+                return False
+            data = {
+                "version": INDEX_VERSION,
+                "assets": self.assets,
+                "venues": {venue: {raw: list(entry) for raw, entry in sorted(symbols.items())}
+                           for venue, symbols in sorted(self.venues.items())},
+                "aliases": self.aliases,
+            }
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as fp:
+                    json.dump(data, fp, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"[WARNING] Sembol indeksi yazilamadi ({self.path}): {e}")
+                return False
+            self.dirty = False
+            return True
+
+    # -- normalizasyon --------------------------------------------------------
+
+    def normalize(self, venue: str, raw: str) -> Tuple[str, int]:
+        """Ham sembolü (kanonik sembol, çarpan) çiftine çevirir."""
+        symbol = raw.upper()
+        exchange = venue.split(".", 1)[0]
+        symbol = self.aliases.get(exchange, {}).get(symbol) or VENUE_ALIASES.get(exchange, {}).get(symbol) or symbol
+        multiplier = 1
+        match = _MULTIPLIER_RE.match(symbol) if venue in MULTIPLIER_MARKETS and symbol not in NUMERIC_TICKERS.get(venue, ()) \
+            else None
+        if match:
+            multiplier = _multiplier(match.group(1))
+            symbol = symbol[match.end():]
+        symbol = self.aliases.get("*", {}).get(symbol) or RENAMED_TICKERS.get(symbol, symbol)
+        return symbol, multiplier
+
+    def _asset_id(self, canonical: str) -> int:
+        asset_id = self.asset_ids.get(canonical)
+        if asset_id is None:
+            asset_id = len(self.assets)
+            self.assets.append({"id": asset_id, "symbol": canonical, "cmc_id": None})
+            self.asset_ids[canonical] = asset_id
+        return asset_id
+
+    def resolve(self, venue: str, raw: str) -> Tuple[int, int]:
+        """(asset_id, çarpan) döndürür; yeni semboller indekse eklenir."""
+        symbols = self.venues.get(venue)
+        if symbols is not None:
+            entry = symbols.get(raw)
+            if entry is not None:
+                return entry
+        with self.lock:
+            symbols = self.venues.setdefault(venue, {})
+            entry = symbols.get(raw)
+            if entry is None:
+                canonical, multiplier = self.normalize(venue, raw)
+                entry = (self._asset_id(canonical), multiplier)
+                symbols[raw] = entry
+                self.dirty = True
+            return entry
+
+    def asset_id(self, venue: str, raw: str) -> int:
+        return self.resolve(venue, raw)[0]
+
+    def symbol_asset(self, raw: str, venue: Optional[str] = None) -> int:
+        """Borsası bilinmeyen semboller için yalnızca genel kurallarla asset ID'si."""
+        if venue:
+            return self.asset_id(venue, raw)
+        canonical, _ = self.normalize("*", raw)
+        asset_id = self.asset_ids.get(canonical)
+        if asset_id is not None:
+            return asset_id
+        with self.lock:
+            count = len(self.assets)
+            asset_id = self._asset_id(canonical)
+            self.dirty = self.dirty or len(self.assets) != count
+            return asset_id
+
+    def canonical(self, asset_id: int) -> str:
+        return self.assets[asset_id]["symbol"]
+
+    # -- CoinMarketCap ID'leri ----------------------------------------------
+
+    def cmc_id(self, asset_id: int) -> Tuple[Optional[int], float]:
+        """(cmc_id, kontrol zamanı); None = hiç çözülmedi, 0 = CMC'de bulunamadı."""
+        asset = self.assets[asset_id]
+        return asset.get("cmc_id"), asset.get("cmc_checked", 0.0)
+
+    def set_cmc_id(self, asset_id: int, cmc_id: int, checked_at: float) -> None:
+        with self.lock:
+            asset = self.assets[asset_id]
+            asset["cmc_id"] = cmc_id
+            asset["cmc_checked"] = checked_at
+            self.dirty = True
+
+    # -- birleştirmeler -------------------------------------------------------
+
+    def id_set(self, venue: str, symbols: Iterable[str]) -> Set[int]:
+        return {self.resolve(venue, symbol)[0] for symbol in symbols}
+
+    def canonical_symbols(self, venue: str, symbols: Iterable[str]) -> Set[str]:
+        return {self.canonical(asset_id) for asset_id in self.id_set(venue, symbols)}
+
+    def difference(self, venue: str, symbols: Iterable[str], other_venue: str, other_symbols: Iterable[str]) -> List[str]:
+        """`venue` sembollerinden asset'i `other_venue` listesinde OLMAYANLAR (ham adlarıyla)."""
+        others = self.id_set(other_venue, other_symbols)
+        return [symbol for symbol in symbols if self.resolve(venue, symbol)[0] not in others]
+
+
+_shared_index: Optional[SymbolIndex] = None
+_shared_lock = Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    """Süreç içinde paylaşılan indeks (ilk çağrıda diskten yüklenir)."""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = SymbolIndex.load(SYMBOL_INDEX_PATH)
+        return _shared_index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    index = get_symbol_index()
+    if not argv:
+        print(f"Indeks: {index.path}")
+        print(f"Asset: {len(index.assets)}")
+        for venue, symbols in sorted(index.venues.items()):
+            scaled = sum(1 for _, multiplier in symbols.values() if multiplier != 1)
+            print(f"  {venue:<10} {len(symbols):>6} sembol, {scaled} carpanli")
+        return 0
+
+    venue = "*"
+    if argv[0] == "--venue" and len(argv) > 1:
+        venue, argv = argv[1], argv[2:]
+    for raw in argv:
+        canonical, multiplier = index.normalize(venue, raw)
+        known = index.asset_ids.get(canonical)
+        print(f"{raw:<16} -> {canonical:<12} x{multiplier:<8} id={known if known is not None else '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
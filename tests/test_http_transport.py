@@ -0,0 +1,97 @@
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_transport as ht  # noqa: E402
+
+
+class ScriptedTransport:
+    """Sıradaki sonucu döndüren (istisnaysa fırlatan) sahte transport."""
+
+    mode = "live"
+
+    def __init__(self):
+        self.outcomes = []
+        self.calls = 0
+
+    def get_json(self, url, params=None, headers=None, timeout=15):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def test_breaker_recovers_after_4xx_on_half_open_probe(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ht.time, "time", lambda: clock[0])
+    inner = ScriptedTransport()
+    transport = ht.ResilientTransport(inner)
+    url = "http://upstream.test/api"
+
+    inner.outcomes = [requests.ConnectionError("down")] * ht.BREAKER_FAILURES
+    for _ in range(ht.BREAKER_FAILURES):
+        with pytest.raises(requests.ConnectionError):
+            transport.get_json(url)
+    assert transport.breaker(url).state == ht.CircuitBreaker.OPEN
+
+    with pytest.raises(ht.CircuitOpenError):
+        transport.get_json(url)
+
+    clock[0] += transport.breaker(url).cooldown
+    inner.outcomes = [http_error(404)]
+    with pytest.raises(requests.HTTPError):
+        transport.get_json(url)
+
+    inner.outcomes = [{"ok": True}]
+    calls = inner.calls
+    assert transport.get_json(url) == {"ok": True}
+    assert inner.calls == calls + 1
+    assert transport.breaker(url).state == ht.CircuitBreaker.CLOSED
+
+
+def test_cancelled_probe_releases_half_open(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ht.time, "time", lambda: clock[0])
+    inner = ScriptedTransport()
+    transport = ht.ResilientTransport(inner)
+    url = "http://upstream.test/api"
+
+    inner.outcomes = [requests.ConnectionError("down")] * ht.BREAKER_FAILURES
+    for _ in range(ht.BREAKER_FAILURES):
+        with pytest.raises(requests.ConnectionError):
+            transport.get_json(url)
+
+    clock[0] += transport.breaker(url).cooldown
+    inner.outcomes = [KeyboardInterrupt()]
+    with pytest.raises(KeyboardInterrupt):
+        transport.get_json(url)
+
+    inner.outcomes = [{"ok": True}]
+    assert transport.get_json(url) == {"ok": True}
+    assert transport.breaker(url).state == ht.CircuitBreaker.CLOSED
+
+
+def test_excluded_host_is_never_hedged():
+    inner = ScriptedTransport()
+    transport = ht.ResilientTransport(inner)
+    url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
+    for _ in range(ht.HEDGE_MIN_SAMPLES):
+        transport.tracker(url).observe(0.001)
+    assert transport.tracker(url).hedge_delay() is not None
+    assert transport.hedge_delay(url) is None
+
+    other = "http://upstream.test/api"
+    for _ in range(ht.HEDGE_MIN_SAMPLES):
+        transport.tracker(other).observe(0.001)
+    assert transport.hedge_delay(other) is not None
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crypto_web_dashboard as dashboard  # noqa: E402
+import http_transport as ht  # noqa: E402
+
+
+class ScriptedTransport:
+    mode = "live"
+
+    def __init__(self):
+        self.outcomes = []
+
+    def get_json(self, url, params=None, headers=None, timeout=15):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setattr(dashboard, "last_good_store", {})
+    transport = ht.ResilientTransport(ScriptedTransport())
+    monkeypatch.setattr(dashboard, "get_transport", lambda: transport)
+    return transport
+
+
+def test_fresh_result_is_stored(transport):
+    assert dashboard.with_last_good("binance_futures", {"BTC"}) == {"BTC"}
+    status = dashboard.last_good_status()["binance_futures"]
+    assert status["from_cache"] is False
+    assert status["failures"] == 0
+
+
+def test_breaker_served_response_is_reported_as_cached(transport, monkeypatch):
+    url = dashboard.LAST_GOOD_ENDPOINTS["binance_futures"]
+    transport.inner.outcomes = [{"symbols": []}] + [requests.ConnectionError("down")] * ht.BREAKER_FAILURES
+    transport.get_json(url)
+    fetched = transport._last_good[transport._key(url, None)][1]
+    for _ in range(ht.BREAKER_FAILURES):
+        with pytest.raises(requests.ConnectionError):
+            transport.get_json(url)
+    assert transport.get_json(url) == {"symbols": []}
+
+    monkeypatch.setattr(dashboard.time, "time", lambda: fetched + 120)
+    assert dashboard.with_last_good("binance_futures", {"BTC"}) == {"BTC"}
+    status = dashboard.last_good_status()["binance_futures"]
+    assert status["from_cache"] is True
+    assert status["failures"] == 1
+    assert status["age_seconds"] == 120
+    assert dashboard.with_last_good("binance_futures", {"BTC"}) == {"BTC"}
+    assert dashboard.last_good_status()["binance_futures"]["failures"] == 2
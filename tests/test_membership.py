@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crypto_web_dashboard as dashboard  # noqa: E402
+import symbol_index  # noqa: E402
+from membership import matrix_from_sets, referenced_columns  # noqa: E402
+
+
+def test_referenced_columns_expands_exchange_names():
+    available = ["mexc.futures", "binance.spot", "binance.futures", "bybit.futures"]
+    assert referenced_columns("binance and not bybit.futures", available) == \
+        ["binance.spot", "binance.futures", "bybit.futures"]
+    assert referenced_columns("not binance.futures", available, universe=("mexc.futures",)) == \
+        ["mexc.futures", "binance.futures"]
+
+
+def test_not_ignores_unreferenced_columns():
+    base = {"mexc.futures": ["BTC", "ETH", "SOL"], "binance.futures": ["BTC"]}
+    with_bybit = dict(base, **{"bybit.futures": ["DOGE"]})
+    expression = "not binance.futures"
+    results = [
+        sorted(matrix_from_sets({name: columns[name] for name in referenced_columns(
+            expression, columns, universe=("mexc.futures",))}).select(expression))
+        for columns in (base, with_bybit)
+    ]
+    assert results[0] == results[1] == ["ETH", "SOL"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(dashboard, "update_thread_started", True)
+    monkeypatch.setattr(dashboard, "source_store", {})
+    monkeypatch.setattr(symbol_index, "_shared_index", symbol_index.SymbolIndex(""))
+    with dashboard.app.test_client() as client:
+        yield client
+
+
+def test_membership_route_is_stable_when_sources_arrive(client):
+    rows = [{"symbol": symbol, "market_cap": 0} for symbol in ("BTC", "ETH", "SOL")]
+    dashboard._store_source("mexc", rows, "v1", None, "test")
+    dashboard._store_source("binance", ["BTC"], "v1", None, "test")
+    before = client.get("/api/membership?expr=not binance.futures").get_json()
+    dashboard._store_source("bybit", ["DOGE", "XRP"], "v1", None, "test")
+    after = client.get("/api/membership?expr=not binance.futures").get_json()
+    assert [row["symbol"] for row in before["data"]] == [row["symbol"] for row in after["data"]] == ["ETH", "SOL"]
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot_store import SnapshotStore  # noqa: E402
+
+BASE = 1_700_000_000_000
+
+
+def snapshot(ts_ms, price):
+    return {"generated_at": ts_ms / 1000, "symbols": [{"symbol": "BTCUSDT", "lastPrice": str(price)}]}
+
+
+def test_out_of_order_append_is_kept_in_time_order(tmp_path):
+    store = SnapshotStore(str(tmp_path), chunk_seconds=3600)
+    for offset, price in ((0, 1), (120_000, 3), (60_000, 2), (180_000, 4)):
+        store.append(snapshot(BASE + offset, price))
+
+    series = store.query("BTCUSDT", fields=("lastPrice",))
+    assert series["ts"] == [BASE, BASE + 60_000, BASE + 120_000, BASE + 180_000]
+    assert series["lastPrice"] == [1, 2, 3, 4]
+    window = store.query("BTCUSDT", BASE + 30_000, BASE + 150_000, ("lastPrice",))
+    assert window["lastPrice"] == [2, 3]
+
+
+def test_compact_rejects_non_positive_interval(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.compact(0, 0)
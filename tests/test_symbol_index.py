@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import symbol_index  # noqa: E402
+from symbol_index import SymbolIndex  # noqa: E402
+
+
+def test_multipliers_only_on_perp_markets():
+    index = SymbolIndex()
+    assert index.normalize("binance.futures", "1000PEPE") == ("PEPE", 1000)
+    assert index.normalize("bybit.futures", "1000000MOG") == ("MOG", 1_000_000)
+    assert index.normalize("bybit.futures", "SHIB1000") == ("SHIB", 1000)
+    assert index.normalize("binance", "1000PEPE") == ("1000PEPE", 1)
+    assert index.normalize("mexc", "1000PEPE") == ("1000PEPE", 1)
+
+
+def test_perp_contract_units_split_including_single_letter_bases():
+    index = SymbolIndex()
+    assert index.normalize("binance.futures", "1000CAT") == ("CAT", 1000)
+    assert index.normalize("binance.futures", "1000SATS") == ("SATS", 1000)
+    assert index.normalize("binance.futures", "1000CHEEMS") == ("CHEEMS", 1000)
+    assert index.normalize("binance.futures", "1000X") == ("X", 1000)
+    assert index.normalize("binance.futures", "100XYZ") == ("100XYZ", 1)
+    assert index.normalize("binance", "1000SATS") == ("1000SATS", 1)
+
+
+def test_numeric_tickers_are_scoped_per_market(monkeypatch):
+    monkeypatch.setitem(symbol_index.NUMERIC_TICKERS, "bybit.futures", {"1000ABC"})
+    index = SymbolIndex()
+    assert index.normalize("bybit.futures", "1000ABC") == ("1000ABC", 1)
+    assert index.normalize("binance.futures", "1000ABC") == ("ABC", 1000)
+
+
+def test_perp_units_resolve_to_mexc_asset():
+    index = SymbolIndex()
+    assert index.asset_id("binance.futures", "1000PEPE") == index.asset_id("mexc", "PEPE")
+    assert index.asset_id("binance.futures", "1000CAT") == index.asset_id("mexc", "CAT")
+    assert index.asset_id("binance.futures", "1000X") == index.asset_id("mexc", "X")
+    assert index.difference("mexc", ["CAT", "SATS", "CHEEMS", "X", "NEW"], "binance.futures",
+                            ["1000CAT", "1000SATS", "1000CHEEMS", "1000X"]) == ["NEW"]
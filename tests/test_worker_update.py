@@ -0,0 +1,58 @@
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crypto_web_dashboard as dashboard  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(dashboard, "WORKER_SECRET", "s3cret")
+    monkeypatch.setattr(dashboard, "update_thread_started", True)
+    with dashboard.app.test_client() as client:
+        yield client
+
+
+def post_gzip(client, body: bytes, secret=None):
+    headers = {"Content-Encoding": "gzip", "Content-Type": "application/json"}
+    if secret is not None:
+        headers["X-Worker-Secret"] = secret
+    return client.post("/api/worker/update", data=gzip.compress(body), headers=headers)
+
+
+def test_gzip_body_requires_header_secret(client):
+    body = json.dumps({"secret": "s3cret", "sources": {}}).encode()
+    assert post_gzip(client, body).status_code == 401
+    assert post_gzip(client, body, "wrong").status_code == 401
+    assert post_gzip(client, body, "s3cret").status_code == 200
+
+
+def test_gzip_body_over_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(dashboard, "WORKER_MAX_PAYLOAD_BYTES", 1024)
+    bomb = b"[" + b" " * (1024 * 1024) + b"]"
+    assert post_gzip(client, bomb, "s3cret").status_code == 413
+
+
+def test_server_does_not_publish_worker_owned_sources(client, monkeypatch):
+    monkeypatch.setattr(dashboard, "source_store", {})
+    monkeypatch.setattr(dashboard, "derived_inputs", {})
+    rows = [{"symbol": "BTC", "market_cap": 1}]
+    with dashboard.data_lock:
+        dashboard._store_source("mexc", rows, dashboard.data_digest(rows), None, "worker")
+    assert dashboard.worker_owned_sources() == {"mexc"}
+
+    dashboard.publish_sources({"mexc": [{"symbol": "ETH", "market_cap": 2}], "binance": ["BTC"]})
+    assert dashboard.source_store["mexc"]["data"] == rows
+    assert dashboard.source_store["binance"]["origin"] == "server"
+
+    warmed = []
+    monkeypatch.setattr(dashboard, "DISABLE_SERVER_BINANCE", True)
+    monkeypatch.setattr(dashboard, "warm_exchange_cache", warmed.append)
+    monkeypatch.setattr(dashboard, "process_mexc", lambda: pytest.fail("worker-owned mexc fetched"))
+    assert dashboard.run_update_cycle() is True
+    assert warmed == [[]]
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Watch Mode
+
+Liste scriptlerinin (`crypto_listings_all_in_one.py`,
+`binance_spot_no_futures.py`, `bybit_spot_no_futures.py`) ortak `--watch`
+modu. Script cron ile baştan çalıştırılmak yerine aynı süreçte belirli
+aralıklarla yeniden değerlendirilir:
+
+- HTTP oturumu (bağlantı havuzu), sembol indeksi ve disk market cap
+  önbelleği döngüler arasında sıcak kalır; yalnızca süreç içi yanıt
+  önbelleği her döngüde temizlenir.
+- Çıktı dosyaları içerik özeti (SHA-256) değiştiyse atomik olarak yeniden
+  yazılır (report_writers); değişmeyen dosyalara dokunulmaz.
+- İzlenen borsa listelerindeki yeni listelemeler ve kaldırmalar
+  `listing_events.log` dosyasına eklenir (sadece ekleme):
+      2026-01-01T12:00:00Z	LISTED	mexc.futures	PEPE
+
+Kullanım:
+    python3 crypto_listings_all_in_one.py --watch          # 300 sn aralık
+    python3 binance_spot_no_futures.py --watch 60 --events-log olaylar.log
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+import columnar_export
+from exchange_adapters import fetch_cache, get_adapter
+from report_writers import pop_changed_paths
+
+DEFAULT_WATCH_INTERVAL = float(os.environ.get("WATCH_INTERVAL", "300"))
+EVENTS_LOG_PATH = os.environ.get("LISTING_EVENTS_LOG", "listing_events.log")
+
+# ---------------------------------------------------------------------------
+# LISTING EVENTS
+# ---------------------------------------------------------------------------
+
+def load_columns(columns: Sequence[str]) -> Dict[str, Set[str]]:
+    """`<borsa>.<piyasa>` kolonlarının güncel sembol kümeleri.
+
+    Döngü içinde çağrıldığında yanıtlar fetch_cache'ten gelir; ek istek yapılmaz.
+    """
+    result = {}
+    for name in columns:
+        exchange, market = name.split(".", 1)
+        result[name] = getattr(get_adapter(exchange), f"{market}_symbols")()
+    return result
+
+
+def diff_columns(previous: Dict[str, Set[str]], current: Dict[str, Set[str]]) -> List[Tuple[str, str, str]]:
+    """(olay, kolon, sembol) listesi. Boş gelen kolon (API hatası) atlanır."""
+    events = []
+    for name, symbols in current.items():
+        before = previous.get(name)
+        if before is None or not symbols:
+            continue
+        events.extend(("LISTED", name, symbol) for symbol in sorted(symbols - before))
+        events.extend(("DELISTED", name, symbol) for symbol in sorted(before - symbols))
+    return events
+
+
+def append_events(path: str, events: List[Tuple[str, str, str]], now: float) -> None:
+    if not events or not path:
+        return
+    stamp = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    try:
+        with open(path, "a", encoding="utf-8") as fp:
+            fp.write("".join(f"{stamp}\t{event}\t{name}\t{symbol}\n" for event, name, symbol in events))
+    except OSError as e:
+        print(f"[WARNING] Olay kaydi yazilamadi ({path}): {e}")
+
+
+# ---------------------------------------------------------------------------
+# WATCH LOOP
+# ---------------------------------------------------------------------------
+
+def watch(run: Callable[[], None], interval: float, columns: Sequence[str],
+          events_log: str = EVENTS_LOG_PATH) -> None:
+    """`run`'ı her `interval` saniyede bir çalıştırır (Ctrl+C ile durur).
+
+    İlk döngünün çıktısı olduğu gibi basılır. Sonraki döngülerde rapor
+    çıktısı yalnızca bir dosya veya listeleme değiştiyse basılır; aksi hâlde
+    tek satırlık durum yazılır.
+    """
+    previous: Dict[str, Set[str]] = {}
+    cycle = 0
+    print(f"[WATCH] {interval:.0f} sn aralikla izleniyor (olaylar: {events_log or '-'}), durdurmak icin Ctrl+C")
+    try:
+        while True:
+            started = time.time()
+            # Bağlantılar ve disk önbellekleri korunur, yanıtlar yeniden çekilir
+            fetch_cache.clear()
+            buffer = io.StringIO()
+            try:
+                if cycle == 0:
+                    run()
+                else:
+                    with redirect_stdout(buffer):
+                        run()
+                current = load_columns(columns)
+            except Exception as e:
+                print(buffer.getvalue(), end="")
+                print(f"[ERROR] Izleme dongusu hatasi: {e}")
+                current = {}
+
+            events = diff_columns(previous, current)
+            append_events(events_log, events, started)
+            previous.update({name: symbols for name, symbols in current.items() if symbols})
+            changed = pop_changed_paths()
+
+            if cycle and (changed or events):
+                print(buffer.getvalue(), end="")
+            clock = time.strftime("%H:%M:%S", time.localtime(started))
+            if changed or events:
+                detail = ", ".join(f"{event} {name} {symbol}" for event, name, symbol in events[:10])
+                more = f" (+{len(events) - 10})" if len(events) > 10 else ""
+                print(f"[WATCH] {clock} dongu {cycle + 1}: {len(changed)} dosya guncellendi, "
+                      f"{len(events)} olay{': ' + detail + more if events else ''}")
+            else:
+                print(f"[WATCH] {clock} dongu {cycle + 1}: degisiklik yok")
+
+            cycle += 1
+            time.sleep(max(0.0, interval - (time.time() - started)))
+    except KeyboardInterrupt:
+        print("\n[WATCH] Durduruldu")
+
+
+def run_cli(main: Callable[[], None], columns: Sequence[str], description: str,
+            argv: Sequence[str] = None) -> None:
+    """Liste scriptlerinin ortak komut satırı: tek çalıştırma veya --watch, isteğe bağlı --export."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--watch", nargs="?", type=float, const=DEFAULT_WATCH_INTERVAL, metavar="SANIYE",
+                        help=f"Belirli aralikla yeniden calistir (varsayilan {DEFAULT_WATCH_INTERVAL:.0f} sn)")
+    parser.add_argument("--events-log", default=EVENTS_LOG_PATH,
+                        help="Listeleme/kaldirma olaylarinin eklenecegi dosya")
+    parser.add_argument("--export", choices=columnar_export.COLUMNAR_FORMATS,
+                        default=columnar_export.EXPORT_FORMAT or None,
+                        help="CSV'lere ek olarak kolonsal cikti (pyarrow gerekir)")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    columnar_export.EXPORT_FORMAT = args.export or ""
+    if args.watch is None:
+        main()
+        return
+    watch(main, max(1.0, args.watch), columns, args.events_log)